@@ -7,6 +7,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from flask import Flask
+from app.json_utils import OrjsonProvider
 
 # Import Blueprints
 from app.core import core_bp
@@ -22,11 +23,14 @@ from app.voice_studio import voice_studio_bp
 def create_app():
     # Force Flask to look for templates and static files in the src directory
     app = Flask(__name__, template_folder='src/templates', static_folder='src/static')
+    app.json = OrjsonProvider(app)
     
     # Pre-load TTS provider on app startup for immediate availability
     with app.app_context():
         try:
             import app.shared as shared
+            # Discover audio providers up front so no request pays for the plugin imports
+            shared.get_audio_registry().warm_up()
             # Force TTS provider initialization
             tts_provider = shared.get_tts_provider()
             if tts_provider:
@@ -49,9 +53,21 @@ def create_app():
     
     return app
 
+# Worker threads for the production server; endpoints are I/O bound (disk JSON,
+# outbound HTTP, SSE streams, downloads) so threads, not processes, are the lever
+SERVER_THREADS = 16
+
 if __name__ == '__main__':
     app = create_app()
     print("\n" + "=" * 50)
     print("Running with HTTP on http://0.0.0.0:5000")
     print("=" * 50 + "\n")
-    app.run(debug=False, host='0.0.0.0', port=5000, use_reloader=False)
\ No newline at end of file
+    try:
+        from waitress import serve
+    except ImportError:
+        serve = None
+    if serve:
+        serve(app, host='0.0.0.0', port=5000, threads=SERVER_THREADS)
+    else:
+        print("[APP-STARTUP] waitress not installed, falling back to the Flask development server")
+        app.run(debug=False, host='0.0.0.0', port=5000, use_reloader=False, threaded=True)
\ No newline at end of file
@@ -17,12 +17,19 @@ import datetime
 import tempfile
 import uuid
 from typing import List, Optional
-from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 import uvicorn
 import asyncio
 import base64
+import json
 import os
+import socket
+import argparse
+import wave
+import threading
 import traceback
 
 # Configuration
@@ -32,6 +39,10 @@ MODEL_NAME = "nvidia/parakeet-tdt-0.6b-v2"
 # Global model instance
 model = None
 
+# Each transcription moves the model between devices and may switch its attention
+# mode, so only one request may use it at a time. Audio preprocessing runs outside it.
+model_lock = threading.Lock()
+
 # Track if we're in fallback mode
 gpu_fallback_to_cpu = False
 
@@ -273,98 +284,99 @@ def get_transcripts_and_raw_times(audio_path: str, session_dir: Path) -> Transcr
         # Process audio
         transcribe_path, duration_sec = process_audio_for_transcription(audio_path, session_dir)
         
-        # Configure model for long audio if needed
-        long_audio_settings_applied = False
-        try:
-            model.to(device)
+        with model_lock:
+            # Configure model for long audio if needed
+            long_audio_settings_applied = False
+            try:
+                model.to(device)
             
-            # Apply settings for long audio (>8 minutes)
-            if duration_sec > 480:
-                print("Applying long audio settings: Local Attention and Chunking.")
-                model.change_attention_model("rel_pos_local_attn", [256, 256])
-                model.change_subsampling_conv_chunking_factor(1)
-                long_audio_settings_applied = True
+                # Apply settings for long audio (>8 minutes)
+                if duration_sec > 480:
+                    print("Applying long audio settings: Local Attention and Chunking.")
+                    model.change_attention_model("rel_pos_local_attn", [256, 256])
+                    model.change_subsampling_conv_chunking_factor(1)
+                    long_audio_settings_applied = True
             
-            # Perform transcription (use paths2audio_files parameter for Parakeet TDT)
-            # Remove manual dtype casting - NeMo manages precision internally
-            model.to(device)
+                # Perform transcription (use paths2audio_files parameter for Parakeet TDT)
+                # Remove manual dtype casting - NeMo manages precision internally
+                model.to(device)
             
-            # Run transcription with improved handling
-            try:
-                output = model.transcribe(paths2audio_files=[transcribe_path])
-            except TypeError:
-                # fallback for positional-only models
+                # Run transcription with improved handling
                 try:
-                    output = model.transcribe([transcribe_path])
-                except Exception as trans_err:
-                    print(f"[STT] Positional transcription failed, trying with timestamps: {trans_err}")
-                    output = model.transcribe([transcribe_path], timestamps=True)
+                    output = model.transcribe(paths2audio_files=[transcribe_path])
+                except TypeError:
+                    # fallback for positional-only models
+                    try:
+                        output = model.transcribe([transcribe_path])
+                    except Exception as trans_err:
+                        print(f"[STT] Positional transcription failed, trying with timestamps: {trans_err}")
+                        output = model.transcribe([transcribe_path], timestamps=True)
 
-            print(f"[STT] RAW MODEL OUTPUT: {output}")
-            print(f"[STT] Transcription output type: {type(output)}")
+                print(f"[STT] RAW MODEL OUTPUT: {output}")
+                print(f"[STT] Transcription output type: {type(output)}")
 
-            text = None
+                text = None
 
-            # Case 1: Tuple (RNNT models)
-            if isinstance(output, tuple):
-                print("[STT] Processing tuple output")
+                # Case 1: Tuple (RNNT models)
+                if isinstance(output, tuple):
+                    print("[STT] Processing tuple output")
                 
-                if len(output) > 0 and isinstance(output[0], list) and len(output[0]) > 0:
-                    text = output[0][0]
-
-            # Case 2: List output
-            elif isinstance(output, list) and len(output) > 0:
-                if isinstance(output[0], str):
-                    text = output[0]
-                elif hasattr(output[0], "text"):
-                    text = output[0].text
-
-            # Final validation
-            if text and text.strip():
-                print(f"[STT] Final transcription: {text}")
-                transcribed_text = text.strip()
-            else:
-                print("[STT] No transcription output")
-                return TranscriptionResponse(
-                    success=False,
-                    message="No speech detected in audio"
-                )
+                    if len(output) > 0 and isinstance(output[0], list) and len(output[0]) > 0:
+                        text = output[0][0]
+
+                # Case 2: List output
+                elif isinstance(output, list) and len(output) > 0:
+                    if isinstance(output[0], str):
+                        text = output[0]
+                    elif hasattr(output[0], "text"):
+                        text = output[0].text
+
+                # Final validation
+                if text and text.strip():
+                    print(f"[STT] Final transcription: {text}")
+                    transcribed_text = text.strip()
+                else:
+                    print("[STT] No transcription output")
+                    return TranscriptionResponse(
+                        success=False,
+                        message="No speech detected in audio"
+                    )
             
-            # Create a single segment with the full text
-            segments = [TranscriptionSegment(
-                start=0.0,
-                end=duration_sec,
-                text=transcribed_text
-            )]
+                # Create a single segment with the full text
+                segments = [TranscriptionSegment(
+                    start=0.0,
+                    end=duration_sec,
+                    text=transcribed_text
+                )]
             
-            print(f"[STT] Transcribed text: {transcribed_text}")
+                print(f"[STT] Transcribed text: {transcribed_text}")
             
-            return TranscriptionResponse(
-                success=True,
-                segments=segments,
-                duration=duration_sec,
-                message="Transcription completed successfully"
-            )
+                return TranscriptionResponse(
+                    success=True,
+                    segments=segments,
+                    duration=duration_sec,
+                    message="Transcription completed successfully"
+                )
             
-        finally:
-            # Revert model settings if applied
-            if long_audio_settings_applied:
+            finally:
+                # Revert model settings if applied
+                if long_audio_settings_applied:
+                    try:
+                        print("Reverting long audio settings.")
+                        model.change_attention_model("rel_pos")
+                        model.change_subsampling_conv_chunking_factor(-1)
+                    except Exception as e:
+                        print(f"Warning: Failed to revert long audio settings: {e}")
+            
+                # Cleanup
                 try:
-                    print("Reverting long audio settings.")
-                    model.change_attention_model("rel_pos")
-                    model.change_subsampling_conv_chunking_factor(-1)
+                    if device == 'cuda':
+                        model.cpu()
+                    gc.collect()
+                    if device == 'cuda':
+                        torch.cuda.empty_cache()
                 except Exception as e:
-                    print(f"Warning: Failed to revert long audio settings: {e}")
-            
-            # Cleanup
-            try:
-                if device == 'cuda':
-                    model.cpu()
-                gc.collect()
-                if device == 'cuda':
-                    torch.cuda.empty_cache()
-            except Exception as e:
-                print(f"Error during model cleanup: {e}")
+                    print(f"Error during model cleanup: {e}")
                 
     except torch.cuda.OutOfMemoryError as e:
         return TranscriptionResponse(
@@ -392,8 +404,78 @@ async def health_check():
         device=device
     )
 
+# Streamed transcription cuts the audio at pauses at least this long, and merges
+# pieces shorter than SEGMENT_MIN_MS into the next one so each model call is worth it
+SEGMENT_SILENCE_MS = 500
+SEGMENT_MIN_MS = 3000
+SEGMENT_PAD_MS = 100
+
+def sse_event(payload) -> str:
+    """Frame a JSON payload as a Server-Sent Events data message"""
+    return f"data: {json.dumps(payload)}\n\n"
+
+def speech_ranges(audio) -> list:
+    """Split audio into (start_ms, end_ms) speech ranges separated by pauses"""
+    ranges = []
+    for start, end in detect_nonsilent(audio, min_silence_len=SEGMENT_SILENCE_MS, silence_thresh=-40):
+        if ranges and ranges[-1][1] - ranges[-1][0] < SEGMENT_MIN_MS:
+            ranges[-1] = (ranges[-1][0], end)
+        else:
+            ranges.append((start, end))
+    return ranges or [(0, len(audio))]
+
+def stream_transcription(audio_path: str, session_dir: Path):
+    """
+    Yield SSE events for an audio file, one per pause-separated segment
+    
+    Each segment is transcribed and sent as soon as it is decoded, so the
+    client gets the first words without waiting for the whole file. Ends
+    with ``[DONE]``; failures are sent as ``{"error": ...}``.
+    """
+    if not model:
+        yield sse_event({"error": "ASR model is not loaded"})
+        return
+    try:
+        try:
+            audio = AudioSegment.from_file(audio_path)
+            ranges = speech_ranges(audio)
+        except Exception as e:
+            print(f"[STT] Could not split audio for streaming, transcribing it whole: {e}")
+            audio, ranges = None, None
+        
+        emitted = 0
+        last_error = None
+        for index, (start, end) in enumerate(ranges or [(0, None)]):
+            if audio is None:
+                offset, piece_path = 0.0, audio_path
+            else:
+                piece_start = max(0, start - SEGMENT_PAD_MS)
+                offset, piece_path = piece_start / 1000, session_dir / f"segment_{index}.wav"
+                audio[piece_start:end + SEGMENT_PAD_MS].export(piece_path, format="wav")
+            result = get_transcripts_and_raw_times(str(piece_path), session_dir)
+            if not result.success:
+                last_error = result.message
+                continue
+            for segment in result.segments:
+                emitted += 1
+                yield sse_event({
+                    "start": round(offset + segment.start, 3),
+                    "end": round(offset + segment.end, 3),
+                    "text": segment.text
+                })
+        
+        if not emitted:
+            yield sse_event({"error": last_error or "No speech detected in audio"})
+            return
+        yield "data: [DONE]\n\n"
+    except Exception as e:
+        print(f"[STT] Error during streamed transcription: {e}")
+        traceback.print_exc()
+        yield sse_event({"error": f"Transcription failed: {str(e)}"})
+
 @app.post("/transcribe", response_model=TranscriptionResponse)
 async def transcribe_audio(
+    request: Request,
     background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description="Audio file to transcribe")
 ):
@@ -402,7 +484,9 @@ async def transcribe_audio(
     
     - **file**: Audio file (supported formats: wav, mp3, flac, etc.)
     
-    Returns transcription segments with start/end timestamps and text
+    Returns transcription segments with start/end timestamps and text. Clients
+    sending ``Accept: text/event-stream`` get each segment as its own SSE event
+    as soon as it is decoded instead.
     """
     print(f"[STT] Received transcription request: filename={file.filename}, content_type={file.content_type}")
     
@@ -447,8 +531,14 @@ async def transcribe_audio(
         
         print(f"[STT] Saved audio to: {file_path}")
         
+        if "text/event-stream" in request.headers.get("accept", ""):
+            # Session directory cleanup runs as a background task after the stream ends
+            return StreamingResponse(stream_transcription(file_path.as_posix(), session_dir),
+                                     media_type="text/event-stream")
+        
         # Perform transcription
-        result = get_transcripts_and_raw_times(file_path.as_posix(), session_dir)
+        # Off the event loop, so /health and other requests are served while the model runs
+        result = await run_in_threadpool(get_transcripts_and_raw_times, file_path.as_posix(), session_dir)
         print(f"[STT] Transcription result: success={result.success}, segments={len(result.segments) if result.segments else 0}")
         return result
         
@@ -458,6 +548,76 @@ async def transcribe_audio(
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+# Sample formats accepted by /transcribe_raw (X-Sample-Format header)
+RAW_SAMPLE_FORMATS = {"float32": np.float32, "int16": np.int16}
+
+@app.options("/transcribe_raw")
+async def transcribe_raw_options():
+    """Advertise /transcribe_raw so clients can probe for it before sending raw audio"""
+    return Response(status_code=200, headers={"Allow": "OPTIONS, POST"})
+
+@app.post("/transcribe_raw", response_model=TranscriptionResponse)
+async def transcribe_raw(request: Request, background_tasks: BackgroundTasks):
+    """
+    Transcribe raw mono PCM samples sent as the request body
+    
+    - **body**: application/octet-stream samples, no container
+    - **X-Sample-Rate**: sample rate in Hz (default 16000)
+    - **X-Sample-Format**: float32 (default) or int16
+    - **language**: optional query parameter, accepted for parity with /transcribe
+    
+    Saves the multipart/WAV encoding round trip for clients that already hold
+    decoded audio (e.g. microphone buffers).
+    """
+    sample_format = request.headers.get("X-Sample-Format", "float32").lower()
+    dtype = RAW_SAMPLE_FORMATS.get(sample_format)
+    if dtype is None:
+        raise HTTPException(status_code=400, detail=f"Unsupported sample format: {sample_format}. Allowed formats: {list(RAW_SAMPLE_FORMATS)}")
+    try:
+        sample_rate = int(request.headers.get("X-Sample-Rate", "16000"))
+    except ValueError:
+        sample_rate = 0
+    if sample_rate <= 0:
+        raise HTTPException(status_code=400, detail="X-Sample-Rate must be a positive integer")
+    
+    content = await request.body()
+    print(f"[STT] Received raw transcription request: {len(content)} bytes, {sample_rate}Hz {sample_format}")
+    if len(content) < 100:
+        return TranscriptionResponse(
+            success=False,
+            message=f"Audio too short ({len(content)} bytes). Please record for at least 1 second."
+        )
+    if len(content) % np.dtype(dtype).itemsize:
+        raise HTTPException(status_code=400, detail=f"Body length {len(content)} is not a whole number of {sample_format} samples")
+    
+    samples = np.frombuffer(content, dtype=dtype)
+    if dtype is np.float32:
+        samples = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+    
+    # Create session directory
+    session_id = str(uuid.uuid4())
+    session_dir = Path(tempfile.gettempdir()) / f"transcription_{session_id}"
+    session_dir.mkdir(parents=True, exist_ok=True)
+    background_tasks.add_task(cleanup_session_dir, session_dir)
+    
+    try:
+        # Wrap the samples in a WAV container for the audio pipeline
+        wav_path = session_dir / "audio.wav"
+        with wave.open(str(wav_path), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)  # 16-bit
+            wf.setframerate(sample_rate)
+            wf.writeframes(samples.tobytes())
+        
+        result = await run_in_threadpool(get_transcripts_and_raw_times, wav_path.as_posix(), session_dir)
+        print(f"[STT] Raw transcription result: success={result.success}, segments={len(result.segments) if result.segments else 0}")
+        return result
+        
+    except Exception as e:
+        print(f"[STT] Error during raw transcription: {e}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
 # WebSocket endpoint for streaming STT
 @app.websocket("/ws/transcribe")
 async def websocket_transcribe(websocket: WebSocket):
@@ -558,7 +718,7 @@ async def websocket_transcribe(websocket: WebSocket):
                             audio_path = wav_path
                         
                         # Process and transcribe
-                        result = get_transcripts_and_raw_times(str(audio_path), session_dir)
+                        result = await run_in_threadpool(get_transcripts_and_raw_times, str(audio_path), session_dir)
                         
                         if result.success:
                             # Combine all segment texts
@@ -604,10 +764,42 @@ async def websocket_transcribe(websocket: WebSocket):
         except:
             pass
 
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Parakeet STT server")
+    parser.add_argument("--host", default="0.0.0.0", help="TCP host to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="TCP port to listen on")
+    parser.add_argument("--socket", dest="socket_path",
+                        help="Also listen on this Unix domain socket (for local clients)")
+    return parser.parse_args()
+
+def bind_unix_socket(socket_path: str) -> socket.socket:
+    """Bind a Unix domain socket at socket_path, replacing a stale one from a previous run"""
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(socket_path)
+    os.chmod(socket_path, 0o600)
+    return sock
+
 if __name__ == "__main__":
-    print("Starting Parakeet STT Server on http://0.0.0.0:8000")
+    args = parse_args()
+    print(f"Starting Parakeet STT Server on http://{args.host}:{args.port}")
     print(f"Endpoints:")
-    print(f"  - Health:    http://0.0.0.0:8000/health")
-    print(f"  - Transcribe: http://0.0.0.0:8000/transcribe (POST)")
-    print(f"  - WebSocket:  ws://0.0.0.0:8000/ws/transcribe")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    print(f"  - Health:    http://{args.host}:{args.port}/health")
+    print(f"  - Transcribe: http://{args.host}:{args.port}/transcribe (POST)")
+    print(f"  - Raw PCM:    http://{args.host}:{args.port}/transcribe_raw (POST)")
+    print(f"  - WebSocket:  ws://{args.host}:{args.port}/ws/transcribe")
+    if args.socket_path:
+        # Serve the TCP port and the Unix socket from one server, so the browser
+        # and remote clients keep using TCP while the local app uses the socket
+        print(f"  - Unix socket: {args.socket_path}")
+        config = uvicorn.Config(app, host=args.host, port=args.port)
+        server = uvicorn.Server(config)
+        try:
+            server.run(sockets=[config.bind_socket(), bind_unix_socket(args.socket_path)])
+        finally:
+            if os.path.exists(args.socket_path):
+                os.unlink(args.socket_path)
+    else:
+        uvicorn.run(app, host=args.host, port=args.port)
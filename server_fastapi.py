@@ -85,6 +85,7 @@ async def lifespan(app: FastAPI):
     
     # Initialize TTS provider
     try:
+        shared.get_audio_registry().warm_up()
         tts_provider = shared.get_tts_provider()
         if tts_provider:
             print(f"[FASTAPI] TTS provider loaded: {tts_provider.provider_name}")
@@ -13,6 +13,7 @@ import os
 import wave
 from flask import Blueprint, request, jsonify, Response
 import app.shared as shared
+from app.json_utils import sse_event
 
 audio_bp = Blueprint('audio', __name__)
 
@@ -54,6 +55,53 @@ def stt():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@audio_bp.route('/api/stt/stream', methods=['POST'])
+def stt_stream():
+    """STT endpoint that streams transcription segments as Server-Sent Events."""
+    # The voice UI posts its recording as 'audio'; API clients use 'file'
+    audio_file = request.files.get('file') or request.files.get('audio')
+    if audio_file is None:
+        return jsonify({"success": False, "error": "No audio file provided"}), 400
+    
+    stt_provider = shared.get_stt_provider()
+    if not stt_provider:
+        return jsonify({"success": False, "error": "No STT provider available"}), 500
+    
+    language = request.form.get('language', 'en')
+    # Keep the upload's extension so the STT server decodes e.g. webm recordings correctly
+    suffix = os.path.splitext(audio_file.filename or '')[1] or '.wav'
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_audio:
+        audio_file.save(temp_audio.name)
+        temp_path = temp_audio.name
+    
+    def generate():
+        try:
+            if hasattr(stt_provider, 'transcribe_segments'):
+                segments = stt_provider.transcribe_segments(temp_path, language=language)
+            else:
+                result = stt_provider.transcribe(temp_path, language=language)
+                if result.get('success'):
+                    segments = result.get('segments') or [{'text': result.get('text', '')}]
+                else:
+                    segments = [{'error': result.get('error', 'Transcription failed')}]
+            
+            texts = []
+            for segment in segments:
+                if 'error' in segment:
+                    yield sse_event({'type': 'error', 'error': segment['error']})
+                    return
+                texts.append(segment.get('text', '').strip())
+                yield sse_event({'type': 'segment', 'segment': segment})
+            yield sse_event({'type': 'done', 'text': ' '.join(t for t in texts if t)})
+        except Exception as e:
+            yield sse_event({'type': 'error', 'error': str(e)})
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+    
+    return Response(generate(), mimetype='text/event-stream')
+
+
 @audio_bp.route('/api/stt/float32', methods=['POST'])
 def stt_float32():
     """STT endpoint for raw Float32 audio."""
@@ -193,13 +241,13 @@ def tts_stream():
             if hasattr(tts_provider, 'generate_tts'):
                 result = tts_provider.generate_tts(text=text, speaker=final_speaker, language=language)
             elif hasattr(tts_provider, 'generate_audio'):
-                result = tts_provider.generate_audio(text=text, speaker=final_speaker, language=language)
+                result = tts_provider.generate_audio(text=text, speaker=final_speaker, language=language, return_bytes=True)
             else:
                 return jsonify({"success": False, "error": "Provider missing TTS method"}), 500
             
             if result and result.get('success'):
-                # Return complete audio
-                audio_data = base64.b64decode(result.get('audio', ''))
+                # Return complete audio; providers without return_bytes support still send base64
+                audio_data = result.get('audio_bytes') or base64.b64decode(result.get('audio', ''))
                 return Response(audio_data, mimetype='audio/wav')
             else:
                 return jsonify({"success": False, "error": result.get('error', 'TTS failed')}), 500
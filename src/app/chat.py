@@ -1,15 +1,70 @@
-import json
 import re
+import time
+import queue
 import base64
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 import numpy as np
 from io import StringIO, BytesIO
 from flask import Blueprint, request, jsonify, Response
 import app.shared as shared
+from app.json_utils import sse_event
 from app.providers import ChatMessage, ChatResponse
 
 chat_bp = Blueprint('chat', __name__)
 
+# Voice-stream TTS runs off the request thread so synthesis overlaps with LLM token
+# streaming. One worker: TTS providers run in-process on a single model with no
+# inference lock, so sentences must never be synthesized concurrently.
+tts_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='voice-tts')
+
+# Sentence splitting for voice streaming (compiled once, used per streamed token)
+SENTENCE_ENDINGS = re.compile(r'[.!?]\s+|\n')
+TITLE_ABBREVIATION = re.compile(r'\b(?:Mr|Mrs|Ms|Dr|Sr|Jr)\.\s*$', re.IGNORECASE)
+
+# Per-session ChatMessage history reused across turns (in-memory only, never persisted).
+# Guarded by a lock: concurrent requests for one session would otherwise both extend it.
+prepared_history = {}
+_prepared_history_lock = threading.Lock()
+
+class ContentBatcher:
+    """
+    Coalesce streamed content tokens into fewer SSE frames.
+    
+    Tokens are held until at least ``min_chars`` are pending or ``max_delay``
+    seconds have passed since the last frame, so bursts of tiny tokens become
+    one write while slow streams are forwarded immediately. The age check runs
+    on the token path, so if the model pauses, text is held for at most the
+    pause between tokens. It goes out with the next token or in the final flush.
+    """
+    
+    def __init__(self, min_chars=32, max_delay=0.01):
+        self.min_chars = min_chars
+        self.max_delay = max_delay
+        self.parts = []
+        self.size = 0
+        self.last_flush = time.monotonic()
+    
+    def add(self, content):
+        """Queue a token; return an SSE frame if the batch is ready, else None."""
+        self.parts.append(content)
+        self.size += len(content)
+        if self.size >= self.min_chars or time.monotonic() - self.last_flush > self.max_delay:
+            return self.flush()
+        return None
+    
+    def flush(self):
+        """Return an SSE frame for all pending content, or None if nothing is pending."""
+        self.last_flush = time.monotonic()
+        if not self.parts:
+            return None
+        frame = sse_event({'type': 'content', 'content': ''.join(self.parts)})
+        self.parts = []
+        self.size = 0
+        return frame
+
 def process_attachment(attachment):
     """Process an attachment - extract text from documents or prepare images for vision."""
     att_type = attachment.get('type', '')
@@ -88,6 +143,40 @@ def extract_document_text(file_data, filename):
     
     return text[:10000]  # Limit to first 10000 chars
 
+def get_message_history(session_id, system_prompt):
+    """
+    Return the provider message history for a session.
+    
+    ChatMessage objects built on earlier turns are reused; only messages added
+    to the session since the last call are converted. The cache is rebuilt if
+    the system prompt changes or the session history shrinks (e.g. cleared).
+    Returns a copy, so callers may append to it freely.
+    """
+    session_messages = shared.sessions_data[session_id].get('messages', [])
+    with _prepared_history_lock:
+        cached = prepared_history.get(session_id)
+        if cached is None or cached['system_prompt'] != system_prompt or cached['count'] > len(session_messages):
+            cached = {
+                'system_prompt': system_prompt,
+                'count': 0,
+                'messages': [ChatMessage(role="system", content=system_prompt)]
+            }
+            prepared_history[session_id] = cached
+        
+        count = len(session_messages)
+        cached['messages'].extend(
+            ChatMessage(role=m["role"], content=m["content"])
+            for m in session_messages[cached['count']:count]
+            if m.get('role') != 'system'
+        )
+        cached['count'] = count
+        return list(cached['messages'])
+
+def forget_message_history(session_id):
+    """Drop the cached message history for a deleted or cleared session."""
+    with _prepared_history_lock:
+        prepared_history.pop(session_id, None)
+
 def prepare_messages(data):
     """Prepare chat messages from request data."""
     if not data or ('message' not in data and 'attachments' not in data):
@@ -99,15 +188,14 @@ def prepare_messages(data):
     system_prompt = data.get('system_prompt', shared.get_global_system_prompt())
     attachments = data.get('attachments', [])
     
-    shared.sessions_data = shared.load_sessions()
-    
     if session_id not in shared.sessions_data:
+        now_iso = datetime.now().isoformat()
         shared.sessions_data[session_id] = {
             'title': 'New Chat',
             'messages': [],
             'system_prompt': system_prompt,
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat()
+            'created_at': now_iso,
+            'updated_at': now_iso
         }
     
     # Process attachments - separate images and documents
@@ -132,14 +220,6 @@ def prepare_messages(data):
             message_content += f'\n[{doc.get("name", "document")}]'
         message_content += '\n(Please analyze the document content)'
     
-    # Build message list
-    messages = [ChatMessage(role="system", content=system_prompt)]
-    messages.extend([
-        ChatMessage(role=m["role"], content=m["content"])
-        for m in shared.sessions_data[session_id].get('messages', [])
-        if m.get('role') != 'system'
-    ])
-    
     # Store vision images for provider to handle
     user_msg = ChatMessage(role="user", content=message_content)
     
@@ -147,6 +227,8 @@ def prepare_messages(data):
     if image_attachments:
         user_msg.vision_images = image_attachments
     
+    # Build message list (copy the cached history so this turn's message stays out of it)
+    messages = get_message_history(session_id, system_prompt)
     messages.append(user_msg)
     
     # Save user message to session (without vision content)
@@ -182,18 +264,19 @@ def chat():
         thinking = response.thinking or response.reasoning or ""
         
         # Save assistant message to session
-        shared.sessions_data[session_id]['messages'].append({
+        session = shared.sessions_data[session_id]
+        session['messages'].append({
             "role": "assistant",
             "content": content,
             "thinking": thinking
         })
         
         # Update session title if it's the first response
-        if len(shared.sessions_data[session_id]['messages']) == 2:
-            shared.sessions_data[session_id]['title'] = user_message[:30] + "..."
+        if len(session['messages']) == 2:
+            session['title'] = user_message[:30] + "..."
         
-        shared.sessions_data[session_id]['updated_at'] = datetime.now().isoformat()
-        shared.save_sessions(shared.sessions_data)
+        session['updated_at'] = datetime.now().isoformat()
+        shared.schedule_save_sessions(session_id)
         
         return jsonify({
             "success": True,
@@ -232,35 +315,46 @@ def chat_stream():
         return jsonify({"success": False, "error": f"Failed to start stream: {str(e)}"}), 500
     
     def generate():
+        batcher = ContentBatcher()
         try:
-            ai_message = ""
-            thinking = ""
+            ai_chunks = []
+            thinking_chunks = []
             
             for response_chunk in stream_generator:
                 if response_chunk.content:
-                    ai_message += response_chunk.content
-                    yield f"data: {json.dumps({'type': 'content', 'content': response_chunk.content})}\n\n"
+                    ai_chunks.append(response_chunk.content)
+                    if frame := batcher.add(response_chunk.content):
+                        yield frame
                 
                 if response_chunk.thinking or response_chunk.reasoning:
-                    thinking += response_chunk.thinking or response_chunk.reasoning
+                    thinking_chunks.append(response_chunk.thinking or response_chunk.reasoning)
+            
+            if frame := batcher.flush():
+                yield frame
+            
+            ai_message = ''.join(ai_chunks)
+            thinking = ''.join(thinking_chunks)
             
             # Save assistant message to session
-            shared.sessions_data[session_id]['messages'].append({
+            session = shared.sessions_data[session_id]
+            session['messages'].append({
                 "role": "assistant",
                 "content": ai_message,
                 "thinking": thinking
             })
             
-            if len(shared.sessions_data[session_id]['messages']) == 2:
-                shared.sessions_data[session_id]['title'] = user_message[:30] + "..."
+            if len(session['messages']) == 2:
+                session['title'] = user_message[:30] + "..."
             
-            shared.sessions_data[session_id]['updated_at'] = datetime.now().isoformat()
-            shared.save_sessions(shared.sessions_data)
+            session['updated_at'] = datetime.now().isoformat()
+            shared.schedule_save_sessions(session_id)
             
-            yield f"data: {json.dumps({'type': 'done', 'thinking': thinking, 'session_id': session_id})}\n\n"
+            yield sse_event({'type': 'done', 'thinking': thinking, 'session_id': session_id})
             
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+            if frame := batcher.flush():
+                yield frame
+            yield sse_event({'type': 'error', 'error': str(e)})
     
     return Response(generate(), mimetype='text/event-stream')
 
@@ -291,6 +385,11 @@ def chat_voice_stream():
     if not final_speaker and clean_speaker and clean_speaker.lower() != 'default':
         final_speaker = clean_speaker
     
+    # Resolve the TTS provider once per request rather than per sentence (each lookup re-reads settings).
+    # Call the provider directly instead of routing HTTP to ourselves (prevents deadlock).
+    tts_provider = shared.get_tts_provider()
+    synthesize = getattr(tts_provider, 'generate_tts', None) or getattr(tts_provider, 'generate_audio', None)
+    
     try:
         stream_generator = provider.chat_completion(
             messages=messages,
@@ -301,31 +400,20 @@ def chat_voice_stream():
         return jsonify({"success": False, "error": f"Failed to start stream: {str(e)}"}), 500
     
     def generate():
-        import time
-        SENTENCE_ENDINGS = re.compile(r'[.!?]\s+|\n')
         MIN_TOKENS, MAX_TOKENS, MIN_SENTENCE = 15, 60, 15
         
         def generate_tts(sentence, index):
+            if not synthesize:
+                return None
             clean_text = shared.remove_emojis(sentence)
             if not clean_text.strip():
                 return None
             try:
-                # Call Provider directly instead of routing HTTP to ourselves (prevents deadlock)
-                tts_provider = shared.get_tts_provider()
-                if not tts_provider:
-                    return None
-                    
-                if hasattr(tts_provider, 'generate_tts'):
-                    result = tts_provider.generate_tts(text=clean_text, speaker=final_speaker, language="en")
-                elif hasattr(tts_provider, 'generate_audio'):
-                    result = tts_provider.generate_audio(text=clean_text, speaker=final_speaker, language="en")
-                else:
-                    return None
-                    
+                result = synthesize(text=clean_text, speaker=final_speaker, language="en")
                 if result and result.get('success'):
                     return {
                         'audio': result.get('audio', ''),
-                        'sample_rate': result.get('sample_rate', 24000)
+                        'sample_rate': result.get('sample_rate', shared.TTS_SAMPLE_RATE)
                     }
             except Exception as e:
                 import traceback
@@ -333,54 +421,96 @@ def chat_voice_stream():
                 traceback.print_exc()
             return None
         
+        # In-flight TTS futures and completed results waiting to be emitted in sentence order
+        pending = {}
+        ready = []
+        next_emit = 0
+        generated = 0
+        sent_first = False
+        batcher = ContentBatcher()
+        
+        def submit_tts(text, index):
+            pending[tts_pool.submit(generate_tts, text, index)] = (index, text)
+        
+        def drain_tts(block=False):
+            """Yield tts_sentence events for completed futures, preserving sentence order."""
+            nonlocal next_emit, generated, sent_first
+            if pending:
+                if block:
+                    done, _ = wait(list(pending))
+                else:
+                    done, _ = wait(list(pending), timeout=0, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, text = pending.pop(future)
+                    heapq.heappush(ready, (index, text, future.result()))
+            while ready and ready[0][0] == next_emit:
+                index, text, tts_res = heapq.heappop(ready)
+                next_emit += 1
+                if tts_res:
+                    generated += 1
+                    # Text for a sentence must reach the client before its audio
+                    if frame := batcher.flush():
+                        yield frame
+                    yield sse_event({'type': 'tts_sentence', 'index': index, 'audio': tts_res['audio'], 'sample_rate': tts_res['sample_rate'], 'text': text, 'is_first': not sent_first})
+                    sent_first = True
+        
         try:
-            ai_message = ""
-            thinking = ""
+            ai_chunks = []
+            thinking_chunks = []
             buffer = ""
+            scan_from = 0  # buffer offset already searched for sentence endings
             sentence_idx = 0
-            generated = 0
             is_first = True
-            sent_first = False
             
             for response_chunk in stream_generator:
                 if response_chunk.content:
-                    ai_message += response_chunk.content
+                    ai_chunks.append(response_chunk.content)
                     buffer += response_chunk.content
-                    yield f"data: {json.dumps({'type': 'content', 'content': response_chunk.content})}\n\n"
+                    if frame := batcher.add(response_chunk.content):
+                        yield frame
                     
                     chunks = []
                     if is_first and len(buffer) >= MIN_TOKENS:
                         split_idx = min(len(buffer), MAX_TOKENS)
-                        last_space = buffer.rfind(' ', 0, split_idx)
-                        split_idx = last_space if last_space > MIN_TOKENS else split_idx
+                        # Only spaces past MIN_TOKENS are usable split points, so bound the scan to them
+                        last_space = buffer.rfind(' ', MIN_TOKENS + 1, split_idx)
+                        split_idx = last_space if last_space != -1 else split_idx
                         chunks.append(buffer[:split_idx].strip())
                         buffer = buffer[split_idx:].lstrip()
+                        scan_from = 0
                         is_first = False
                     else:
-                        matches = list(SENTENCE_ENDINGS.finditer(buffer))
                         last_end = 0
-                        for m in matches:
+                        for m in SENTENCE_ENDINGS.finditer(buffer, scan_from):
                             sentence = buffer[last_end:m.end()].strip()
-                            if len(sentence) >= MIN_SENTENCE and not re.search(r'\b(Mr|Mrs|Ms|Dr|Sr|Jr)\.\s*$', sentence, re.IGNORECASE):
+                            if len(sentence) >= MIN_SENTENCE and not TITLE_ABBREVIATION.search(sentence):
                                 chunks.append(sentence)
                                 last_end = m.end()
                         buffer = buffer[last_end:]
+                        # Keep one char of overlap so punctuation can pair with whitespace in the next token
+                        scan_from = max(0, len(buffer) - 1)
                     
                     for chunk in chunks:
-                        if tts_res := generate_tts(chunk, sentence_idx):
-                            generated += 1
-                            yield f"data: {json.dumps({'type': 'tts_sentence', 'index': sentence_idx, 'audio': tts_res['audio'], 'sample_rate': tts_res['sample_rate'], 'text': chunk, 'is_first': not sent_first})}\n\n"
-                            sent_first = True
+                        submit_tts(chunk, sentence_idx)
                         sentence_idx += 1
                 
                 if response_chunk.thinking or response_chunk.reasoning:
-                    thinking += response_chunk.thinking or response_chunk.reasoning
+                    thinking_chunks.append(response_chunk.thinking or response_chunk.reasoning)
+                
+                yield from drain_tts()
+            
+            if frame := batcher.flush():
+                yield frame
             
             # Handle remaining buffer
             if buffer.strip() and len(buffer.strip()) >= MIN_SENTENCE:
-                if tts_res := generate_tts(buffer.strip(), sentence_idx):
-                    generated += 1
-                    yield f"data: {json.dumps({'type': 'tts_sentence', 'index': sentence_idx, 'audio': tts_res['audio'], 'sample_rate': tts_res['sample_rate'], 'text': buffer.strip()})}\n\n"
+                submit_tts(buffer.strip(), sentence_idx)
+                sentence_idx += 1
+            
+            yield from drain_tts(block=True)
+            
+            ai_message = ''.join(ai_chunks)
+            thinking = ''.join(thinking_chunks)
             
             # Extract thinking from content if not already captured
             if not thinking:
@@ -392,12 +522,14 @@ def chat_voice_stream():
                 "content": ai_message,
                 "thinking": thinking
             })
-            shared.save_sessions(shared.sessions_data)
+            shared.schedule_save_sessions(session_id)
             
-            yield f"data: {json.dumps({'type': 'done', 'thinking': thinking, 'session_id': session_id, 'sentences_generated': generated})}\n\n"
+            yield sse_event({'type': 'done', 'thinking': thinking, 'session_id': session_id, 'sentences_generated': generated})
             
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+            if frame := batcher.flush():
+                yield frame
+            yield sse_event({'type': 'error', 'error': str(e)})
     
     return Response(generate(), mimetype='text/event-stream')
 
@@ -445,16 +577,11 @@ def chat_streaming_conversation():
         return jsonify({"success": False, "error": f"Failed to start LLM stream: {str(e)}"}), 500
     
     def generate():
-        import asyncio
-        import queue
-        import threading
-        
         # Buffer for accumulating tokens before sending to TTS
-        token_buffer = ""
         sentence_buffer = ""
         sentence_idx = 0
-        ai_message = ""
-        thinking = ""
+        ai_chunks = []
+        thinking_chunks = []
         
         # Queue for TTS processing - each item is (sentence, is_first_for_sentence)
         tts_queue = queue.Queue()
@@ -466,7 +593,6 @@ def chat_streaming_conversation():
         # Track streaming state per sentence
         current_sentence_idx = -1
         
-        import time as time_module
         tts_start_time = None
         chunk_start_time = None
         
@@ -480,7 +606,7 @@ def chat_streaming_conversation():
                         break
                     
                     sentence, sentence_idx = item
-                    tts_start_time = time_module.time()
+                    tts_start_time = time.time()
                     print(f"[TTS DEBUG] Starting TTS for sentence {sentence_idx}: '{sentence[:30]}...'")
                     
                     # Generate TTS audio - stream EACH chunk immediately like reference
@@ -504,10 +630,10 @@ def chat_streaming_conversation():
                                 max_new_tokens=180
                             ):
                                 if audio_chunk is not None and len(audio_chunk) > 0:
-                                    chunk_gen_time = (time_module.time() - tts_start_time) * 1000
+                                    chunk_gen_time = (time.time() - tts_start_time) * 1000
                                     print(f"[TTS DEBUG] Sentence {sentence_idx} chunk generated in {chunk_gen_time:.0f}ms")
                                     if chunk_start_time is None:
-                                        chunk_start_time = time_module.time()
+                                        chunk_start_time = time.time()
                                     
                                     sample_rate = sr
                                     
@@ -566,8 +692,7 @@ def chat_streaming_conversation():
             for response_chunk in stream_generator:
                 if response_chunk.content:
                     token = response_chunk.content
-                    ai_message += token
-                    token_buffer += token
+                    ai_chunks.append(token)
                     
                     # Accumulate tokens until we have a complete sentence
                     sentence_buffer += token
@@ -583,7 +708,7 @@ def chat_streaming_conversation():
                             sentence_idx += 1
                         
                         # Yield the full accumulated text for display (not just current token)
-                        yield f"data: {json.dumps({'type': 'content', 'content': sentence_buffer})}\n\n"
+                        yield sse_event({'type': 'content', 'content': sentence_buffer})
                         sentence_buffer = ""
                     elif len(sentence_buffer) >= 8:
                         # No sentence end yet but have enough text - start TTS anyway
@@ -594,10 +719,10 @@ def chat_streaming_conversation():
                         sentence_buffer = ""
                     else:
                         # No sentence complete yet, yield current token
-                        yield f"data: {json.dumps({'type': 'content', 'content': token})}\n\n"
+                        yield sse_event({'type': 'content', 'content': token})
                 
                 if response_chunk.thinking or response_chunk.reasoning:
-                    thinking += response_chunk.thinking or response_chunk.reasoning
+                    thinking_chunks.append(response_chunk.thinking or response_chunk.reasoning)
                 
                 # Yield any new audio chunks that are ready
                 with audio_queue_lock:
@@ -605,7 +730,7 @@ def chat_streaming_conversation():
                         last_audio_idx += 1
                         audio_data = audio_chunks_list[last_audio_idx]
                         print(f"[CHAT DEBUG] Yielding audio chunk to client: sentence {audio_data.get('index')}, first={audio_data.get('first_chunk')}")
-                        yield f"data: {json.dumps(audio_data)}\n\n"
+                        yield sse_event(audio_data)
             
             # Process any remaining sentence buffer
             if sentence_buffer.strip():
@@ -626,7 +751,10 @@ def chat_streaming_conversation():
                 while len(audio_chunks_list) > last_audio_idx + 1:
                     last_audio_idx += 1
                     audio_data = audio_chunks_list[last_audio_idx]
-                    yield f"data: {json.dumps(audio_data)}\n\n"
+                    yield sse_event(audio_data)
+            
+            ai_message = ''.join(ai_chunks)
+            thinking = ''.join(thinking_chunks)
             
             # Extract thinking from content if not already captured
             if not thinking:
@@ -638,12 +766,12 @@ def chat_streaming_conversation():
                 "content": ai_message,
                 "thinking": thinking
             })
-            shared.save_sessions(shared.sessions_data)
+            shared.schedule_save_sessions(session_id)
             
-            yield f"data: {json.dumps({'type': 'done', 'thinking': thinking, 'session_id': session_id})}\n\n"
+            yield sse_event({'type': 'done', 'thinking': thinking, 'session_id': session_id})
             
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+            yield sse_event({'type': 'error', 'error': str(e)})
         finally:
             # Clean up TTS worker
             try:
@@ -686,7 +814,6 @@ def conversation_greeting():
         
         try:
             if hasattr(tts_provider, 'generate_audio_stream'):
-                import threading
                 def warmup_streaming():
                     try:
                         print("[WARMUP] Starting streaming mode warmup...")
@@ -1,12 +1,28 @@
 import os
+import time
+import hashlib
 import requests
 from datetime import datetime
 from flask import Blueprint, render_template, request, jsonify, send_from_directory
 import app.shared as shared
+from app.chat import forget_message_history
 from app.providers import get_registry
 
 core_bp = Blueprint('core', __name__)
 
+# Remote model catalogues are near-static; keep them per provider/API key
+MODEL_LIST_TTL = 300
+REMOTE_MODEL_PROVIDERS = ('openrouter', 'cerebras')
+_model_list_cache = {}
+
+# Reachability verdicts, reused briefly so UI polling doesn't block on a probe each time
+HEALTH_CACHE_TTL = 3
+_health_cache = {}
+
+def _provider_cache_key(provider):
+    key_hash = hashlib.sha1(str(provider.config.api_key or '').encode('utf-8')).hexdigest()
+    return (provider.provider_name, provider.config.base_url, key_hash)
+
 @core_bp.after_app_request
 def no_cache_voice_js(response):
     """Disable browser caching for voice module JS files so updates take effect immediately."""
@@ -71,6 +87,13 @@ def get_models():
     if not provider:
         return jsonify({"success": False, "error": "Provider not available"}), 500
     
+    cache_key = None
+    if provider.provider_name in REMOTE_MODEL_PROVIDERS:
+        cache_key = _provider_cache_key(provider)
+        cached = _model_list_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return jsonify({"success": True, "models": cached[1], "provider": provider.provider_name})
+    
     try:
         models = provider.get_models()
         # Convert ModelInfo objects to dict format expected by frontend
@@ -81,6 +104,8 @@ def get_models():
             "context_length": m.context_length,
             "description": m.description
         } for m in models]
+        if cache_key and models_data:
+            _model_list_cache[cache_key] = (time.monotonic() + MODEL_LIST_TTL, models_data)
         return jsonify({"success": True, "models": models_data, "provider": provider.provider_name})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
@@ -121,7 +146,6 @@ def get_provider_schema(provider_name):
 
 @core_bp.route('/api/sessions', methods=['GET', 'POST'])
 def handle_sessions():
-    shared.sessions_data = shared.load_sessions()
     if request.method == 'GET':
         sl = sorted(
             [{'id': k, 'title': v.get('title', 'New Chat'), 'updated_at': v.get('updated_at', '')} 
@@ -133,19 +157,19 @@ def handle_sessions():
         
     import uuid
     sid = str(uuid.uuid4())[:8]
+    now_iso = datetime.now().isoformat()
     shared.sessions_data[sid] = {
         'title': 'New Chat',
         'messages': [],
         'system_prompt': shared.get_global_system_prompt(),
-        'created_at': datetime.now().isoformat(),
-        'updated_at': datetime.now().isoformat()
+        'created_at': now_iso,
+        'updated_at': now_iso
     }
-    shared.save_sessions(shared.sessions_data)
+    shared.schedule_save_sessions(sid)
     return jsonify({"success": True, "session_id": sid})
 
 @core_bp.route('/api/sessions/<session_id>', methods=['GET', 'DELETE', 'PUT'])
 def handle_session(session_id):
-    shared.sessions_data = shared.load_sessions()
     if session_id not in shared.sessions_data:
         return jsonify({"success": False, "error": "Not found"}), 404
     
@@ -153,7 +177,8 @@ def handle_session(session_id):
         return jsonify({"success": True, "session": shared.sessions_data[session_id]})
     elif request.method == 'DELETE':
         del shared.sessions_data[session_id]
-        shared.save_sessions(shared.sessions_data)
+        forget_message_history(session_id)
+        shared.schedule_save_sessions(session_id)
         return jsonify({"success": True})
     elif request.method == 'PUT':
         data = request.get_json()
@@ -162,17 +187,17 @@ def handle_session(session_id):
         if 'system_prompt' in data:
             shared.sessions_data[session_id]['system_prompt'] = data['system_prompt']
         shared.sessions_data[session_id]['updated_at'] = datetime.now().isoformat()
-        shared.save_sessions(shared.sessions_data)
+        shared.schedule_save_sessions(session_id)
         return jsonify({"success": True})
 
 @core_bp.route('/api/clear', methods=['POST'])
 def clear_session():
     sid = request.get_json().get('session_id', 'default')
-    shared.sessions_data = shared.load_sessions()
     if sid in shared.sessions_data:
         shared.sessions_data[sid]['messages'] = []
         shared.sessions_data[sid]['updated_at'] = datetime.now().isoformat()
-        shared.save_sessions(shared.sessions_data)
+        shared.schedule_save_sessions(sid)
+    forget_message_history(sid)
     return jsonify({"success": True})
 
 @core_bp.route('/api/health', methods=['GET'])
@@ -182,22 +207,29 @@ def health_check():
     if not provider:
         return jsonify({"status": "disconnected", "message": "Provider not available", "provider": "unknown"}), 200
     
+    cache_key = _provider_cache_key(provider)
+    cached = _health_cache.get(cache_key)
+    if cached and cached[0] > time.monotonic():
+        return jsonify(cached[1])
+    
     try:
         is_healthy = provider.test_connection()
         status = "connected" if is_healthy else "disconnected"
-        return jsonify({
+        result = {
             "status": status,
             "provider": provider.provider_name,
             "message": "OK" if is_healthy else "Connection failed"
-        })
+        }
     except Exception as e:
         # Log the error for debugging
         print(f"[HEALTH CHECK] Error checking {provider.provider_name} connection: {e}")
-        return jsonify({
+        result = {
             "status": "disconnected",
             "provider": provider.provider_name,
             "message": str(e)
-        }), 200
+        }
+    _health_cache[cache_key] = (time.monotonic() + HEALTH_CACHE_TTL, result)
+    return jsonify(result)
 
 @core_bp.route('/api/providers/status', methods=['GET'])
 def providers_status():
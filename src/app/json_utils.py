@@ -0,0 +1,89 @@
+"""
+JSON helpers for hot paths (SSE framing, provider stream parsing, data files).
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise, so callers never need to care which backend is active.
+"""
+
+import os
+import json
+import threading
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """Serialize an object to UTF-8 encoded JSON, compact unless ``indent`` is set."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def sse_event(obj) -> bytes:
+    """Frame an object as a single Server-Sent Events ``data:`` message."""
+    return b"data: " + dumps(obj) + b"\n\n"
+
+
+def load_file(path):
+    """Read and parse a JSON file."""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def dump_file(path, obj, indent: bool = True):
+    """
+    Write JSON to ``path`` atomically.
+
+    The data is written to a temporary file next to the target and moved into
+    place with ``os.replace`` so a crash mid-write never truncates the file.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(dumps(obj, indent=indent))
+    os.replace(tmp_path, path)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson for ``jsonify`` and ``request.get_json``.
+
+    Defers to Flask's stdlib implementation when orjson is missing or when a
+    caller passes ``json.dumps``/``json.loads`` options orjson doesn't support.
+    """
+
+    def _orjson_dumps(self, obj, indent: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or set(kwargs) - {'separators', 'indent'}:
+            return super().dumps(obj, **kwargs)
+        return self._orjson_dumps(obj, indent=bool(kwargs.get('indent'))).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._orjson_dumps(obj, indent) + b"\n", mimetype=self.mimetype)
@@ -6,12 +6,25 @@ import json
 import zipfile
 import tarfile
 import ssl
+from functools import lru_cache
 from flask import Blueprint, request, jsonify
 import app.shared as shared
 
 llamacpp_bp = Blueprint('llamacpp', __name__)
 
+# llama.cpp publishes a few releases a week; don't block on GitHub for every lookup
+LATEST_RELEASE_TTL = 3600
+_latest = {"ts": 0, "ver": None}
+
 def get_latest():
+    if _latest["ver"] and time.time() - _latest["ts"] < LATEST_RELEASE_TTL:
+        return _latest["ver"]
+    ver = _fetch_latest()
+    if ver is None: return "3650"
+    _latest.update(ts=time.time(), ver=ver)
+    return ver
+
+def _fetch_latest():
     try:
         req = urllib.request.Request("https://api.github.com/repos/ggml-org/llama.cpp/releases/latest", headers={'User-Agent': 'Omnix/1.0'})
         with urllib.request.urlopen(req, timeout=10) as r:
@@ -32,58 +45,74 @@ def get_latest():
                     if match:
                         return match.group(1)
             return tag_name.lstrip('b')
-    except: return "3650"
+    except: return None
 
-@llamacpp_bp.route('/api/llamacpp/releases', methods=['GET'])
-def get_releases():
-    import platform
-    sys, mach = platform.system().lower(), platform.machine().lower()
-    rec = "windows-cuda-13.1" if sys == "windows" else "macos-arm" if sys == "darwin" and "arm" in mach else "linux-cuda" if sys == "linux" else "windows-cpu"
-    
-    # Use the correct URLs based on the actual GitHub release
-    tag_name = "b8209"  # Latest version
-    
-    rels = []
+@lru_cache(maxsize=4)
+def _release_list(sys, tag_name):
+    """Build the release entries for a platform/tag once; the URLs never change for a given pair."""
+    url = f"https://github.com/ggml-org/llama.cpp/releases/download/{tag_name}/llama-{tag_name}-bin-"
     
     # Windows releases
     if sys == "windows":
-        rels = [
+        return (
             {
                 "id": "windows-cpu",
                 "name": "Windows (CPU only)",
-                "url": f"https://github.com/ggml-org/llama.cpp/releases/download/{tag_name}/llama-{tag_name}-bin-win-cpu-x64.zip",
+                "url": url + "win-cpu-x64.zip",
                 "extension": ".zip"
             },
             {
                 "id": "windows-cuda-13.1",
                 "name": "Windows (CUDA 13.1)",
-                "url": f"https://github.com/ggml-org/llama.cpp/releases/download/{tag_name}/llama-{tag_name}-bin-win-cuda-13.1-x64.zip",
+                "url": url + "win-cuda-13.1-x64.zip",
                 "extension": ".zip"
             },
             {
                 "id": "windows-cuda-12.4",
                 "name": "Windows (CUDA 12.4)",
-                "url": f"https://github.com/ggml-org/llama.cpp/releases/download/{tag_name}/llama-{tag_name}-bin-win-cuda-12.4-x64.zip",
+                "url": url + "win-cuda-12.4-x64.zip",
                 "extension": ".zip"
             }
-        ]
-    else:
-        # Non-Windows releases
-        rels = [
-            {"id": "macos-arm", "name": "macOS (Apple Silicon)", "url": f"https://github.com/ggml-org/llama.cpp/releases/download/{tag_name}/llama-{tag_name}-bin-macos-arm64.tar.gz", "extension": ".tar.gz"},
-            {"id": "linux-cuda", "name": "Linux (CUDA)", "url": f"https://github.com/ggml-org/llama.cpp/releases/download/{tag_name}/llama-{tag_name}-bin-ubuntu-x64-cuda-cu12.2.tar.gz", "extension": ".tar.gz"}
-        ]
+        )
+    # Non-Windows releases
+    return (
+        {"id": "macos-arm", "name": "macOS (Apple Silicon)", "url": url + "macos-arm64.tar.gz", "extension": ".tar.gz"},
+        {"id": "linux-cuda", "name": "Linux (CUDA)", "url": url + "ubuntu-x64-cuda-cu12.2.tar.gz", "extension": ".tar.gz"}
+    )
+
+@llamacpp_bp.route('/api/llamacpp/releases', methods=['GET'])
+def get_releases():
+    import platform
+    sys, mach = platform.system().lower(), platform.machine().lower()
+    rec = "windows-cuda-13.1" if sys == "windows" else "macos-arm" if sys == "darwin" and "arm" in mach else "linux-cuda" if sys == "linux" else "windows-cpu"
+    
+    # Use the correct URLs based on the actual GitHub release
+    tag_name = "b8209"  # Latest version
     
-    # Mark recommended release
-    for r in rels:
-        r['recommended'] = (r['id'] == rec)
+    # Mark recommended release on copies so the cached entries stay untouched
+    rels = [dict(r, recommended=(r['id'] == rec)) for r in _release_list(sys, tag_name)]
     
     return jsonify({"success": True, "latest_version": tag_name.lstrip('b'), "releases": rels})
 
+SERVER_BINARY_NAMES = ("llama-server.exe", "llama-server", "llama.exe", "llama")
+# Resolved server binary, rescanned only when the server directory changes
+_binary_cache = {"dir": None, "mtime": None, "binary": None}
+
+def find_server_binary(server_dir):
+    try:
+        mtime = os.stat(server_dir).st_mtime_ns
+    except OSError:
+        return None
+    if _binary_cache["dir"] == server_dir and _binary_cache["mtime"] == mtime:
+        return _binary_cache["binary"]
+    binary = next((n for n in SERVER_BINARY_NAMES if os.path.exists(os.path.join(server_dir, n))), None)
+    _binary_cache.update(dir=server_dir, mtime=mtime, binary=binary)
+    return binary
+
 @llamacpp_bp.route('/api/llamacpp/server/status', methods=['GET'])
 def server_status():
     server_dir = os.path.join(shared.MODELS_DIR, 'server')
-    binary = next((n for n in ["llama-server.exe", "llama-server", "llama.exe", "llama"] if os.path.exists(os.path.join(server_dir, n))), None)
+    binary = find_server_binary(server_dir)
     return jsonify({"success": True, "server_dir": server_dir, "binary_found": bool(binary), "binary_name": binary})
 
 @llamacpp_bp.route('/api/llamacpp/server/start', methods=['POST'])
@@ -92,7 +121,7 @@ def start_server():
     if not model: return jsonify({"success": False, "error": "Model required"}), 400
     
     s_dir = os.path.join(shared.MODELS_DIR, 'server')
-    binary = next((n for n in ["llama-server.exe", "llama-server", "llama.exe", "llama"] if os.path.exists(os.path.join(s_dir, n))), None)
+    binary = find_server_binary(s_dir)
     if not binary: return jsonify({"success": False, "error": "Binary not found"}), 400
     
     m_path = model if os.path.isabs(model) else next((p for p in [os.path.join(shared.MODELS_DIR, 'llm', model), os.path.join(s_dir, model)] if os.path.exists(p)), None)
@@ -104,8 +133,7 @@ def start_server():
 
     try:
         import subprocess as sp
-        sp.run(f'netstat -ano | findstr :{port} | findstr LISTENING | awk \'{{print $5}}\' | xargs taskkill /F /PID 2>nul', shell=True)
-        time.sleep(1)
+        shared.kill_port(port)
         proc = sp.Popen([os.path.join(s_dir, binary), "-m", m_path, "-c", "4096", "-ngl", "999", "--host", "0.0.0.0", "--port", str(port)], cwd=s_dir, stdout=sp.PIPE, stderr=sp.STDOUT)
         return jsonify({"success": True, "message": f"Started on port {port}", "pid": proc.pid})
     except Exception as e: return jsonify({"success": False, "error": str(e)}), 500
@@ -113,11 +141,10 @@ def start_server():
 @llamacpp_bp.route('/api/llamacpp/server/stop', methods=['POST'])
 def stop_server():
     try:
-        import subprocess as sp
         port = 8080
         try: port = int(shared.load_settings().get('llamacpp', {}).get('base_url', '').split(':')[-1])
         except: pass
-        sp.run(f'netstat -ano | findstr :{port} | findstr LISTENING | awk \'{{print $5}}\' | xargs taskkill /F /PID 2>nul', shell=True)
+        shared.kill_port(port)
         return jsonify({"success": True, "message": f"Stopped port {port}"})
     except Exception as e: return jsonify({"success": False, "error": str(e)}), 500
 
@@ -22,6 +22,10 @@ import time
 
 from app.shared import BASE_DIR
 
+# Cached GitHub release tag; releases land a few times a week
+LATEST_VERSION_TTL = 3600
+_latest_version = {"ts": 0, "version": None}
+
 
 def detect_os():
     """Detect the operating system."""
@@ -260,6 +264,8 @@ class LlamaCppInstaller:
     
     def get_latest_version(self) -> str:
         """Get the latest llama.cpp version from GitHub API."""
+        if _latest_version["version"] and time.time() - _latest_version["ts"] < LATEST_VERSION_TTL:
+            return _latest_version["version"]
         try:
             req = urllib.request.Request(
                 "https://api.github.com/repos/ggml-org/llama.cpp/releases/latest",
@@ -267,7 +273,9 @@ class LlamaCppInstaller:
             )
             with urllib.request.urlopen(req, timeout=10) as response:
                 data = json.loads(response.read())
-                return data.get('tag_name', 'b3650').lstrip('b')
+                version = data.get('tag_name', 'b3650').lstrip('b')
+                _latest_version.update(ts=time.time(), version=version)
+                return version
         except Exception:
             return "b3650"  # Fallback version
     
@@ -1,20 +1,58 @@
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from flask import Blueprint, request, jsonify
 import app.shared as shared
 
+try:
+    from huggingface_hub import HfApi
+    hf_api = HfApi()
+except ImportError:
+    hf_api = None
+
 llm_bp = Blueprint('llm', __name__)
 
+# At most this many model downloads run at once; further requests queue on the pool
+MAX_CONCURRENT_DOWNLOADS = 3
+download_pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DOWNLOADS, thread_name_prefix='llm-download')
+
+# Read size for model downloads; multi-GB GGUFs make per-chunk overhead add up
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Minimum seconds between progress updates published to shared.downloads
+PROGRESS_INTERVAL = 0.25
+
+# Case variants seen in the wild; avoids a lower() copy per directory entry
+GGUF_SUFFIXES = ('.gguf', '.GGUF')
+
+# Per-download cancellation flags, set by stop_dl and polled between chunks
+_cancel_events = {}
+
+# Pool futures for queued or running downloads, so stop_dl can cancel one that hasn't started
+_download_futures = {}
+
+# GGUF listings keyed on directory mtime: {path: (st_mtime_ns, [(name, size), ...])}
+_ls_cache = {}
+
+def list_gguf(directory):
+    """Return ``[(name, size)]`` for the GGUF files in ``directory``, rescanning only when it changes."""
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return []
+    cached = _ls_cache.get(directory)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with os.scandir(directory) as it:
+        entries = [(e.name, e.stat().st_size) for e in it if e.name.endswith(GGUF_SUFFIXES) and e.is_file()]
+    _ls_cache[directory] = (mtime, entries)
+    return entries
+
 @llm_bp.route('/api/llm/models', methods=['GET'])
 def get_llm_models():
-    models = []
     llm_dir = os.path.join(shared.MODELS_DIR, 'llm')
-    if os.path.exists(llm_dir):
-        for f in os.listdir(llm_dir):
-            if f.lower().endswith('.gguf'):
-                size = os.path.getsize(os.path.join(llm_dir, f))
-                models.append({"name": f, "size": size, "size_formatted": shared.format_size(size)})
+    models = [{"name": f, "size": size, "size_formatted": shared.format_size(size)} for f, size in list_gguf(llm_dir)]
     return jsonify({"success": True, "models": models})
 
 @llm_bp.route('/api/llm/models/<path:filename>', methods=['DELETE'])
@@ -28,16 +66,16 @@ def delete_llm_model(filename):
 @llm_bp.route('/api/huggingface/search', methods=['GET'])
 def hf_search():
     try:
-        from huggingface_hub import list_models
-        models = [{'id': m.id, 'name': m.id.replace('/', ' - '), 'source': 'huggingface'} for m in list_models(search=request.args.get('q', ''), limit=20)]
+        if hf_api is None: raise ImportError("huggingface_hub is not installed")
+        models = [{'id': m.id, 'name': m.id.replace('/', ' - '), 'source': 'huggingface'} for m in hf_api.list_models(search=request.args.get('q', ''), limit=20)]
         return jsonify({"success": True, "models": models})
     except Exception as e: return jsonify({"success": False, "error": str(e)}), 500
 
 @llm_bp.route('/api/huggingface/models/<path:model_id>', methods=['GET'])
 def hf_files(model_id):
     try:
-        from huggingface_hub import list_repo_files
-        files = [{'name': f, 'size': 0, 'size_mb': 0} for f in list_repo_files(model_id, repo_type="model") if f.lower().endswith('.gguf')]
+        if hf_api is None: raise ImportError("huggingface_hub is not installed")
+        files = [{'name': f, 'size': 0, 'size_mb': 0} for f in hf_api.list_repo_files(model_id, repo_type="model") if f.endswith(GGUF_SUFFIXES)]
         return jsonify({"success": True, "files": files})
     except Exception as e: return jsonify({"success": False, "error": str(e)}), 400
 
@@ -51,32 +89,40 @@ def llm_download():
     fname = url.split('/')[-1].split('?')[0]
     
     shared.downloads[did] = {"id": did, "url": url, "filename": fname, "status": "starting", "progress": 0, "total": 0, "downloaded": 0}
+    cancel = _cancel_events[did] = threading.Event()
     
     def dl():
+        # Stopped after the pool picked it up but before the first chunk
+        if cancel.is_set():
+            _cancel_events.pop(did, None)
+            return
         try:
-            import urllib.request, ssl
-            ctx = ssl.create_default_context(); ctx.check_hostname = False; ctx.verify_mode = ssl.CERT_NONE
-            req = urllib.request.Request(url, headers={'User-Agent': 'Omnix/1.0'})
-            
-            with urllib.request.urlopen(urllib.request.Request(url, method='HEAD'), context=ctx) as r:
-                shared.downloads[did]['total'] = int(r.headers.get('Content-Length', 0))
-                
-            shared.downloads[did]['status'] = "downloading"
-            start_time, d_bytes = time.time(), 0
-            
-            with urllib.request.urlopen(req, context=ctx) as r, open(os.path.join(shared.MODELS_DIR, 'llm', fname), 'wb') as f:
-                while True:
-                    if shared.downloads[did]['status'] == 'cancelled': break
-                    chunk = r.read(1024 * 1024)
-                    if not chunk: break
-                    f.write(chunk); d_bytes += len(chunk)
-                    elapsed = time.time() - start_time
-                    shared.downloads[did].update({'downloaded': d_bytes, 'progress': (d_bytes / shared.downloads[did]['total'] * 100) if shared.downloads[did]['total'] else 0})
-            
-            if shared.downloads[did]['status'] != 'cancelled': shared.downloads[did]['status'] = "completed"
-        except Exception as e: shared.downloads[did].update({"status": "error", "error": str(e)})
+            d_bytes, last_emit = 0, 0.0
         
-    threading.Thread(target=dl, daemon=True).start()
+            with shared.http_session.get(url, headers={'User-Agent': 'Omnix/1.0'}, stream=True, timeout=60) as r:
+                r.raise_for_status()
+                # The GET response carries Content-Length; no separate HEAD round-trip needed
+                total = shared.downloads[did]['total'] = int(r.headers.get('Content-Length', 0))
+                if not cancel.is_set(): shared.downloads[did]['status'] = "downloading"
+                with open(os.path.join(shared.MODELS_DIR, 'llm', fname), 'wb') as f:
+                    for chunk in r.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        if cancel.is_set(): break
+                        f.write(chunk); d_bytes += len(chunk)
+                        now = time.monotonic()
+                        if now - last_emit >= PROGRESS_INTERVAL:
+                            shared.downloads[did].update({'downloaded': d_bytes, 'progress': (d_bytes / total * 100) if total else 0})
+                            last_emit = now
+                shared.downloads[did].update({'downloaded': d_bytes, 'progress': (d_bytes / total * 100) if total else 0})
+        
+            if not cancel.is_set(): shared.downloads[did]['status'] = "completed"
+        except Exception as e: shared.downloads[did].update({"status": "error", "error": str(e)})
+        _cancel_events.pop(did, None)
+        # Growing a file doesn't touch the directory mtime, so drop the stale size
+        _ls_cache.pop(os.path.join(shared.MODELS_DIR, 'llm'), None)
+    
+    future = _download_futures[did] = download_pool.submit(dl)
+    # Runs at once if dl already finished; also covers futures cancelled by stop_dl
+    future.add_done_callback(lambda _: _download_futures.pop(did, None))
     return jsonify({"success": True, "download_id": did})
 
 @llm_bp.route('/api/llm/download/status', methods=['GET'])
@@ -89,6 +135,12 @@ def stop_dl():
     did = request.get_json().get('download_id')
     if did in shared.downloads:
         shared.downloads[did]['status'] = 'cancelled'
+        cancel = _cancel_events.get(did)
+        if cancel: cancel.set()
+        # A download still queued on the pool is dropped without ever starting
+        future = _download_futures.get(did)
+        if future and future.cancel():
+            _cancel_events.pop(did, None)
         try: os.remove(os.path.join(shared.MODELS_DIR, 'llm', shared.downloads[did]['filename']))
         except: pass
         return jsonify({"success": True})
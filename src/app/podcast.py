@@ -2,12 +2,17 @@ import os
 import json
 import time
 import base64
-import requests
-import io
-import struct
+import shutil
+import subprocess
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from flask import Blueprint, request, jsonify, Response, send_file
 import app.shared as shared
+from app import json_utils
+from app.json_utils import sse_event
+from app.providers.base import iter_sse_data
 
 podcast_bp = Blueprint('podcast', __name__)
 
@@ -15,14 +20,138 @@ EP_FILE = os.path.join(shared.DATA_DIR, 'podcasts', 'episodes.json')
 VP_FILE = os.path.join(shared.DATA_DIR, 'podcasts', 'voice_profiles.json')
 os.makedirs(os.path.dirname(EP_FILE), exist_ok=True)
 
+# Segment synthesis runs ahead of the SSE stream and overlaps script generation. One worker:
+# the TTS provider is an in-process model without an inference lock, not a network service
+TTS_CONCURRENCY = 1
+tts_pool = ThreadPoolExecutor(max_workers=TTS_CONCURRENCY, thread_name_prefix='podcast-tts')
+
+# ffmpeg is optional: when present, finished episodes also get a much smaller Ogg Opus copy for clients that ask for it
+FFMPEG = shutil.which('ffmpeg')
+OPUS_BITRATE = '32k'
+
+# Parsed data files keyed by path -> (st_mtime_ns, data); reloaded only when the file changes on disk
+_data_cache = {}
+_data_lock = threading.Lock()
+
 def load_data(path, default):
+    """Load a JSON data file. The result is cached and shared, so only mutate it to pass it to save_data."""
     try:
-        if os.path.exists(path): return json.load(open(path, 'r'))
-    except: pass
+        with _data_lock:
+            mtime = os.stat(path).st_mtime_ns
+            cached = _data_cache.get(path)
+            if cached and cached[0] == mtime: return cached[1]
+            data = json_utils.load_file(path)
+            _data_cache[path] = (mtime, data)
+            return data
+    except FileNotFoundError: pass
+    except (OSError, ValueError) as e: print(f"[PODCAST] Could not read {path}: {e}")
     return default
 
 def save_data(path, data):
-    with open(path, 'w') as f: json.dump(data, f, indent=2)
+    with _data_lock:
+        # Atomic replace: a crash mid-write leaves the previous file intact instead of a truncated one
+        json_utils.dump_file(path, data)
+        _data_cache[path] = (os.stat(path).st_mtime_ns, data)
+
+# Episodes are an episodes.json snapshot plus an append-only log of upserts/deletes replayed on load
+EP_LOG = EP_FILE + '.log'
+# Fold the log into the snapshot once it outgrows it, with a floor so small libraries don't churn
+EP_COMPACT_RATIO = 2
+EP_COMPACT_MIN_BYTES = 64 * 1024
+_episodes = {"key": None, "data": None}
+_episodes_lock = threading.Lock()
+
+def _episodes_key():
+    try: snapshot = os.stat(EP_FILE).st_mtime_ns
+    except OSError: snapshot = None
+    try: log_size = os.stat(EP_LOG).st_size
+    except OSError: log_size = 0
+    return snapshot, log_size
+
+def _read_episodes():
+    eps = {}
+    try:
+        eps = json_utils.load_file(EP_FILE)
+    except FileNotFoundError: pass
+    except (OSError, ValueError) as e: print(f"[PODCAST] Could not read {EP_FILE}: {e}")
+    try:
+        with open(EP_LOG, 'rb') as f:
+            for line in f:
+                try: entry = json_utils.loads(line)
+                except ValueError: continue  # torn last line from an interrupted append
+                if entry.get('episode') is None: eps.pop(entry.get('id'), None)
+                else: eps[entry['id']] = entry['episode']
+    except OSError: pass
+    return eps
+
+def _load_episodes_locked():
+    key = _episodes_key()
+    if _episodes["key"] != key:
+        _episodes["data"], _episodes["key"] = _read_episodes(), key
+    return _episodes["data"]
+
+def load_episodes():
+    """All episodes by id. The dict is cached and shared; change it through save_episode/delete_episode."""
+    with _episodes_lock:
+        return _load_episodes_locked()
+
+def _append_episode(ep_id, ep):
+    with _episodes_lock:
+        eps = _load_episodes_locked()
+        with open(EP_LOG, 'a+b') as f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                # Seal a torn line left by an interrupted append so this entry starts on its own line
+                if f.read(1) != b'\n': f.write(b'\n')
+            f.write(json_utils.dumps({"id": ep_id, "episode": ep}) + b'\n')
+            log_size = f.tell()
+        if ep is None: eps.pop(ep_id, None)
+        else: eps[ep_id] = ep
+        try: snapshot_size = os.stat(EP_FILE).st_size
+        except OSError: snapshot_size = 0
+        if log_size > max(EP_COMPACT_MIN_BYTES, snapshot_size * EP_COMPACT_RATIO):
+            # Snapshot first: a crash before the log is cleared just replays entries already folded in
+            json_utils.dump_file(EP_FILE, eps)
+            os.remove(EP_LOG)
+        _episodes["key"] = _episodes_key()
+
+def save_episode(ep_id, ep):
+    _append_episode(ep_id, ep)
+
+def delete_episode(ep_id):
+    _append_episode(ep_id, None)
+
+def audio_event(audio_b64, fields):
+    """SSE event for a segment, built around the base64 audio so the multi-MB string never goes through the JSON encoder."""
+    head = json_utils.dumps(fields)[:-1]
+    return b'data: ' + head + b',"audio":"' + audio_b64.encode('ascii') + b'"}\n\n'
+
+def audio_path(ep_id):
+    return os.path.join(shared.DATA_DIR, 'podcasts', f"{ep_id}.wav")
+
+def opus_path(ep_id):
+    return os.path.join(shared.DATA_DIR, 'podcasts', f"{ep_id}.opus")
+
+def encode_opus(wav_path, out_path):
+    """Transcode a finished episode to Opus; the sidecar only appears once the encode has completed."""
+    tmp_path = out_path + '.tmp'
+    try:
+        subprocess.run([FFMPEG, '-nostdin', '-loglevel', 'error', '-y', '-i', wav_path, '-c:a', 'libopus', '-b:a', OPUS_BITRATE, '-f', 'ogg', tmp_path],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        os.replace(tmp_path, out_path)
+    except Exception as e:
+        print(f"[PODCAST] Opus encode failed for {wav_path}: {e}")
+        try: os.remove(tmp_path)
+        except OSError: pass
+
+def open_wav(path, sample_rate):
+    """Open a 16-bit mono WAV for streaming writes; the header sizes are patched on close."""
+    wf = wave.open(path, 'wb')
+    wf.setnchannels(1)
+    wf.setsampwidth(2)
+    wf.setframerate(sample_rate)
+    return wf
 
 @podcast_bp.route('/api/podcast/voice-profiles', methods=['GET', 'POST'])
 def profiles():
@@ -38,57 +167,89 @@ def profiles():
 
 @podcast_bp.route('/api/podcast/episodes', methods=['GET'])
 def get_episodes():
-    eps = load_data(EP_FILE, {})
+    eps = load_episodes()
     return jsonify({"success": True, "episodes": sorted(eps.values(), key=lambda x: x.get('created_at', ''), reverse=True)})
 
 @podcast_bp.route('/api/podcast/episodes/<ep_id>', methods=['GET', 'PUT', 'DELETE'])
 def manage_episode(ep_id):
-    eps = load_data(EP_FILE, {})
+    eps = load_episodes()
     if ep_id not in eps: return jsonify({"success": False, "error": "Not found"}), 404
     
     if request.method == 'GET':
-        ep = eps[ep_id]
-        if os.path.exists(os.path.join(shared.DATA_DIR, 'podcasts', f"{ep_id}.wav")): ep['audio_url'] = f"/api/podcast/episodes/{ep_id}/audio"
+        ep = dict(eps[ep_id])
+        if os.path.exists(audio_path(ep_id)): ep['audio_url'] = f"/api/podcast/episodes/{ep_id}/audio"
         return jsonify({"success": True, "episode": ep})
     
     if request.method == 'PUT':
         data = request.get_json()
+        ep = eps[ep_id]
         if data:
             allowed = {'title', 'topic', 'transcript', 'speakers', 'duration', 'format', 'length', 'status', 'points', 'outline'}
             filtered = {k: v for k, v in data.items() if k in allowed}
-            eps[ep_id].update(filtered)
-            save_data(EP_FILE, eps)
-        return jsonify({"success": True, "episode": eps[ep_id]})
+            ep = {**ep, **filtered}
+            save_episode(ep_id, ep)
+        return jsonify({"success": True, "episode": ep})
         
-    del eps[ep_id]
-    save_data(EP_FILE, eps)
-    try: os.remove(os.path.join(shared.DATA_DIR, 'podcasts', f"{ep_id}.wav"))
-    except: pass
+    delete_episode(ep_id)
+    for path in (audio_path(ep_id), opus_path(ep_id)):
+        try: os.remove(path)
+        except: pass
     return jsonify({"success": True})
 
 @podcast_bp.route('/api/podcast/episodes/<ep_id>/audio', methods=['GET'])
 def get_audio(ep_id):
-    path = os.path.join(shared.DATA_DIR, 'podcasts', f"{ep_id}.wav")
-    return send_file(path, mimetype='audio/wav') if os.path.exists(path) else (jsonify({"error": "No audio"}), 404)
+    wav = audio_path(ep_id)
+    # Opus only for clients that prefer it outright; a bare */* still gets the WAV every browser can play
+    if request.accept_mimetypes.best_match(['audio/wav', 'audio/ogg']) == 'audio/ogg':
+        try:
+            opus = opus_path(ep_id)
+            # Skip a sidecar left over from an earlier generation of this episode
+            if os.stat(opus).st_mtime_ns >= os.stat(wav).st_mtime_ns: return send_file(opus, mimetype='audio/ogg')
+        except FileNotFoundError: pass
+    # send_file stats the file itself, so let it report a missing episode instead of checking first
+    try: return send_file(wav, mimetype='audio/wav')
+    except FileNotFoundError: return jsonify({"error": "No audio"}), 404
 
-def llm_generate(prompt):
+def llm_request(prompt, stream=False):
     cfg = shared.get_provider_config()
     payload = {"model": cfg.get('model', 'local-model'), "messages": [{"role": "user", "content": prompt}]}
+    if stream: payload["stream"] = True
     headers = {"Content-Type": "application/json"}
     if cfg['provider'] in ['openrouter', 'cerebras']: headers["Authorization"] = f"Bearer {cfg['api_key']}"
     url = f"{cfg['base_url']}/chat/completions" if cfg['provider'] == 'openrouter' else f"{cfg['base_url']}/v1/chat/completions"
-    r = requests.post(url, json=payload, headers=headers, timeout=120)
+    return shared.http_session.post(url, json=payload, headers=headers, timeout=120, stream=stream)
+
+def llm_generate(prompt):
+    r = llm_request(prompt)
     return r.json()['choices'][0]['message']['content'] if r.status_code == 200 else ""
 
+def llm_stream(prompt):
+    """Yield content deltas from a streamed chat completion."""
+    with llm_request(prompt, stream=True) as r:
+        if r.status_code != 200: return
+        for data in iter_sse_data(r):
+            # One bad event shouldn't abort the episode and drop the segments produced so far
+            try: choices = json_utils.loads(data).get('choices')
+            except ValueError as e:
+                print(f"[PODCAST] Skipping undecodable stream event: {e}")
+                continue
+            if choices and (content := choices[0].get('delta', {}).get('content')):
+                yield content
+
+_json_decoder = json.JSONDecoder()
+
+def extract_json(text):
+    """Decode the first JSON object in an LLM reply, ignoring any prose around it."""
+    start = text.find('{')
+    if start < 0: return json.loads(text)
+    return _json_decoder.raw_decode(text, start)[0]
+
 @podcast_bp.route('/api/podcast/outline', methods=['POST'])
 def gen_outline():
     data = request.get_json()
     p = f"Create a podcast outline JSON for Topic: {data.get('topic')}. Format: {{'outline': '...', 'sections': [{{'title': '...', 'description': '...'}}]}}"
     try:
-        res = llm_generate(p)
-        import re
-        match = re.search(r'\{[\s\S]*\}', res)
-        return jsonify({"success": True, **json.loads(match.group() if match else res)})
+        return jsonify({"success": True, **extract_json(llm_generate(p))})
     except Exception as e: return jsonify({"success": False, "error": str(e)}), 500
 
 @podcast_bp.route('/api/podcast/generate', methods=['POST'])
@@ -97,8 +258,9 @@ def generate_ep():
     ep_id = data.get('id', f"ep_{int(time.time())}")
     
     def gen():
+        futures, wav_f = [], None
         try:
-            yield f"data: {json.dumps({'type': 'phase', 'phase': 'script', 'message': 'Generating...'})}\n\n"
+            yield sse_event({'type': 'phase', 'phase': 'script', 'message': 'Generating...'})
             speaker_names = [s.get('name', f'Speaker {i+1}') for i, s in enumerate(data.get('speakers', []))]
             if not speaker_names:
                 speaker_names = ['Host', 'Guest']
@@ -108,54 +270,82 @@ def generate_ep():
                 f"Use exactly these speaker names: {speakers_str}. "
                 f"Format lines exactly as 'SpeakerName: Text'"
             )
-            script = llm_generate(prompt)
-            
-            segments = []
-            for line in script.split('\n'):
-                if ':' in line and len(line.split(':', 1)) == 2:
-                    sp, txt = line.split(':', 1)
-                    segments.append({"speaker": sp.strip(), "text": txt.strip()})
             
             # Build speaker-to-voice mapping by name (case-insensitive)
             input_speakers = data.get('speakers', [])
             voice_by_name = {s.get('name', '').lower(): s.get('voice_id') for s in input_speakers}
-
-            transcript, audios = [], []
-            for i, seg in enumerate(segments):
+            clone_by_voice = {}
+            tts_provider = shared.get_tts_provider()
+            segments, transcript = [], []
+            emitted = 0
+            
+            def synthesize(i, text, v_clone):
+                """Runs on the TTS pool: returns the ready-to-send SSE event and decoded PCM, or None on failure."""
+                result = tts_provider.generate_audio(text=shared.remove_emojis(text), speaker=v_clone, language="en")
+                if not result.get('success'): return None
+                adata, sr = result.get('audio'), result.get('sample_rate')
+                # validate=True guarantees the payload is pure base64, so it can be spliced into the event unescaped
+                pcm = base64.b64decode(adata, validate=True)
+                return audio_event(adata, {'type': 'audio', 'sample_rate': sr, 'segment_index': i}), pcm
+            
+            def add_segment(line):
+                if ':' not in line: return
+                sp, txt = line.split(':', 1)
+                seg = {"speaker": sp.strip(), "text": txt.strip()}
+                i = len(segments)
+                segments.append(seg)
+                if not tts_provider: return
                 # Match by name first, fall back to round-robin by index
                 vid = voice_by_name.get(seg['speaker'].lower())
                 if vid is None and input_speakers:
                     vid = input_speakers[i % len(input_speakers)].get('voice_id')
-                v_clone = shared.custom_voices.get(vid.replace(" (Custom)", "") if vid else "", {}).get('voice_clone_id', vid)
-                
-                req = {"text": shared.remove_emojis(seg['text']), "language": "en"}
-                if v_clone: req["voice_clone_id"] = v_clone
-                
-                try:
-                    tts_provider = shared.get_tts_provider()
-                    if tts_provider:
-                        result = tts_provider.generate_audio(text=shared.remove_emojis(seg['text']), speaker=v_clone, language="en")
-                        if result.get('success'):
-                            adata, sr = result.get('audio'), result.get('sample_rate')
-                            yield f"data: {json.dumps({'type': 'audio', 'audio': adata, 'sample_rate': sr, 'segment_index': i})}\n\n"
+                if vid not in clone_by_voice:
+                    clone_by_voice[vid] = shared.custom_voices.get(vid.replace(" (Custom)", "") if vid else "", {}).get('voice_clone_id', vid)
+                futures.append(tts_pool.submit(synthesize, i, seg['text'], clone_by_voice[vid]))
+            
+            def drain(block=False):
+                """Yield audio for finished segments in script order; with block, wait for all of them."""
+                nonlocal emitted, wav_f
+                while emitted < len(futures) and (block or futures[emitted].done()):
+                    seg, future = segments[emitted], futures[emitted]
+                    emitted += 1
+                    try:
+                        audio = future.result()
+                        if audio:
+                            event, pcm = audio
+                            yield event
                             transcript.append({"speaker": seg['speaker'], "text": seg['text']})
-                            audios.append(base64.b64decode(adata))
-                except: pass
+                            # Append PCM to the episode file as segments arrive instead of buffering the whole episode
+                            if wav_f is None:
+                                path = audio_path(ep_id)
+                                os.makedirs(os.path.dirname(path), exist_ok=True)
+                                wav_f = open_wav(path, shared.TTS_SAMPLE_RATE)
+                                try: os.remove(opus_path(ep_id))
+                                except OSError: pass
+                            wav_f.writeframesraw(pcm)
+                    except: pass
+            
+            # Each dialogue line goes to TTS as soon as the LLM finishes it, so audio starts before the script is done
+            buf = ''
+            for delta in llm_stream(prompt):
+                buf += delta
+                if '\n' in delta:
+                    *lines, buf = buf.split('\n')
+                    for line in lines: add_segment(line)
+                yield from drain()
+            add_segment(buf)
+            yield from drain(block=True)
                 
-            if audios:
-                podcasts_dir = os.path.join(shared.DATA_DIR, 'podcasts')
-                os.makedirs(podcasts_dir, exist_ok=True)
-                wav_io = io.BytesIO()
-                wav_io.write(b'RIFF'); wav_io.write(struct.pack('<I', 36 + sum(len(a) for a in audios))); wav_io.write(b'WAVEfmt ')
-                wav_io.write(struct.pack('<IHHIIHH', 16, 1, 1, shared.TTS_SAMPLE_RATE, shared.TTS_SAMPLE_RATE*2, 2, 16))
-                wav_io.write(b'data'); wav_io.write(struct.pack('<I', sum(len(a) for a in audios)))
-                for a in audios: wav_io.write(a)
-                with open(os.path.join(podcasts_dir, f"{ep_id}.wav"), 'wb') as f: f.write(wav_io.getvalue())
+            if wav_f:
+                wav_f.close()
+                if FFMPEG: threading.Thread(target=encode_opus, args=(audio_path(ep_id), opus_path(ep_id)), daemon=True).start()
             
-            eps = load_data(EP_FILE, {})
-            eps[ep_id] = {**data, "transcript": transcript, "status": "complete", "created_at": datetime.now().isoformat()}
-            save_data(EP_FILE, eps)
-            yield f"data: {json.dumps({'type': 'done'})}\n\n"
+            save_episode(ep_id, {**data, "transcript": transcript, "status": "complete", "created_at": datetime.now().isoformat()})
+            yield sse_event({'type': 'done'})
             
-        except Exception as e: yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+        except Exception as e: yield sse_event({'type': 'error', 'error': str(e)})
+        finally:
+            # Client went away: don't synthesize segments nobody will receive
+            for future in futures: future.cancel()
+            if wav_f: wav_f.close()
     return Response(gen(), mimetype='text/event-stream')
\ No newline at end of file
@@ -5,19 +5,32 @@ This module defines the abstract base classes for Text-to-Speech (TTS) and
 Speech-to-Text (STT) providers, following the Plugin-Based Provider Pattern.
 """
 
+import collections
+import hashlib
+import os
+import signal
+import socket
 import subprocess
 import requests
 import time
 import threading
-import queue
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Optional, Dict, List, Any, Union, Iterator
 from enum import Enum
+from urllib.parse import urlsplit
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bytes pulled from a service's stdout pipe per read by the log thread
+LOG_READ_SIZE = 65536
+# Most recent log lines kept per service; older lines are dropped if nobody polls get_logs
+LOG_QUEUE_MAXLEN = 10000
+# Startup readiness polling: first retry after 25ms, doubling up to one second
+READY_POLL_START = 0.025
+READY_POLL_MAX = 1.0
+
 
 class AudioProviderError(Exception):
     """Base exception for audio provider errors."""
@@ -59,8 +72,9 @@ class BaseService:
     
     config: Dict[str, Any]
     process: Optional[subprocess.Popen] = None
-    log_queue: Optional[queue.Queue] = None
+    log_queue: Optional[collections.deque] = None
     log_thread: Optional[threading.Thread] = None
+    _log_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
     
     def start(self) -> Dict[str, Any]:
         """
@@ -90,7 +104,7 @@ class BaseService:
         """
         if self.process and self.process.poll() is None:
             try:
-                self.process.terminate()
+                self._signal_process()
                 self.process.wait(timeout=10)
                 self.process = None
                 
@@ -104,7 +118,7 @@ class BaseService:
                 return True
             except subprocess.TimeoutExpired:
                 logger.warning("Service did not terminate gracefully, killing...")
-                self.process.kill()
+                self._signal_process(kill=True)
                 self.process = None
                 return False
             except Exception as e:
@@ -114,6 +128,27 @@ class BaseService:
         logger.info("Service was not running")
         return True
     
+    def _signal_process(self, kill: bool = False) -> None:
+        """
+        Terminate (or kill) the service subprocess.
+        
+        Services started with ``start_new_session=True`` lead their own process
+        group, so the whole group is signalled and any workers they spawned go
+        down with them. Otherwise only the process itself is signalled.
+        """
+        if os.name == "posix":
+            try:
+                pgid = os.getpgid(self.process.pid)
+            except ProcessLookupError:
+                return
+            if pgid == self.process.pid:
+                os.killpg(pgid, signal.SIGKILL if kill else signal.SIGTERM)
+                return
+        if kill:
+            self.process.kill()
+        else:
+            self.process.terminate()
+    
     def health_check(self) -> bool:
         """
         Check if the service is healthy and responding.
@@ -132,6 +167,58 @@ class BaseService:
             logger.error(f"Health check failed: {e}")
             return False
     
+    def _wait_ready(self, base_url: str, timeout: float = 30, socket_path: Optional[str] = None) -> bool:
+        """
+        Wait for a just-started service to accept connections and pass health_check.
+        
+        Probes ``socket_path`` (when given) or the TCP port with a cheap connect
+        on an exponential backoff and only issues the HTTP health check once
+        something is listening. Gives up immediately
+        if the subprocess exits.
+        
+        Returns:
+            True once healthy, False on timeout or if the process died
+        """
+        parts = urlsplit(base_url)
+        address = (parts.hostname or "localhost", parts.port or (443 if parts.scheme == "https" else 80))
+        deadline = time.monotonic() + timeout
+        delay = READY_POLL_START
+        while True:
+            if self.process and self.process.poll() is not None:
+                return False
+            try:
+                self._probe_listening(address, socket_path)
+                if self.health_check():
+                    return True
+            except OSError:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, READY_POLL_MAX)
+    
+    @staticmethod
+    def _probe_listening(address: tuple, socket_path: Optional[str] = None) -> None:
+        """
+        Connect to the service's Unix socket, or its TCP port, and hang up.
+        
+        The socket is optional for the service, just as it is for requests
+        (see UnixSocketAdapter), so a missing socket falls back to TCP.
+        
+        Raises:
+            OSError: If neither is accepting connections
+        """
+        if socket_path:
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                    probe.settimeout(0.1)
+                    probe.connect(socket_path)
+                return
+            except OSError:
+                pass
+        socket.create_connection(address, timeout=0.1).close()
+    
     def get_logs(self) -> List[str]:
         """
         Get recent log messages from the service.
@@ -139,30 +226,44 @@ class BaseService:
         Returns:
             List of log messages
         """
-        if not self.log_queue:
+        if self.log_queue is None:
             return []
         
-        logs = []
-        try:
-            while True:
-                log_line = self.log_queue.get_nowait()
-                logs.append(log_line)
-        except queue.Empty:
-            pass
-        
+        with self._log_lock:
+            logs = list(self.log_queue)
+            self.log_queue.clear()
         return logs
     
     def _start_log_thread(self):
         """Start a background thread to capture subprocess logs."""
         if self.log_queue is None:
-            self.log_queue = queue.Queue()
+            self.log_queue = collections.deque(maxlen=LOG_QUEUE_MAXLEN)
+        
+        def log_put(line):
+            with self._log_lock:
+                self.log_queue.append(line)
         
         def log_reader():
             if self.process and self.process.stdout:
                 try:
-                    for line in iter(self.process.stdout.readline, ''):
-                        if line:
-                            self.log_queue.put(line.strip())
+                    # Read whatever the pipe has in one syscall and split lines ourselves,
+                    # rather than one readline round-trip per line
+                    fd = self.process.stdout.fileno()
+                    buf = bytearray()
+                    while True:
+                        chunk = os.read(fd, LOG_READ_SIZE)
+                        if not chunk:
+                            break
+                        buf.extend(chunk)
+                        end = buf.rfind(b'\n')
+                        if end < 0:
+                            continue
+                        for line in bytes(buf[:end]).decode('utf-8', 'replace').split('\n'):
+                            if line.strip():
+                                log_put(line.strip())
+                        del buf[:end + 1]
+                    if buf.strip():
+                        log_put(bytes(buf).decode('utf-8', 'replace').strip())
                 except Exception as e:
                     logger.error(f"Error reading logs: {e}")
         
@@ -178,11 +279,20 @@ class BaseTTSProvider(BaseService):
     All TTS providers must inherit from this class and implement the required methods.
     """
     
-    @property
-    @abstractmethod
-    def provider_name(self) -> str:
-        """Return the unique name of this provider."""
-        pass
+    # Successful voice_clone results kept by voice_clone_cached, oldest evicted first
+    VOICE_CLONE_CACHE_SIZE = 64
+    
+    # Every TTS provider class defined so far, in definition order, for the registry
+    _subclasses = []
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        BaseTTSProvider._subclasses.append(cls)
+    
+    _clone_cache: Dict[tuple, Dict[str, Any]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    # Unique name of this provider; subclasses must override it
+    provider_name = "base"
     
     @abstractmethod
     def get_speakers(self) -> List[Dict[str, Any]]:
@@ -204,7 +314,9 @@ class BaseTTSProvider(BaseService):
             text: The text to synthesize
             speaker: Optional speaker/voice to use
             language: Optional language code
-            **kwargs: Provider-specific parameters
+            **kwargs: Provider-specific parameters. Providers that support
+                ``return_bytes=True`` return the WAV as raw ``audio_bytes``
+                instead of base64 ``audio``.
             
         Returns:
             Dict with 'success', 'audio' (base64), 'sample_rate', 'format' keys
@@ -227,8 +339,10 @@ class BaseTTSProvider(BaseService):
         """
         # Default implementation falls back to batch generation
         # Providers should override this for true streaming
-        result = self.generate_audio(text, speaker, language, **kwargs)
-        if result.get('success') and result.get('audio'):
+        result = self.generate_audio(text, speaker, language, return_bytes=True, **kwargs)
+        if result.get('success') and result.get('audio_bytes'):
+            yield result['audio_bytes']
+        elif result.get('success') and result.get('audio'):
             import base64
             audio_bytes = base64.b64decode(result['audio'])
             yield audio_bytes
@@ -249,6 +363,32 @@ class BaseTTSProvider(BaseService):
         """
         pass
     
+    def voice_clone_cached(self, voice_id: str, audio_data: bytes, 
+                          ref_text: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Create a voice clone, skipping the provider when this exact sample was
+        already cloned under ``voice_id``.
+        
+        Args:
+            voice_id: Unique identifier for the voice clone
+            audio_data: Reference audio data
+            ref_text: Optional reference text for the voice
+            
+        Returns:
+            Dict with 'success' status and optional 'message'
+        """
+        key = (voice_id, hashlib.blake2b(audio_data, digest_size=16).digest(), ref_text)
+        result = self._clone_cache.pop(key, None)
+        if result is None:
+            result = self.voice_clone(voice_id, audio_data, ref_text)
+            if not result.get('success'):
+                return result
+        # (Re)insert as most recently used; dicts keep insertion order
+        self._clone_cache[key] = result
+        while len(self._clone_cache) > self.VOICE_CLONE_CACHE_SIZE:
+            self._clone_cache.pop(next(iter(self._clone_cache)), None)
+        return result
+    
     def get_capabilities(self) -> List[AudioProviderCapability]:
         """
         Get list of capabilities supported by this provider.
@@ -275,11 +415,15 @@ class BaseSTTProvider(BaseService):
     All STT providers must inherit from this class and implement the required methods.
     """
     
-    @property
-    @abstractmethod
-    def provider_name(self) -> str:
-        """Return the unique name of this provider."""
-        pass
+    # Every STT provider class defined so far, in definition order, for the registry
+    _subclasses = []
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        BaseSTTProvider._subclasses.append(cls)
+    
+    # Unique name of this provider; subclasses must override it
+    provider_name = "base"
     
     @abstractmethod
     def transcribe(self, audio_file_path: str, language: Optional[str] = None, 
@@ -344,14 +488,19 @@ class BaseSTTProvider(BaseService):
         return AudioProviderCapability.BATCH_PROCESSING in self.get_capabilities()
 
 
+# Defaults shared by AudioProviderConfig and the registry's dict-config fast path
+DEFAULT_AUDIO_TIMEOUT = 300
+DEFAULT_AUDIO_MAX_RETRIES = 3
+
+
 @dataclass
 class AudioProviderConfig:
     """Configuration for an audio provider instance."""
     
     provider_type: str
     base_url: Optional[str] = None
-    timeout: int = 300
-    max_retries: int = 3
+    timeout: int = DEFAULT_AUDIO_TIMEOUT
+    max_retries: int = DEFAULT_AUDIO_MAX_RETRIES
     extra_params: Dict[str, Any] = field(default_factory=dict)
     
     def to_dict(self) -> Dict[str, Any]:
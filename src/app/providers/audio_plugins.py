@@ -6,18 +6,20 @@ This module contains concrete implementations of audio providers:
 """
 
 import subprocess
-import requests
-import time
 import os
+import requests
 import base64
 import numpy as np
 import soundfile as sf
 import io
 import wave
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List, Any, Union, Iterator
 from pathlib import Path
 import logging
 
+from .base import http_session, mount_unix_socket, iter_sse_data
+from app.json_utils import loads as json_loads
 from .audio_base import (
     BaseTTSProvider, BaseSTTProvider, 
     AudioProviderConfig, TTSAudioResponse, STTTranscriptionResponse,
@@ -26,39 +28,109 @@ from .audio_base import (
 
 logger = logging.getLogger(__name__)
 
+# Concurrent requests for transcribe_raw_batch; they share the pooled keep-alive session
+STT_BATCH_CONCURRENCY = 4
+stt_batch_pool = ThreadPoolExecutor(max_workers=STT_BATCH_CONCURRENCY, thread_name_prefix='stt-batch')
+
+
+class MultipartBody:
+    """
+    File-like multipart/form-data request body.
+    
+    requests' ``files=`` reads the whole upload into memory and then copies it
+    into the encoded body. This instead hands the file object to the HTTP client
+    between a small header and trailer, so the audio is streamed from its source
+    in blocks. ``__len__`` lets requests send a Content-Length.
+    """
+    
+    def __init__(self, fields: Dict[str, Any], name: str, filename: str, fileobj, size: int,
+                 content_type: str = "application/octet-stream"):
+        boundary = os.urandom(16).hex()
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        filename = filename.replace('"', '%22')
+        head = b"".join(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{key}"\r\n\r\n{value}\r\n'.encode("utf-8")
+            for key, value in fields.items()
+        )
+        head += (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                 f'Content-Type: {content_type}\r\n\r\n').encode("utf-8")
+        tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+        self._parts = [io.BytesIO(head), fileobj, io.BytesIO(tail)]
+        self._length = len(head) + size + len(tail)
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def read(self, size: int = -1) -> bytes:
+        chunks = []
+        while self._parts and size != 0:
+            chunk = self._parts[0].read(size)
+            if not chunk:
+                self._parts.pop(0)
+                continue
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+        return b"".join(chunks)
+
 
 class ParakeetSTT(BaseSTTProvider):
     """Parakeet STT Provider - wraps FasterWhisper/Parakeet STT service."""
     
-    @property
-    def provider_name(self) -> str:
-        """Return the unique name of this provider."""
-        return "parakeet"
+    default_capabilities = [
+        AudioProviderCapability.STREAMING,
+        AudioProviderCapability.BATCH_PROCESSING,
+        AudioProviderCapability.MULTILINGUAL,
+    ]
+    
+    # Resolved once; start() only has to stat it. The script lives in the repo
+    # root (src/app/providers -> repo root is four levels up from this file)
+    SCRIPT_PATH = Path(__file__).resolve().parents[3] / "parakeet_stt_server.py"
+    
+    provider_name = "parakeet"
+    
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        # Endpoint URLs are fixed for the provider's lifetime; build them once
+        self._base_url = self.config.get("base_url", "http://localhost:8000")
+        self._health_url = f"{self._base_url}/health"
+        self._transcribe_url = f"{self._base_url}/transcribe"
+        self._transcribe_raw_url = f"{self._base_url}/transcribe_raw"
+        # Whether the server takes raw Float32 bodies at /transcribe_raw; None until probed
+        self._supports_raw_post = None
+        # Optional Unix socket for a local server; requests fall back to TCP if it is missing
+        self._socket_path = config.get("socket_path")
+        if self._socket_path:
+            mount_unix_socket(self._base_url, self._socket_path)
     
     def start(self) -> Dict[str, Any]:
         if self.process and self.process.poll() is None:
             return {"running": True, "message": "Service already running"}
         
         try:
-            script_path = Path(__file__).parent.parent.parent / "parakeet_stt_server.py"
-            if not script_path.exists():
-                return {"running": False, "message": f"Server script not found: {script_path}"}
+            if not self.SCRIPT_PATH.is_file():
+                return {"running": False, "message": f"Server script not found: {self.SCRIPT_PATH}"}
             
+            # -u so startup logs arrive as they are written; own session so stop() reaps workers too
+            cmd = ['python', '-u', str(self.SCRIPT_PATH)]
+            if self._socket_path:
+                cmd += ['--socket', self._socket_path]
             self.process = subprocess.Popen(
-                ['python', str(script_path)],
+                cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1
+                bufsize=0,
+                close_fds=True,
+                start_new_session=True
             )
             
             self._start_log_thread()
+            self._supports_raw_post = None
             
-            max_wait = 30
-            for _ in range(max_wait):
-                if self.health_check():
-                    return {"running": True, "message": "Parakeet STT started successfully"}
-                time.sleep(1)
+            if self._wait_ready(self._base_url, timeout=30, socket_path=self._socket_path):
+                return {"running": True, "message": "Parakeet STT started successfully"}
+            if self.process.poll() is not None:
+                return {"running": False, "message": f"Service exited during startup (code {self.process.returncode})"}
             
             self.stop()
             return {"running": False, "message": "Service failed to start within timeout"}
@@ -72,37 +144,36 @@ class ParakeetSTT(BaseSTTProvider):
     
     def health_check(self) -> bool:
         try:
-            base_url = self.config.get("base_url", "http://localhost:8000")
-            response = requests.get(f"{base_url}/health", timeout=5)
+            response = http_session.get(self._health_url, timeout=5)
             return response.status_code == 200
         except:
             return False
             
     def _parse_response(self, response) -> Dict[str, Any]:
         """Helper to robustly parse the server response"""
-        print(f"[PARAKEET-PLUGIN] Server Response Status: {response.status_code}")
+        logger.debug("Parakeet response status: %s", response.status_code)
         
         if response.status_code == 200:
-            data = response.json()
-            print(f"[PARAKEET-PLUGIN] Server Response JSON: {data}")
+            resp_json = json_loads(response.content)
             
             # Be highly permissive of response structure (OpenAI format or Custom)
-            text = data.get("text", "")
-            segments = data.get("segments", [])
+            text = resp_json.get("text") or ""
+            segments = resp_json.get("segments") or []
+            logger.debug("Parakeet response: %d chars, %d segments", len(text), len(segments))
             
             if not text and segments:
-                text = ' '.join([s.get('text', '') for s in segments])
+                text = ' '.join(s.get('text', '') for s in segments)
                 
             # If we got text, it's a success regardless of a 'success' boolean
-            if text.strip() or data.get("success"):
+            if text.strip() or resp_json.get("success"):
                 return {
                     "success": True,
                     "text": text.strip(),
                     "segments": segments,
-                    "duration": data.get("duration")
+                    "duration": resp_json.get("duration")
                 }
             else:
-                print(f"[PARAKEET-PLUGIN] Silence detected or empty text returned.")
+                logger.debug("Parakeet returned no speech")
                 return {
                     "success": False,
                     "text": "",
@@ -113,7 +184,7 @@ class ParakeetSTT(BaseSTTProvider):
                 
         # Handle failures
         try:
-            error_body = response.json()
+            error_body = json_loads(response.content)
             print(f"[PARAKEET-PLUGIN] Server Error JSON: {error_body}")
             error_msg = error_body.get('error', error_body.get('message', response.text))
         except:
@@ -125,16 +196,16 @@ class ParakeetSTT(BaseSTTProvider):
     def transcribe(self, audio_file_path: str, language: Optional[str] = None, 
                   **kwargs) -> Dict[str, Any]:
         try:
-            base_url = self.config.get("base_url", "http://localhost:8000")
-            
             with open(audio_file_path, 'rb') as audio_file:
-                files = {'file': (os.path.basename(audio_file_path), audio_file, 'audio/wav')}
                 data = {}
                 if language:
                     data['language'] = language
                 data.update(kwargs)
                 
-                response = requests.post(f"{base_url}/transcribe", files=files, data=data, timeout=120)
+                body = MultipartBody(data, 'file', os.path.basename(audio_file_path), audio_file,
+                                     os.fstat(audio_file.fileno()).st_size, 'audio/wav')
+                response = http_session.post(self._transcribe_url, data=body,
+                                             headers={'Content-Type': body.content_type}, timeout=120)
             
             return self._parse_response(response)
             
@@ -144,42 +215,55 @@ class ParakeetSTT(BaseSTTProvider):
             traceback.print_exc()
             return {"success": False, "error": str(e)}
     
+    def _probe_raw_post(self) -> bool:
+        """Check once whether the server accepts raw audio bodies at /transcribe_raw."""
+        if self._supports_raw_post is None:
+            try:
+                response = http_session.options(self._transcribe_raw_url, timeout=5)
+            except requests.RequestException:
+                return False  # Server not reachable yet; probe again next call
+            allow = response.headers.get("Allow")
+            self._supports_raw_post = response.ok and (allow is None or "POST" in allow)
+        return self._supports_raw_post
+    
     def transcribe_raw(self, audio_data: bytes, sample_rate: int = 16000, 
                       language: Optional[str] = None, **kwargs) -> Dict[str, Any]:
         try:
-            base_url = self.config.get("base_url", "http://localhost:8000")
-            
-            import tempfile
-            import numpy as np
-            import wave
+            if self._probe_raw_post():
+                # Send the Float32 samples as-is; no WAV conversion or multipart framing
+                params = dict(kwargs)
+                if language:
+                    params['language'] = language
+                logger.debug("Sending %d raw bytes (%d Hz) to %s", len(audio_data), sample_rate, self._transcribe_raw_url)
+                response = http_session.post(self._transcribe_raw_url, data=audio_data, params=params, timeout=120,
+                                             headers={'Content-Type': 'application/octet-stream',
+                                                      'X-Sample-Rate': str(sample_rate),
+                                                      'X-Sample-Format': 'float32'})
+                return self._parse_response(response)
             
-            # Convert raw Float32 audio to proper WAV file
+            # Convert raw Float32 audio to a WAV in memory; no temp file round-trip
             float32_data = np.frombuffer(audio_data, dtype=np.float32)
             int16_data = (float32_data * 32767).astype(np.int16)
             
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-                with wave.open(temp_audio.name, 'wb') as wf:
-                    wf.setnchannels(1)
-                    wf.setsampwidth(2)
-                    wf.setframerate(sample_rate)
-                    wf.writeframes(int16_data.tobytes())
-                temp_audio_path = temp_audio.name
-                
-            try:
-                with open(temp_audio_path, 'rb') as f:
-                    files = {'file': ('audio.wav', f, 'audio/wav')}
-                    data = {}
-                    if language:
-                        data['language'] = language
-                    data.update(kwargs)
-                    
-                    print(f"[PARAKEET-PLUGIN] Sending audio to {base_url}/transcribe. Size: {len(audio_data)} bytes, {len(int16_data)} samples, {sample_rate}Hz")
-                    response = requests.post(f"{base_url}/transcribe", files=files, data=data, timeout=120)
-                    
-                return self._parse_response(response)
-            finally:
-                if os.path.exists(temp_audio_path):
-                    os.unlink(temp_audio_path)
+            wav_io = io.BytesIO()
+            with wave.open(wav_io, 'wb') as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(sample_rate)
+                wf.writeframes(int16_data.tobytes())
+            wav_size = wav_io.tell()
+            wav_io.seek(0)
+            
+            data = {}
+            if language:
+                data['language'] = language
+            data.update(kwargs)
+            
+            logger.debug("Sending %d bytes (%d samples, %d Hz) to %s", len(audio_data), len(int16_data), sample_rate, self._transcribe_url)
+            body = MultipartBody(data, 'file', 'audio.wav', wav_io, wav_size, 'audio/wav')
+            response = http_session.post(self._transcribe_url, data=body,
+                                         headers={'Content-Type': body.content_type}, timeout=120)
+            return self._parse_response(response)
         
         except Exception as e:
             print(f"[PARAKEET-PLUGIN] Raw exception: {e}")
@@ -187,6 +271,68 @@ class ParakeetSTT(BaseSTTProvider):
             traceback.print_exc()
             return {"success": False, "error": str(e)}
 
+    def transcribe_raw_batch(self, chunks: List[bytes], sample_rate: int = 16000,
+                             language: Optional[str] = None, **kwargs) -> List[Dict[str, Any]]:
+        """
+        Transcribe several raw Float32 clips (e.g. VAD-split utterances) concurrently.
+        
+        Requests overlap on the shared connection pool instead of waiting for
+        each round trip in turn. The bundled parakeet_stt_server.py still runs
+        its model on one clip at a time, so there the gain is limited to the
+        overlapped upload and audio preprocessing; only a server that batches
+        inference decodes several clips at once.
+        
+        Returns:
+            One transcribe_raw result per chunk, in the same order
+        """
+        return list(stt_batch_pool.map(
+            lambda chunk: self.transcribe_raw(chunk, sample_rate=sample_rate, language=language, **kwargs),
+            chunks
+        ))
+    
+    def transcribe_segments(self, audio_file_path: str, language: Optional[str] = None,
+                            **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Transcribe an audio file, yielding segments as the server decodes them.
+        
+        Asks the server for ``text/event-stream`` so each segment arrives as its
+        own ``data:`` event instead of after the whole file is decoded. Servers
+        that only answer with JSON still work; their segments are yielded at once.
+        
+        Yields:
+            Segment dicts with at least a 'text' key, or a single dict with 'error'
+        """
+        try:
+            with open(audio_file_path, 'rb') as audio_file:
+                data = {}
+                if language:
+                    data['language'] = language
+                data.update(kwargs)
+                
+                body = MultipartBody(data, 'file', os.path.basename(audio_file_path), audio_file,
+                                     os.fstat(audio_file.fileno()).st_size, 'audio/wav')
+                response = http_session.post(self._transcribe_url, data=body, stream=True, timeout=120,
+                                             headers={'Content-Type': body.content_type,
+                                                      'Accept': 'text/event-stream'})
+            
+            with response:
+                if response.status_code == 200 and response.headers.get('Content-Type', '').startswith('text/event-stream'):
+                    for event in iter_sse_data(response):
+                        yield json_loads(event)
+                    return
+                
+                result = self._parse_response(response)
+            if not result.get("success"):
+                yield {"error": result.get("error", "Transcription failed")}
+            elif result["segments"]:
+                yield from result["segments"]
+            else:
+                yield {"text": result["text"]}
+                
+        except Exception as e:
+            logger.exception("Parakeet segment stream failed")
+            yield {"error": str(e)}
+    
     def transcribe_stream(self, audio_chunks: Iterator[bytes]) -> Iterator[Dict[str, Any]]:
         """
         Stream STT transcription partials using WebSocket or chunked HTTP.
@@ -198,12 +344,10 @@ class ParakeetSTT(BaseSTTProvider):
             Dict with 'partial' or 'final' keys containing text
         """
         try:
-            base_url = self.config.get("base_url", "http://localhost:8000")
-            
             # Try WebSocket first for real-time streaming
             try:
                 import websocket
-                ws_url = base_url.replace("http://", "ws://").replace("https://", "wss://")
+                ws_url = self._base_url.replace("http://", "ws://").replace("https://", "wss://")
                 ws_url += "/ws/stt"
                 
                 ws = websocket.create_connection(ws_url, timeout=10)
@@ -215,7 +359,7 @@ class ParakeetSTT(BaseSTTProvider):
                     try:
                         result = ws.recv()
                         if result:
-                            yield json.loads(result)
+                            yield json_loads(result)
                     except websocket.WebSocketTimeoutException:
                         # No partial result yet, continue
                         continue
@@ -227,7 +371,7 @@ class ParakeetSTT(BaseSTTProvider):
                 try:
                     final_result = ws.recv()
                     if final_result:
-                        yield json.loads(final_result)
+                        yield json_loads(final_result)
                 except websocket.WebSocketTimeoutException:
                     pass
                 
@@ -254,11 +398,7 @@ class ParakeetSTT(BaseSTTProvider):
             yield {"error": str(e)}
     
     def get_capabilities(self) -> List[AudioProviderCapability]:
-        return [
-            AudioProviderCapability.STREAMING,
-            AudioProviderCapability.BATCH_PROCESSING,
-            AudioProviderCapability.MULTILINGUAL
-        ]
+        return self.default_capabilities.copy()
 
 
 class FasterQwen3TTSTTS(BaseTTSProvider):
@@ -269,10 +409,25 @@ class FasterQwen3TTSTTS(BaseTTSProvider):
     for Qwen3-TTS models, offering 6-10x speedup over standard implementations.
     """
     
-    @property
-    def provider_name(self) -> str:
-        """Return the unique name of this provider."""
-        return "faster-qwen3-tts"
+    default_capabilities = [
+        AudioProviderCapability.STREAMING,
+        AudioProviderCapability.VOICE_CLONING,
+        AudioProviderCapability.MULTILINGUAL,
+        AudioProviderCapability.REAL_TIME,
+    ]
+    
+    # Common language codes mapped to the full names FasterQwen3TTS expects
+    LANGUAGE_NAMES = {
+        "en": "English",
+        "zh": "Chinese",
+        "fr": "French",
+        "es": "Spanish",
+        "de": "German",
+        "ja": "Japanese",
+        "ko": "Korean",
+    }
+    
+    provider_name = "faster-qwen3-tts"
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
@@ -290,6 +445,19 @@ class FasterQwen3TTSTTS(BaseTTSProvider):
         self.xvec_only = config.get("xvec_only", True)
         self.non_streaming_mode = config.get("non_streaming_mode", True)
         self.append_silence = config.get("append_silence", True)
+        # Sampler settings resolved once from config; call kwargs only override these keys
+        self._generation_defaults = {
+            "max_new_tokens": 2048,
+            "min_new_tokens": 2,
+            "temperature": self.temperature,
+            "top_k": self.top_k,
+            "top_p": self.top_p,
+            "do_sample": self.do_sample,
+            "repetition_penalty": self.repetition_penalty,
+            "xvec_only": self.xvec_only,
+            "non_streaming_mode": self.non_streaming_mode,
+            "append_silence": self.append_silence,
+        }
         
     def start(self) -> Dict[str, Any]:
         """Initialize the FasterQwen3TTS model."""
@@ -424,24 +592,7 @@ class FasterQwen3TTSTTS(BaseTTSProvider):
             if self.model is None:
                 return {"success": False, "error": "Model not loaded"}
             
-            # Set default language if not provided
-            if language is None:
-                language = "English"
-            # Map common language codes to full names expected by FasterQwen3TTS
-            elif language.lower() == 'en':
-                language = "English"
-            elif language.lower() == 'zh':
-                language = "Chinese"
-            elif language.lower() == 'fr':
-                language = "French"
-            elif language.lower() == 'es':
-                language = "Spanish"
-            elif language.lower() == 'de':
-                language = "German"
-            elif language.lower() == 'ja':
-                language = "Japanese"
-            elif language.lower() == 'ko':
-                language = "Korean"
+            language = self._map_language(language)
             
             # Handle voice cloning - check if speaker is in custom voices or is a valid voice ID
             if speaker and speaker != "default":
@@ -459,16 +610,7 @@ class FasterQwen3TTSTTS(BaseTTSProvider):
                                 language=language,
                                 ref_audio=ref_audio_path,
                                 ref_text=ref_text,
-                                max_new_tokens=kwargs.get("max_new_tokens", 2048),
-                                min_new_tokens=kwargs.get("min_new_tokens", 2),
-                                temperature=kwargs.get("temperature", self.temperature),
-                                top_k=kwargs.get("top_k", self.top_k),
-                                top_p=kwargs.get("top_p", self.top_p),
-                                do_sample=kwargs.get("do_sample", self.do_sample),
-                                repetition_penalty=kwargs.get("repetition_penalty", self.repetition_penalty),
-                                xvec_only=kwargs.get("xvec_only", self.xvec_only),
-                                non_streaming_mode=kwargs.get("non_streaming_mode", self.non_streaming_mode),
-                                append_silence=kwargs.get("append_silence", self.append_silence),
+                                **self._generation_kwargs(kwargs),
                             )
                         except Exception as e:
                             if "meta tensor" in str(e).lower():
@@ -486,16 +628,7 @@ class FasterQwen3TTSTTS(BaseTTSProvider):
                                         language=language,
                                         ref_audio=ref_audio_path,
                                         ref_text=ref_text,
-                                        max_new_tokens=kwargs.get("max_new_tokens", 2048),
-                                        min_new_tokens=kwargs.get("min_new_tokens", 2),
-                                        temperature=kwargs.get("temperature", self.temperature),
-                                        top_k=kwargs.get("top_k", self.top_k),
-                                        top_p=kwargs.get("top_p", self.top_p),
-                                        do_sample=kwargs.get("do_sample", self.do_sample),
-                                        repetition_penalty=kwargs.get("repetition_penalty", self.repetition_penalty),
-                                        xvec_only=kwargs.get("xvec_only", self.xvec_only),
-                                        non_streaming_mode=kwargs.get("non_streaming_mode", self.non_streaming_mode),
-                                        append_silence=kwargs.get("append_silence", self.append_silence),
+                                        **self._generation_kwargs(kwargs),
                                     )
                                 except Exception as e2:
                                     logger.error(f"Failed to fix meta tensor issue: {e2}")
@@ -504,40 +637,7 @@ class FasterQwen3TTSTTS(BaseTTSProvider):
                                 raise e
                         
                         if audio_arrays and len(audio_arrays) > 0:
-                            # Convert to base64 - use proper audio handling like the demo
-                            def _concat_audio(audio_list):
-                                if isinstance(audio_list, np.ndarray):
-                                    return audio_list.astype(np.float32).squeeze()
-                                parts = [np.array(a, dtype=np.float32).squeeze() for a in audio_list if len(a) > 0]
-                                return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
-                            
-                            # Concatenate audio arrays and ensure they are Float32
-                            audio_data = _concat_audio(audio_arrays)
-                            
-                            # Clip audio to prevent distortion
-                            audio_data = np.clip(audio_data, -1.0, 1.0)
-                            
-                            # Scale to int16 range and convert
-                            audio_int16 = (audio_data * 32767).astype(np.int16)
-                            
-                            # Create WAV container using io.BytesIO and wave module
-                            wav_buffer = io.BytesIO()
-                            with wave.open(wav_buffer, 'wb') as wav_file:
-                                wav_file.setnchannels(1)  # Mono
-                                wav_file.setsampwidth(2)  # 2 bytes (16-bit)
-                                wav_file.setframerate(sample_rate)
-                                wav_file.writeframes(audio_int16.tobytes())
-                            
-                            # Get WAV bytes and encode to base64
-                            wav_bytes = wav_buffer.getvalue()
-                            audio_b64 = base64.b64encode(wav_bytes).decode('utf-8')
-                            
-                            return {
-                                "success": True,
-                                "audio": audio_b64,
-                                "sample_rate": sample_rate,
-                                "format": "audio/wav"
-                            }
+                            return self._wav_result(audio_arrays, sample_rate, kwargs.get("return_bytes", False))
                         else:
                             return {"success": False, "error": "No audio generated"}
                     else:
@@ -554,53 +654,11 @@ class FasterQwen3TTSTTS(BaseTTSProvider):
                         language=language,
                         ref_audio=ref_audio_path,
                         ref_text="",
-                        max_new_tokens=kwargs.get("max_new_tokens", 2048),
-                        min_new_tokens=kwargs.get("min_new_tokens", 2),
-                        temperature=kwargs.get("temperature", self.temperature),
-                        top_k=kwargs.get("top_k", self.top_k),
-                        top_p=kwargs.get("top_p", self.top_p),
-                        do_sample=kwargs.get("do_sample", self.do_sample),
-                        repetition_penalty=kwargs.get("repetition_penalty", self.repetition_penalty),
-                        xvec_only=kwargs.get("xvec_only", self.xvec_only),
-                        non_streaming_mode=kwargs.get("non_streaming_mode", self.non_streaming_mode),
-                        append_silence=kwargs.get("append_silence", self.append_silence),
+                        **self._generation_kwargs(kwargs),
                     )
                     
                     if audio_arrays and len(audio_arrays) > 0:
-                        # Convert to base64 - use proper audio handling like the demo
-                        def _concat_audio(audio_list):
-                            if isinstance(audio_list, np.ndarray):
-                                return audio_list.astype(np.float32).squeeze()
-                            parts = [np.array(a, dtype=np.float32).squeeze() for a in audio_list if len(a) > 0]
-                            return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
-                        
-                        # Concatenate audio arrays and ensure they are Float32
-                        audio_data = _concat_audio(audio_arrays)
-                        
-                        # Clip audio to prevent distortion
-                        audio_data = np.clip(audio_data, -1.0, 1.0)
-                        
-                        # Scale to int16 range and convert
-                        audio_int16 = (audio_data * 32767).astype(np.int16)
-                        
-                        # Create WAV container using io.BytesIO and wave module
-                        wav_buffer = io.BytesIO()
-                        with wave.open(wav_buffer, 'wb') as wav_file:
-                            wav_file.setnchannels(1)  # Mono
-                            wav_file.setsampwidth(2)  # 2 bytes (16-bit)
-                            wav_file.setframerate(sample_rate)
-                            wav_file.writeframes(audio_int16.tobytes())
-                        
-                        # Get WAV bytes and encode to base64
-                        wav_bytes = wav_buffer.getvalue()
-                        audio_b64 = base64.b64encode(wav_bytes).decode('utf-8')
-                        
-                        return {
-                            "success": True,
-                            "audio": audio_b64,
-                            "sample_rate": sample_rate,
-                            "format": "audio/wav"
-                        }
+                        return self._wav_result(audio_arrays, sample_rate, kwargs.get("return_bytes", False))
                     else:
                         return {"success": False, "error": "No audio generated"}
                 else:
@@ -630,24 +688,7 @@ class FasterQwen3TTSTTS(BaseTTSProvider):
             if self.model is None:
                 raise Exception("Model not loaded")
             
-            # Set default language if not provided
-            if language is None:
-                language = "English"
-            # Map common language codes to full names expected by FasterQwen3TTS
-            elif language.lower() == 'en':
-                language = "English"
-            elif language.lower() == 'zh':
-                language = "Chinese"
-            elif language.lower() == 'fr':
-                language = "French"
-            elif language.lower() == 'es':
-                language = "Spanish"
-            elif language.lower() == 'de':
-                language = "German"
-            elif language.lower() == 'ja':
-                language = "Japanese"
-            elif language.lower() == 'ko':
-                language = "Korean"
+            language = self._map_language(language)
             
             # Handle voice cloning - check if speaker is in custom voices or is a valid voice ID
             if speaker and speaker != "default":
@@ -670,16 +711,7 @@ class FasterQwen3TTSTTS(BaseTTSProvider):
                                 language=language,
                                 ref_audio=ref_audio_path,
                                 ref_text=ref_text,
-                                max_new_tokens=kwargs.get("max_new_tokens", 2048),
-                                min_new_tokens=kwargs.get("min_new_tokens", 2),
-                                temperature=kwargs.get("temperature", self.temperature),
-                                top_k=kwargs.get("top_k", self.top_k),
-                                top_p=kwargs.get("top_p", self.top_p),
-                                do_sample=kwargs.get("do_sample", self.do_sample),
-                                repetition_penalty=kwargs.get("repetition_penalty", self.repetition_penalty),
-                                xvec_only=kwargs.get("xvec_only", self.xvec_only),
-                                non_streaming_mode=False,  # Enable streaming
-                                append_silence=kwargs.get("append_silence", self.append_silence),
+                                **self._generation_kwargs(kwargs, streaming=True),
                             )
                             
                             # Process streaming audio chunks
@@ -724,16 +756,7 @@ class FasterQwen3TTSTTS(BaseTTSProvider):
                                         language=language,
                                         ref_audio=ref_audio_path,
                                         ref_text=ref_text,
-                                        max_new_tokens=kwargs.get("max_new_tokens", 2048),
-                                        min_new_tokens=kwargs.get("min_new_tokens", 2),
-                                        temperature=kwargs.get("temperature", self.temperature),
-                                        top_k=kwargs.get("top_k", self.top_k),
-                                        top_p=kwargs.get("top_p", self.top_p),
-                                        do_sample=kwargs.get("do_sample", self.do_sample),
-                                        repetition_penalty=kwargs.get("repetition_penalty", self.repetition_penalty),
-                                        xvec_only=kwargs.get("xvec_only", self.xvec_only),
-                                        non_streaming_mode=False,  # Enable streaming
-                                        append_silence=kwargs.get("append_silence", self.append_silence),
+                                        **self._generation_kwargs(kwargs, streaming=True),
                                     )
                                     
                                     # Process streaming audio chunks
@@ -780,16 +803,7 @@ class FasterQwen3TTSTTS(BaseTTSProvider):
                             language=language,
                             ref_audio=ref_audio_path,
                             ref_text="",
-                            max_new_tokens=kwargs.get("max_new_tokens", 2048),
-                            min_new_tokens=kwargs.get("min_new_tokens", 2),
-                            temperature=kwargs.get("temperature", self.temperature),
-                            top_k=kwargs.get("top_k", self.top_k),
-                            top_p=kwargs.get("top_p", self.top_p),
-                            do_sample=kwargs.get("do_sample", self.do_sample),
-                            repetition_penalty=kwargs.get("repetition_penalty", self.repetition_penalty),
-                            xvec_only=kwargs.get("xvec_only", self.xvec_only),
-                            non_streaming_mode=False,  # Enable streaming
-                            append_silence=kwargs.get("append_silence", self.append_silence),
+                            **self._generation_kwargs(kwargs, streaming=True),
                         )
                         
                         # Process streaming audio chunks
@@ -834,16 +848,7 @@ class FasterQwen3TTSTTS(BaseTTSProvider):
                                     language=language,
                                     ref_audio=ref_audio_path,
                                     ref_text="",
-                                    max_new_tokens=kwargs.get("max_new_tokens", 2048),
-                                    min_new_tokens=kwargs.get("min_new_tokens", 2),
-                                    temperature=kwargs.get("temperature", self.temperature),
-                                    top_k=kwargs.get("top_k", self.top_k),
-                                    top_p=kwargs.get("top_p", self.top_p),
-                                    do_sample=kwargs.get("do_sample", self.do_sample),
-                                    repetition_penalty=kwargs.get("repetition_penalty", self.repetition_penalty),
-                                    xvec_only=kwargs.get("xvec_only", self.xvec_only),
-                                    non_streaming_mode=False,  # Enable streaming
-                                    append_silence=kwargs.get("append_silence", self.append_silence),
+                                    **self._generation_kwargs(kwargs, streaming=True),
                                 )
                                 
                                 # Process streaming audio chunks
@@ -981,17 +986,57 @@ class FasterQwen3TTSTTS(BaseTTSProvider):
             return {"success": False, "message": str(e)}
     
     def get_capabilities(self) -> List[AudioProviderCapability]:
-        return [
-            AudioProviderCapability.STREAMING,
-            AudioProviderCapability.VOICE_CLONING,
-            AudioProviderCapability.MULTILINGUAL,
-            AudioProviderCapability.REAL_TIME
-        ]
+        return self.default_capabilities.copy()
     
     def supports_streaming(self) -> bool:
         """Check if provider supports streaming TTS."""
         return True  # FasterQwen3TTS supports streaming
     
+    def _map_language(self, language: Optional[str]) -> str:
+        """Map a language code to the name FasterQwen3TTS expects, defaulting to English."""
+        if language is None:
+            return "English"
+        return self.LANGUAGE_NAMES.get(language.lower(), language)
+    
+    def _generation_kwargs(self, kwargs: Dict[str, Any], streaming: bool = False) -> Dict[str, Any]:
+        """Sampler arguments for generate_voice_clone: config defaults overridden by call kwargs."""
+        params = self._generation_defaults.copy()
+        if kwargs:
+            params.update((key, kwargs[key]) for key in params.keys() & kwargs.keys())
+        if streaming:
+            params["non_streaming_mode"] = False
+        return params
+    
+    def _wav_result(self, audio_arrays, sample_rate: int, return_bytes: bool = False) -> Dict[str, Any]:
+        """
+        Encode generated audio arrays as a 16-bit mono WAV result.
+        
+        With ``return_bytes`` the WAV is returned as ``audio_bytes`` so callers
+        that write or serve it directly skip a base64 encode/decode round trip.
+        """
+        if isinstance(audio_arrays, np.ndarray):
+            audio_data = audio_arrays.astype(np.float32).squeeze()
+        else:
+            parts = [np.array(a, dtype=np.float32).squeeze() for a in audio_arrays if len(a) > 0]
+            audio_data = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+        
+        # Clip audio to prevent distortion, then scale to int16
+        audio_int16 = (np.clip(audio_data, -1.0, 1.0) * 32767).astype(np.int16)
+        
+        wav_buffer = io.BytesIO()
+        with wave.open(wav_buffer, 'wb') as wav_file:
+            wav_file.setnchannels(1)  # Mono
+            wav_file.setsampwidth(2)  # 2 bytes (16-bit)
+            wav_file.setframerate(sample_rate)
+            wav_file.writeframes(audio_int16.tobytes())
+        
+        result = {"success": True, "sample_rate": sample_rate, "format": "audio/wav"}
+        if return_bytes:
+            result["audio_bytes"] = wav_buffer.getvalue()
+        else:
+            result["audio"] = base64.b64encode(wav_buffer.getvalue()).decode('utf-8')
+        return result
+    
     def _get_custom_voice_ids(self) -> List[str]:
         """Get list of custom voice IDs."""
         try:
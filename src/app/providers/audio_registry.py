@@ -7,13 +7,32 @@ and provides a factory for creating TTS and STT provider instances.
 
 import os
 import sys
+import ast
 import importlib
-import inspect
-from typing import Dict, Type, Optional, List, Any, Union
+import logging
+from typing import Dict, Type, Optional, List, Any, Union, Tuple
 from pathlib import Path
 
-from .audio_base import BaseTTSProvider, BaseSTTProvider, AudioProviderConfig
+from .audio_base import (
+    BaseService, BaseTTSProvider, BaseSTTProvider, AudioProviderConfig,
+    DEFAULT_AUDIO_TIMEOUT, DEFAULT_AUDIO_MAX_RETRIES,
+)
 from .exceptions import ProviderRegistrationError
+from app.json_utils import load_file, dump_file
+
+logger = logging.getLogger(__name__)
+
+
+# Persisted provider name -> module map, so a cold start can resolve providers
+# without parsing or importing every provider module.
+AUDIO_REGISTRY_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "omnix", "audio_registry.json")
+
+# Provider directory listings keyed by path, as (st_mtime_ns, [(module name, file path), ...])
+_dir_scan_cache: Dict[str, Tuple[int, List[Tuple[str, str]]]] = {}
+
+
+# Base class each provider kind must inherit from
+_PROVIDER_BASES = {"TTS": BaseTTSProvider, "STT": BaseSTTProvider}
 
 
 class AudioProviderRegistry:
@@ -26,9 +45,11 @@ class AudioProviderRegistry:
     
     def __init__(self):
         """Initialize the audio provider registry."""
-        self._tts_providers: Dict[str, Type[BaseTTSProvider]] = {}
-        self._stt_providers: Dict[str, Type[BaseSTTProvider]] = {}
+        # TTS and STT share every code path, keyed by kind ("TTS"/"STT")
+        self._providers: Dict[str, Dict[str, type]] = {"TTS": {}, "STT": {}}
+        self._list_cache: Dict[str, Optional[List[Dict[str, Any]]]] = {"TTS": None, "STT": None}
         self._discovered = False
+        self._lazy_map: Optional[Dict[str, Dict[str, str]]] = None
         
     def discover_providers(self) -> None:
         """
@@ -40,99 +61,326 @@ class AudioProviderRegistry:
         if self._discovered:
             return
             
-        providers_dir = Path(__file__).parent
-        self._tts_providers = {}
-        self._stt_providers = {}
+        self._providers = {"TTS": {}, "STT": {}}
         
         # Import all Python modules in the providers package
-        for module_file in providers_dir.glob("*.py"):
-            module_name = module_file.stem
-            
-            # Skip these files
-            if module_name in ["__init__", "base", "registry", "exceptions", "audio_base"]:
-                continue
-                
+        module_order = {}
+        for module_name, _ in self._provider_module_files():
             try:
-                # Import the module
+                # Import the module, skipping the import machinery if it is already loaded
                 full_module_name = f"app.providers.{module_name}"
-                module = importlib.import_module(full_module_name)
-                
-                # Find all TTS provider classes
-                for name, obj in inspect.getmembers(module, inspect.isclass):
-                    if (issubclass(obj, BaseTTSProvider) and 
-                        obj != BaseTTSProvider and 
-                        obj.__module__ == full_module_name):
-                        
-                        # Get the provider name by calling the property
-                        try:
-                            provider_name = obj.provider_name.fget(None)
-                        except:
-                            # If it's a property, try to get it differently
-                            provider_name = getattr(obj, 'provider_name', None)
-                            if hasattr(provider_name, 'fget'):
-                                try:
-                                    provider_name = provider_name.fget(None)
-                                except:
-                                    continue
-                        
-                        if provider_name and provider_name != "base":
-                            if provider_name in self._tts_providers:
-                                print(f"[WARNING] TTS Provider '{provider_name}' already registered, overwriting")
-                            self._tts_providers[provider_name] = obj
-                            print(f"[INFO] Registered TTS provider: {provider_name}")
-                
-                # Find all STT provider classes
-                for name, obj in inspect.getmembers(module, inspect.isclass):
-                    if (issubclass(obj, BaseSTTProvider) and 
-                        obj != BaseSTTProvider and 
-                        obj.__module__ == full_module_name):
-                        
-                        # Get the provider name by calling the property
-                        try:
-                            provider_name = obj.provider_name.fget(None)
-                        except:
-                            # If it's a property, try to get it differently
-                            provider_name = getattr(obj, 'provider_name', None)
-                            if hasattr(provider_name, 'fget'):
-                                try:
-                                    provider_name = provider_name.fget(None)
-                                except:
-                                    continue
-                        
-                        if provider_name and provider_name != "base":
-                            if provider_name in self._stt_providers:
-                                print(f"[WARNING] STT Provider '{provider_name}' already registered, overwriting")
-                            self._stt_providers[provider_name] = obj
-                            print(f"[INFO] Registered STT provider: {provider_name}")
-                        
+                if full_module_name not in sys.modules:
+                    importlib.import_module(full_module_name)
+                module_order[full_module_name] = len(module_order)
             except Exception as e:
-                print(f"Error discovering providers in {module_name}: {e}")
+                logger.error("Error discovering providers in %s: %s", module_name, e)
+        
+        # Provider base classes record their subclasses as they are defined, so there
+        # is no need to walk module namespaces. Keep only classes from the scanned
+        # modules, in module order, so later modules still overwrite earlier ones.
+        for kind, providers in self._providers.items():
+            classes = [cls for cls in _PROVIDER_BASES[kind]._subclasses if cls.__module__ in module_order]
+            classes.sort(key=lambda cls: module_order[cls.__module__])
+            for obj in classes:
+                provider_name = self._class_provider_name(obj)
+                if provider_name and provider_name != "base":
+                    if provider_name in providers:
+                        logger.warning("%s Provider '%s' already registered, overwriting", kind, provider_name)
+                    providers[provider_name] = obj
+                    logger.info("Registered %s provider: %s", kind, provider_name)
                 
+        self._list_cache = {"TTS": None, "STT": None}
         self._discovered = True
-        print(f"[INFO] Audio provider discovery complete. {len(self._tts_providers)} TTS and {len(self._stt_providers)} STT providers available")
+        logger.info("Audio provider discovery complete. %d TTS and %d STT providers available",
+                    len(self._providers["TTS"]), len(self._providers["STT"]))
     
-    def register_tts_provider(self, provider_class: Type[BaseTTSProvider]) -> None:
+    def warm_up(self) -> None:
         """
-        Manually register a TTS provider class.
+        Run provider discovery ahead of time, e.g. at app startup.
+        
+        Keeps the module imports off the first audio request. Lookups still
+        discover on demand if warm_up() was never called.
+        """
+        self.discover_providers()
+    
+    @staticmethod
+    def _provider_module_files() -> List[Tuple[str, str]]:
+        """
+        List the provider package modules that may define audio providers, in discovery order.
+        
+        Uses a single os.scandir pass; DirEntry.is_file() reuses the d_type from the
+        directory listing, so no per-file stat or Path objects are needed. The result
+        is cached per directory mtime, so rediscovery after clear() costs one stat.
+        
+        Returns:
+            List of (module name, file path) tuples
+        """
+        providers_dir = str(Path(__file__).parent)
+        try:
+            mtime_ns = os.stat(providers_dir).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        cached = _dir_scan_cache.get(providers_dir)
+        if cached is not None and mtime_ns is not None and cached[0] == mtime_ns:
+            return list(cached[1])
+            
+        module_files = []
+        with os.scandir(providers_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".py") or not entry.is_file():
+                    continue
+                module_name = entry.name[:-3]
+                if module_name not in ["__init__", "base", "registry", "exceptions", "audio_base"]:
+                    module_files.append((module_name, entry.path))
+        if mtime_ns is not None:
+            _dir_scan_cache[providers_dir] = (mtime_ns, module_files)
+        return list(module_files)
+    
+    def _scan_provider_names(self) -> Dict[str, Dict[str, str]]:
+        """
+        Map provider names to the modules that define them, without importing anything.
+        
+        Parses each provider module and looks for direct BaseTTSProvider/BaseSTTProvider
+        subclasses whose ``provider_name`` class attribute is a string literal. Later
+        modules win on duplicate names, matching discover_providers().
+        
+        The result is persisted to AUDIO_REGISTRY_CACHE keyed by the Python version and
+        each module's mtime, so later interpreter starts skip the parse entirely.
+        
+        Returns:
+            Dictionary with "TTS" and "STT" maps of provider name to module name
+        """
+        if self._lazy_map is not None:
+            return self._lazy_map
+            
+        module_files = self._provider_module_files()
+        cache_key = self._scan_cache_key(module_files)
+        lazy_map = self._load_scan_cache(cache_key)
+        if lazy_map is not None:
+            self._lazy_map = lazy_map
+            return lazy_map
+            
+        lazy_map = {"TTS": {}, "STT": {}}
+        bases = {"BaseTTSProvider": "TTS", "BaseSTTProvider": "STT"}
+        for module_name, module_path in module_files:
+            try:
+                with open(module_path, "rb") as f:
+                    tree = ast.parse(f.read(), filename=module_path)
+            except (OSError, SyntaxError, ValueError):
+                continue
+            for node in tree.body:
+                if not isinstance(node, ast.ClassDef):
+                    continue
+                base_names = [b.id if isinstance(b, ast.Name) else getattr(b, "attr", None) for b in node.bases]
+                kind = next((bases[name] for name in base_names if name in bases), None)
+                provider_name = self._literal_provider_name(node) if kind else None
+                if provider_name and provider_name != "base":
+                    lazy_map[kind][provider_name] = f"app.providers.{module_name}"
+                    
+        if cache_key is not None:
+            self._save_scan_cache(cache_key, lazy_map)
+        self._lazy_map = lazy_map
+        return lazy_map
+    
+    @staticmethod
+    def _scan_cache_key(module_files: List[Tuple[str, str]]) -> Optional[Dict[str, Any]]:
+        """Build the on-disk scan cache key, or None if a module can't be stat'ed."""
+        try:
+            modules = [[module_name, os.stat(module_path).st_mtime_ns] for module_name, module_path in module_files]
+        except OSError:
+            return None
+        return {"python": sys.version, "modules": modules}
+    
+    @staticmethod
+    def _load_scan_cache(cache_key: Optional[Dict[str, Any]]) -> Optional[Dict[str, Dict[str, str]]]:
+        """Return the persisted provider name map if it was written for ``cache_key``."""
+        if cache_key is None:
+            return None
+        try:
+            cached = load_file(AUDIO_REGISTRY_CACHE)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get("key") != cache_key:
+            return None
+        providers = cached.get("providers")
+        if not isinstance(providers, dict) or not all(isinstance(providers.get(kind), dict) for kind in ("TTS", "STT")):
+            return None
+        return providers
+    
+    @staticmethod
+    def _save_scan_cache(cache_key: Dict[str, Any], lazy_map: Dict[str, Dict[str, str]]) -> None:
+        """Persist the provider name map; failures only cost a rescan next start."""
+        try:
+            os.makedirs(os.path.dirname(AUDIO_REGISTRY_CACHE), exist_ok=True)
+            dump_file(AUDIO_REGISTRY_CACHE, {"key": cache_key, "providers": lazy_map}, indent=False)
+        except OSError as e:
+            logger.warning("Could not write audio registry cache %s: %s", AUDIO_REGISTRY_CACHE, e)
+    
+    @staticmethod
+    def _literal_provider_name(class_node: ast.ClassDef) -> Optional[str]:
+        """Return the string literal a class body assigns to ``provider_name``."""
+        for stmt in class_node.body:
+            if isinstance(stmt, ast.Assign):
+                targets = [t.id for t in stmt.targets if isinstance(t, ast.Name)]
+                value = stmt.value
+            elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name):
+                targets = [stmt.target.id]
+                value = stmt.value
+            else:
+                continue
+            if "provider_name" in targets:
+                if isinstance(value, ast.Constant) and isinstance(value.value, str):
+                    return value.value
+                return None
+        return None
+    
+    def _lazy_provider_class(self, kind: str, provider_name: str) -> Optional[type]:
+        """
+        Import only the module that defines ``provider_name`` and register its class.
         
         Args:
-            provider_class: TTS provider class inheriting from BaseTTSProvider
+            kind: "TTS" or "STT"
+            provider_name: Name of the provider to load
             
-        Raises:
-            ProviderRegistrationError: If provider name is invalid or already registered
+        Returns:
+            Provider class, or None if the name is unknown or its module fails to import
         """
-        if not issubclass(provider_class, BaseTTSProvider):
-            raise ProviderRegistrationError(f"{provider_class.__name__} must inherit from BaseTTSProvider")
+        module_name = self._scan_provider_names()[kind].get(provider_name)
+        if not module_name:
+            return None
+        try:
+            if module_name not in sys.modules:
+                importlib.import_module(module_name)
+        except Exception as e:
+            logger.error("Error loading %s provider %s from %s: %s", kind, provider_name, module_name, e)
+            return None
+            
+        for cls in _PROVIDER_BASES[kind]._subclasses:
+            if cls.__module__ == module_name and self._class_provider_name(cls) == provider_name:
+                self._providers[kind][provider_name] = cls
+                self._list_cache[kind] = None
+                logger.info("Registered %s provider: %s", kind, provider_name)
+                return cls
+        return None
+    
+    def _get_provider_class(self, kind: str, provider_name: str) -> Optional[type]:
+        """Look up a provider class, importing just its module before falling back to full discovery."""
+        provider_class = self._providers[kind].get(provider_name)
+        if provider_class is None and not self._discovered:
+            provider_class = self._lazy_provider_class(kind, provider_name)
+            if provider_class is None:
+                self.discover_providers()
+                provider_class = self._providers[kind].get(provider_name)
+        return provider_class
+    
+    @staticmethod
+    def _class_provider_name(provider_class: type) -> Optional[str]:
+        """Read a provider class's ``provider_name`` class attribute."""
+        provider_name = getattr(provider_class, 'provider_name', None)
+        return provider_name if isinstance(provider_name, str) else None
+    
+    def _register(self, kind: str, provider_class: type) -> None:
+        """Manually register a provider class of the given kind."""
+        base_name = _PROVIDER_BASES[kind].__name__
+        if not issubclass(provider_class, _PROVIDER_BASES[kind]):
+            raise ProviderRegistrationError(f"{provider_class.__name__} must inherit from {base_name}")
             
         provider_name = provider_class.provider_name
         if not provider_name or provider_name == "base":
-            raise ProviderRegistrationError(f"Invalid TTS provider name: {provider_name}")
+            raise ProviderRegistrationError(f"Invalid {kind} provider name: {provider_name}")
             
-        if provider_name in self._tts_providers:
-            raise ProviderRegistrationError(f"TTS Provider '{provider_name}' is already registered")
+        if provider_name in self._providers[kind]:
+            raise ProviderRegistrationError(f"{kind} Provider '{provider_name}' is already registered")
+            
+        self._providers[kind][provider_name] = provider_class
+        self._list_cache[kind] = None
+        logger.info("Manually registered %s provider: %s", kind, provider_name)
+    
+    def _unregister(self, kind: str, provider_name: str) -> bool:
+        """Unregister a provider of the given kind."""
+        if provider_name in self._providers[kind]:
+            del self._providers[kind][provider_name]
+            self._list_cache[kind] = None
+            logger.info("Unregistered %s provider: %s", kind, provider_name)
+            return True
+        return False
+    
+    def _list(self, kind: str) -> List[Dict[str, Any]]:
+        """
+        Build (once) the metadata list for one provider kind.
+        
+        The list is cached until providers change; treat the returned
+        dictionaries as read-only.
+        """
+        if not self._discovered:
+            self.discover_providers()
+        if self._list_cache[kind] is not None:
+            return list(self._list_cache[kind])
             
-        self._tts_providers[provider_name] = provider_class
-        print(f"[INFO] Manually registered TTS provider: {provider_name}")
+        providers_list = []
+        for name, provider_class in self._providers[kind].items():
+            try:
+                # Get class-level attributes
+                info = {
+                    "name": name,
+                    "display_name": getattr(provider_class, "provider_display_name", name),
+                    "description": getattr(provider_class, "provider_description", ""),
+                    "capabilities": [c.value for c in getattr(provider_class, "default_capabilities", [])],
+                }
+                providers_list.append(info)
+            except Exception as e:
+                logger.error("Error getting info for %s provider %s: %s", kind, name, e)
+                
+        self._list_cache[kind] = providers_list
+        return list(providers_list)
+    
+    def _create(
+        self,
+        kind: str,
+        provider_name: str,
+        config: Optional[Dict[str, Any]] = None,
+        provider_config: Optional[AudioProviderConfig] = None
+    ) -> Optional[BaseService]:
+        """Instantiate a provider of the given kind; see create_tts_provider."""
+        provider_class = self._get_provider_class(kind, provider_name)
+        if not provider_class:
+            logger.warning("%s Provider '%s' not found", kind, provider_name)
+            return None
+            
+        # Build the provider's config dict directly; an AudioProviderConfig would
+        # only be turned straight back into the same dict
+        if provider_config:
+            final_config = provider_config.to_dict()
+        else:
+            config = config or {}
+            final_config = {
+                "provider_type": provider_name,
+                "base_url": config.get("base_url"),
+                "timeout": config.get("timeout", DEFAULT_AUDIO_TIMEOUT),
+                "max_retries": config.get("max_retries", DEFAULT_AUDIO_MAX_RETRIES),
+                "extra_params": config.get("extra_params", {}),
+            }
+            
+        try:
+            # Create provider instance with config dict
+            provider_instance = provider_class(config=final_config)
+            return provider_instance
+        except Exception as e:
+            raise ProviderRegistrationError(
+                f"Failed to instantiate {kind} provider '{provider_name}': {e}"
+            ) from e
+    
+    def register_tts_provider(self, provider_class: Type[BaseTTSProvider]) -> None:
+        """
+        Manually register a TTS provider class.
+        
+        Args:
+            provider_class: TTS provider class inheriting from BaseTTSProvider
+            
+        Raises:
+            ProviderRegistrationError: If provider name is invalid or already registered
+        """
+        self._register("TTS", provider_class)
     
     def register_stt_provider(self, provider_class: Type[BaseSTTProvider]) -> None:
         """
@@ -144,18 +392,7 @@ class AudioProviderRegistry:
         Raises:
             ProviderRegistrationError: If provider name is invalid or already registered
         """
-        if not issubclass(provider_class, BaseSTTProvider):
-            raise ProviderRegistrationError(f"{provider_class.__name__} must inherit from BaseSTTProvider")
-            
-        provider_name = provider_class.provider_name
-        if not provider_name or provider_name == "base":
-            raise ProviderRegistrationError(f"Invalid STT provider name: {provider_name}")
-            
-        if provider_name in self._stt_providers:
-            raise ProviderRegistrationError(f"STT Provider '{provider_name}' is already registered")
-            
-        self._stt_providers[provider_name] = provider_class
-        print(f"[INFO] Manually registered STT provider: {provider_name}")
+        self._register("STT", provider_class)
     
     def unregister_tts_provider(self, provider_name: str) -> bool:
         """
@@ -167,11 +404,7 @@ class AudioProviderRegistry:
         Returns:
             True if provider was unregistered, False if not found
         """
-        if provider_name in self._tts_providers:
-            del self._tts_providers[provider_name]
-            print(f"[INFO] Unregistered TTS provider: {provider_name}")
-            return True
-        return False
+        return self._unregister("TTS", provider_name)
     
     def unregister_stt_provider(self, provider_name: str) -> bool:
         """
@@ -183,11 +416,7 @@ class AudioProviderRegistry:
         Returns:
             True if provider was unregistered, False if not found
         """
-        if provider_name in self._stt_providers:
-            del self._stt_providers[provider_name]
-            print(f"[INFO] Unregistered STT provider: {provider_name}")
-            return True
-        return False
+        return self._unregister("STT", provider_name)
     
     def get_tts_provider_class(self, provider_name: str) -> Optional[Type[BaseTTSProvider]]:
         """
@@ -199,9 +428,7 @@ class AudioProviderRegistry:
         Returns:
             TTS provider class or None if not found
         """
-        if not self._discovered:
-            self.discover_providers()
-        return self._tts_providers.get(provider_name)
+        return self._get_provider_class("TTS", provider_name)
     
     def get_stt_provider_class(self, provider_name: str) -> Optional[Type[BaseSTTProvider]]:
         """
@@ -213,9 +440,7 @@ class AudioProviderRegistry:
         Returns:
             STT provider class or None if not found
         """
-        if not self._discovered:
-            self.discover_providers()
-        return self._stt_providers.get(provider_name)
+        return self._get_provider_class("STT", provider_name)
     
     def list_tts_providers(self) -> List[Dict[str, Any]]:
         """
@@ -224,24 +449,7 @@ class AudioProviderRegistry:
         Returns:
             List of dictionaries with TTS provider information
         """
-        if not self._discovered:
-            self.discover_providers()
-            
-        providers_list = []
-        for name, provider_class in self._tts_providers.items():
-            try:
-                # Get class-level attributes
-                info = {
-                    "name": name,
-                    "display_name": getattr(provider_class, "provider_display_name", name),
-                    "description": getattr(provider_class, "provider_description", ""),
-                    "capabilities": [c.value for c in getattr(provider_class, "default_capabilities", [])],
-                }
-                providers_list.append(info)
-            except Exception as e:
-                print(f"Error getting info for TTS provider {name}: {e}")
-                
-        return providers_list
+        return self._list("TTS")
     
     def list_stt_providers(self) -> List[Dict[str, Any]]:
         """
@@ -250,24 +458,7 @@ class AudioProviderRegistry:
         Returns:
             List of dictionaries with STT provider information
         """
-        if not self._discovered:
-            self.discover_providers()
-            
-        providers_list = []
-        for name, provider_class in self._stt_providers.items():
-            try:
-                # Get class-level attributes
-                info = {
-                    "name": name,
-                    "display_name": getattr(provider_class, "provider_display_name", name),
-                    "description": getattr(provider_class, "provider_description", ""),
-                    "capabilities": [c.value for c in getattr(provider_class, "default_capabilities", [])],
-                }
-                providers_list.append(info)
-            except Exception as e:
-                print(f"Error getting info for STT provider {name}: {e}")
-                
-        return providers_list
+        return self._list("STT")
     
     def create_tts_provider(
         self,
@@ -289,37 +480,7 @@ class AudioProviderRegistry:
         Raises:
             ProviderRegistrationError: If provider class can't be instantiated
         """
-        if not self._discovered:
-            self.discover_providers()
-            
-        provider_class = self._tts_providers.get(provider_name)
-        if not provider_class:
-            print(f"TTS Provider '{provider_name}' not found")
-            return None
-            
-        # Build AudioProviderConfig
-        if provider_config:
-            final_config = provider_config
-        elif config:
-            final_config = AudioProviderConfig(
-                provider_type=provider_name,
-                base_url=config.get("base_url"),
-                timeout=config.get("timeout", 300),
-                max_retries=config.get("max_retries", 3),
-                extra_params=config.get("extra_params", {})
-            )
-        else:
-            # Use empty config, provider should provide defaults
-            final_config = AudioProviderConfig(provider_type=provider_name)
-            
-        try:
-            # Create provider instance with config dict
-            provider_instance = provider_class(config=final_config.to_dict())
-            return provider_instance
-        except Exception as e:
-            raise ProviderRegistrationError(
-                f"Failed to instantiate TTS provider '{provider_name}': {e}"
-            ) from e
+        return self._create("TTS", provider_name, config, provider_config)
     
     def create_stt_provider(
         self,
@@ -341,43 +502,15 @@ class AudioProviderRegistry:
         Raises:
             ProviderRegistrationError: If provider class can't be instantiated
         """
-        if not self._discovered:
-            self.discover_providers()
-            
-        provider_class = self._stt_providers.get(provider_name)
-        if not provider_class:
-            print(f"STT Provider '{provider_name}' not found")
-            return None
-            
-        # Build AudioProviderConfig
-        if provider_config:
-            final_config = provider_config
-        elif config:
-            final_config = AudioProviderConfig(
-                provider_type=provider_name,
-                base_url=config.get("base_url"),
-                timeout=config.get("timeout", 300),
-                max_retries=config.get("max_retries", 3),
-                extra_params=config.get("extra_params", {})
-            )
-        else:
-            # Use empty config, provider should provide defaults
-            final_config = AudioProviderConfig(provider_type=provider_name)
-            
-        try:
-            # Create provider instance with config dict
-            provider_instance = provider_class(config=final_config.to_dict())
-            return provider_instance
-        except Exception as e:
-            raise ProviderRegistrationError(
-                f"Failed to instantiate STT provider '{provider_name}': {e}"
-            ) from e
+        return self._create("STT", provider_name, config, provider_config)
     
     def clear(self) -> None:
         """Clear all registered providers (useful for testing)."""
-        self._tts_providers.clear()
-        self._stt_providers.clear()
+        for kind in self._providers:
+            self._providers[kind].clear()
+            self._list_cache[kind] = None
         self._discovered = False
+        self._lazy_map = None
 
 
 
@@ -9,6 +9,150 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any, Union, Iterator
 from enum import Enum
+from urllib.parse import urlsplit
+import socket
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+
+from app.json_utils import dumps as json_dumps
+
+
+class JSONSession(requests.Session):
+    """
+    Session that encodes ``json=`` request bodies with ``json_utils.dumps``.
+    
+    requests serializes ``json=`` with the standard library encoder; chat
+    payloads carry the whole conversation, so encode them with orjson instead.
+    Bodies orjson can't handle (e.g. non-string keys) are left to requests.
+    """
+    
+    def request(self, method, url, **kwargs):
+        body = kwargs.get('json')
+        if body is not None and kwargs.get('data') is None:
+            try:
+                kwargs['data'] = json_dumps(body)
+            except TypeError:
+                return super().request(method, url, **kwargs)
+            kwargs['json'] = None
+            headers = dict(kwargs.get('headers') or {})
+            if not any(key.lower() == 'content-type' for key in headers):
+                headers['Content-Type'] = 'application/json'
+            kwargs['headers'] = headers
+        return super().request(method, url, **kwargs)
+
+
+# Process-wide connection pool shared by every provider instance. Providers are
+# rebuilt from settings on each request, so a per-instance session would never
+# get to reuse a keep-alive connection or TLS session.
+http_session = JSONSession()
+_http_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+http_session.mount('http://', _http_adapter)
+http_session.mount('https://', _http_adapter)
+_mount_lock = threading.Lock()
+
+
+class _UnixSocketConnection(HTTPConnection):
+    """HTTP connection over a Unix domain socket that falls back to TCP if the socket is unavailable."""
+
+    def __init__(self, *args, socket_path: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            if isinstance(self.timeout, (int, float)):
+                sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            return super()._new_conn()
+        return sock
+
+
+class _UnixSocketConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _UnixSocketConnection
+
+
+class UnixSocketAdapter(HTTPAdapter):
+    """
+    Transport adapter that sends requests for one local service over a Unix socket.
+
+    Mounted on a service's base URL, so callers keep using ordinary
+    ``http://host:port`` URLs and fall back to TCP when the socket is missing.
+    """
+
+    def __init__(self, base_url: str, socket_path: str, pool_maxsize: int = 32):
+        super().__init__()
+        parts = urlsplit(base_url)
+        self.socket_path = socket_path
+        self._pool = _UnixSocketConnectionPool(parts.hostname or 'localhost', parts.port or 80,
+                                               maxsize=pool_maxsize, socket_path=socket_path)
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        return self._pool
+
+    def get_connection(self, url, proxies=None):
+        return self._pool
+
+    def close(self):
+        super().close()
+        self._pool.close()
+
+
+def mount_unix_socket(base_url: str, socket_path: str) -> None:
+    """Route ``http_session`` requests under ``base_url`` through ``socket_path``."""
+    if urlsplit(base_url).scheme != 'http':
+        return
+    prefix = base_url.rstrip('/') + '/'
+    with _mount_lock:
+        current = http_session.adapters.get(prefix)
+        if isinstance(current, UnixSocketAdapter) and current.socket_path == socket_path:
+            return
+        http_session.mount(prefix, UnixSocketAdapter(base_url, socket_path))
+        if current is not None:
+            current.close()
+
+
+def iter_sse_data(response, chunk_size: int = 8192) -> Iterator[bytes]:
+    """
+    Yield the payload of each ``data:`` line in a streamed SSE response.
+    
+    Reads raw chunks into a bytearray and splits lines with ``find`` rather
+    than going through ``iter_lines``. Stops at the ``[DONE]`` sentinel.
+    
+    Args:
+        response: Streaming requests Response
+        chunk_size: Maximum bytes per read
+        
+    Returns:
+        Iterator of raw payload bytes (without the ``data: `` prefix)
+    """
+    pending = bytearray()
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        pending += chunk
+        start = 0
+        end = pending.find(b'\n')
+        while end != -1:
+            if pending.startswith(b'data: ', start):
+                data = bytes(pending[start + 6:end]).strip()
+                if data == b'[DONE]':
+                    return
+                if data:
+                    yield data
+            start = end + 1
+            end = pending.find(b'\n', start)
+        del pending[:start]
+    
+    # Final line without a trailing newline
+    if pending.startswith(b'data: '):
+        data = bytes(pending[6:]).strip()
+        if data and data != b'[DONE]':
+            yield data
 
 
 class ProviderCapability(Enum):
@@ -22,7 +166,10 @@ class ProviderCapability(Enum):
     EMBEDDINGS = "embeddings"
 
 
-@dataclass
+# The request/response dataclasses below use slots: they are allocated per
+# message and per stream chunk, so drop the per-instance __dict__ (Python 3.10+,
+# which setup.sh requires)
+@dataclass(slots=True)
 class ChatMessage:
     """Standardized chat message structure."""
     role: str  # 'system', 'user', 'assistant'
@@ -64,7 +211,7 @@ class ChatMessage:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatResponse:
     """Standardized chat response structure."""
     content: str
@@ -95,7 +242,7 @@ class ChatResponse:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelInfo:
     """Information about an available model."""
     id: str
@@ -119,7 +266,7 @@ class ModelInfo:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ProviderConfig:
     """Configuration for a provider instance."""
     provider_type: str
@@ -275,6 +422,10 @@ class BaseProvider(ABC):
         """Check if provider requires an API key."""
         return True
     
+    def _iter_sse_data(self, response, chunk_size: int = 8192) -> Iterator[bytes]:
+        """Yield the payload of each ``data:`` line in a streamed SSE response."""
+        return iter_sse_data(response, chunk_size)
+    
     def to_shared_format(self, response: ChatResponse) -> Dict[str, Any]:
         """
         Convert standardized response to the format expected by shared.py functions.
@@ -8,7 +8,8 @@ Cerebras provides access to their API hosted on their cloud platform.
 import requests
 from typing import List, Optional, Dict, Any, Iterator, Union
 
-from .base import BaseProvider, ChatMessage, ChatResponse, ModelInfo, ProviderConfig, ProviderCapability, AuthenticationError, ConnectionError, ModelNotFoundError
+from .base import BaseProvider, ChatMessage, ChatResponse, ModelInfo, ProviderConfig, ProviderCapability, AuthenticationError, ConnectionError, ModelNotFoundError, http_session
+from app.json_utils import loads as json_loads
 
 
 class CerebrasProvider(BaseProvider):
@@ -64,7 +65,7 @@ class CerebrasProvider(BaseProvider):
         timeout = kwargs.pop('timeout', self.config.timeout)
         
         try:
-            response = requests.request(method, url, headers=headers, timeout=timeout, **kwargs)
+            response = http_session.request(method, url, headers=headers, timeout=timeout, **kwargs)
             response.raise_for_status()
             return response
         except requests.exceptions.ConnectionError as e:
@@ -170,21 +171,9 @@ class CerebrasProvider(BaseProvider):
             raise ConnectionError(f"Failed to start stream: {e}")
         
         try:
-            for line in response.iter_lines():
-                if not line:
-                    continue
-                    
-                line_str = line.decode('utf-8') if isinstance(line, bytes) else line
-                if not line_str.startswith('data: '):
-                    continue
-                    
-                data_str = line_str[6:].strip()
-                if data_str == '[DONE]':
-                    break
-                    
+            for data_bytes in self._iter_sse_data(response):
                 try:
-                    import json
-                    data = json.loads(data_str)
+                    data = json_loads(data_bytes)
                     if not isinstance(data, dict):
                         continue
                         
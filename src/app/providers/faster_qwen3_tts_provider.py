@@ -207,6 +207,8 @@ class FasterQwen3TTSProvider(BaseTTSProvider):
         self._model_config = self.config.copy()
         self._sample_rate = 12000  # Qwen3-TTS uses 12kHz
         self._model_instance = None
+        # ((voice_clones dir, mtime), speakers) so listing voices doesn't rescan the directory
+        self._speakers_cache = None
         # Validate configuration and set defaults immediately
         self._validate_config()
         
@@ -331,11 +333,20 @@ class FasterQwen3TTSProvider(BaseTTSProvider):
         """
         Get list of available speakers/voices.
         
-        For faster-qwen3-tts, speakers are derived from voice clones.
+        For faster-qwen3-tts, speakers are derived from voice clones. The list
+        is cached until the voice_clones directory changes.
         
         Returns:
             List of speaker dictionaries with 'id', 'name', 'language' keys
         """
+        try:
+            key = (VOICE_CLONES_DIR, os.stat(VOICE_CLONES_DIR).st_mtime_ns)
+        except OSError:
+            key = (VOICE_CLONES_DIR, None)
+        cached = self._speakers_cache
+        if cached is not None and cached[0] == key:
+            return list(cached[1])
+        
         speakers = []
         
         # Add default speaker
@@ -359,7 +370,8 @@ class FasterQwen3TTSProvider(BaseTTSProvider):
                     "description": f"Custom voice: {voice_id}"
                 })
         
-        return speakers
+        self._speakers_cache = (key, speakers)
+        return list(speakers)
     
     def _map_language(self, language: Optional[str]) -> str:
         """Map language codes to model-supported language names."""
@@ -403,6 +415,7 @@ class FasterQwen3TTSProvider(BaseTTSProvider):
                 - top_k: Top-k sampling parameter
                 - repetition_penalty: Repetition penalty factor
                 - xvec_only: Use only speaker embedding (True) or full ICL (False)
+                - return_bytes: Return the WAV as raw 'audio_bytes' instead of base64 'audio'
                 
         Returns:
             Dict with 'success', 'audio' (base64 WAV), 'sample_rate', 'duration'
@@ -484,18 +497,20 @@ class FasterQwen3TTSProvider(BaseTTSProvider):
             duration = len(audio_np) / sample_rate
             logger.info("[TTS] generated chunk size=%d bytes, duration=%.2fs", len(wav_bytes), duration)
             
-            # Encode as base64
-            import base64
-            audio_b64 = base64.b64encode(wav_bytes).decode('utf-8')
-            
-            return {
+            result = {
                 "success": True,
-                "audio": audio_b64,
                 "sample_rate": sample_rate,
                 "duration": duration,
                 "format": "audio/wav",
                 "raw_response": None
             }
+            if kwargs.get('return_bytes'):
+                result["audio_bytes"] = wav_bytes
+            else:
+                # Encode as base64
+                import base64
+                result["audio"] = base64.b64encode(wav_bytes).decode('utf-8')
+            return result
             
         except Exception as e:
             logger.error(f"Error in generate_audio: {e}", exc_info=True)
@@ -638,6 +653,7 @@ class FasterQwen3TTSProvider(BaseTTSProvider):
             
             # Write the file
             output_path.write_bytes(audio_data)
+            self._speakers_cache = None
             
             logger.info(f"Voice clone created: {voice_id} ({framerate} Hz, {frames} frames)")
             
@@ -13,7 +13,8 @@ import requests
 from typing import List, Optional, Dict, Any, Iterator, Union
 from pathlib import Path
 
-from .base import BaseProvider, ChatMessage, ChatResponse, ModelInfo, ProviderConfig, ProviderCapability, AuthenticationError, ConnectionError, ModelNotFoundError
+from .base import BaseProvider, ChatMessage, ChatResponse, ModelInfo, ProviderConfig, ProviderCapability, AuthenticationError, ConnectionError, ModelNotFoundError, http_session
+from app.json_utils import loads as json_loads
 
 # Import the installer
 from app.llamacpp_installer import get_installer
@@ -73,7 +74,7 @@ class LlamaCppProvider(BaseProvider):
             True if server responds to health check, False otherwise
         """
         try:
-            response = requests.get(f"{self.config.base_url}/v1/models", timeout=2)
+            response = http_session.get(f"{self.config.base_url}/v1/models", timeout=2)
             return response.status_code == 200
         except:
             return False
@@ -250,7 +251,7 @@ class LlamaCppProvider(BaseProvider):
     def _non_stream_completion(self, payload: Dict[str, Any]) -> ChatResponse:
         """Handle non-streaming completion."""
         try:
-            response = requests.post(f"{self.config.base_url}/v1/chat/completions", json=payload, timeout=self.config.timeout)
+            response = http_session.post(f"{self.config.base_url}/v1/chat/completions", json=payload, timeout=self.config.timeout)
             response.raise_for_status()
         except requests.exceptions.ConnectionError as e:
             raise ConnectionError(f"Failed to connect to llama.cpp server: {e}")
@@ -282,27 +283,15 @@ class LlamaCppProvider(BaseProvider):
     def _stream_completion(self, payload: Dict[str, Any]) -> Iterator[ChatResponse]:
         """Handle streaming completion."""
         try:
-            response = requests.post(f"{self.config.base_url}/v1/chat/completions", json=payload, timeout=self.config.timeout, stream=True)
+            response = http_session.post(f"{self.config.base_url}/v1/chat/completions", json=payload, timeout=self.config.timeout, stream=True)
             response.raise_for_status()
         except Exception as e:
             raise ConnectionError(f"Failed to start stream: {e}")
         
         try:
-            for line in response.iter_lines():
-                if not line:
-                    continue
-                    
-                line_str = line.decode('utf-8') if isinstance(line, bytes) else line
-                if not line_str.startswith('data: '):
-                    continue
-                    
-                data_str = line_str[6:].strip()
-                if data_str == '[DONE]':
-                    break
-                    
+            for data_bytes in self._iter_sse_data(response):
                 try:
-                    import json
-                    data = json.loads(data_str)
+                    data = json_loads(data_bytes)
                     if not isinstance(data, dict):
                         continue
                         
@@ -10,7 +10,8 @@ from requests.exceptions import ConnectionError as RequestsConnectionError, Time
 from typing import List, Optional, Dict, Any, Iterator, Union
 from dataclasses import field
 
-from .base import BaseProvider, ChatMessage, ChatResponse, ModelInfo, ProviderConfig, ProviderCapability, AuthenticationError, ConnectionError, ModelNotFoundError, ProviderError
+from .base import BaseProvider, ChatMessage, ChatResponse, ModelInfo, ProviderConfig, ProviderCapability, AuthenticationError, ConnectionError, ModelNotFoundError, ProviderError, http_session
+from app.json_utils import loads as json_loads
 
 
 class LMStudioProvider(BaseProvider):
@@ -52,7 +53,7 @@ class LMStudioProvider(BaseProvider):
         # Allow timeout override via kwargs
         timeout = kwargs.pop('timeout', self.config.timeout)
         try:
-            response = requests.request(method, url, timeout=timeout, **kwargs)
+            response = http_session.request(method, url, timeout=timeout, **kwargs)
             response.raise_for_status()
             return response
         except RequestsConnectionError as e:
@@ -154,21 +155,9 @@ class LMStudioProvider(BaseProvider):
         thinking_buffer = ""
 
         try:
-            for line in response.iter_lines():
-                if not line:
-                    continue
-
-                line_str = line.decode('utf-8') if isinstance(line, bytes) else line
-                if not line_str.startswith('data: '):
-                    continue
-
-                data_str = line_str[6:].strip()
-                if data_str == '[DONE]':
-                    break
-
+            for data_bytes in self._iter_sse_data(response):
                 try:
-                    import json
-                    data = json.loads(data_str)
+                    data = json_loads(data_bytes)
                     if not isinstance(data, dict):
                         continue
 
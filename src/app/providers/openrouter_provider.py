@@ -8,7 +8,8 @@ OpenRouter provides access to various LLM models through a unified API.
 import requests
 from typing import List, Optional, Dict, Any, Iterator, Union
 
-from .base import BaseProvider, ChatMessage, ChatResponse, ModelInfo, ProviderConfig, ProviderCapability, AuthenticationError, ConnectionError, ModelNotFoundError
+from .base import BaseProvider, ChatMessage, ChatResponse, ModelInfo, ProviderConfig, ProviderCapability, AuthenticationError, ConnectionError, ModelNotFoundError, http_session
+from app.json_utils import loads as json_loads
 
 
 class OpenRouterProvider(BaseProvider):
@@ -65,7 +66,7 @@ class OpenRouterProvider(BaseProvider):
             headers["X-Title"] = "Omnix"
         
         try:
-            response = requests.request(method, url, headers=headers, timeout=self.config.timeout, **kwargs)
+            response = http_session.request(method, url, headers=headers, timeout=self.config.timeout, **kwargs)
             response.raise_for_status()
             return response
         except requests.exceptions.ConnectionError as e:
@@ -175,21 +176,9 @@ class OpenRouterProvider(BaseProvider):
             raise ConnectionError(f"Failed to start stream: {e}")
         
         try:
-            for line in response.iter_lines():
-                if not line:
-                    continue
-                    
-                line_str = line.decode('utf-8') if isinstance(line, bytes) else line
-                if not line_str.startswith('data: '):
-                    continue
-                    
-                data_str = line_str[6:].strip()
-                if data_str == '[DONE]':
-                    break
-                    
+            for data_bytes in self._iter_sse_data(response):
                 try:
-                    import json
-                    data = json.loads(data_str)
+                    data = json_loads(data_bytes)
                     if not isinstance(data, dict):
                         continue
                         
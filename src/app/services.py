@@ -40,16 +40,6 @@ def check_service_and_add_log(name, base_url, log_queue):
     except Exception as e:
         pass
 
-def kill_port(port):
-    try:
-        import subprocess as sp
-        r = sp.run(f'netstat -ano | findstr :{port} | findstr LISTENING', shell=True, capture_output=True, text=True)
-        for line in r.stdout.strip().split('\n'):
-            parts = line.split()
-            if len(parts) >= 5:
-                sp.run(f'taskkill /F /PID {parts[-1]}', shell=True, capture_output=True)
-    except: pass
-
 @services_bp.route('/api/services/tts/start', methods=['POST'])
 def start_tts():
     global tts_process, tts_status
@@ -71,7 +61,7 @@ def stop_tts():
 @services_bp.route('/api/services/stt/start', methods=['POST'])
 def start_stt():
     global stt_process, stt_status
-    kill_port(8000)
+    shared.kill_port(8000)
     try:
         stt_dir = os.path.join(shared.MODELS_DIR, 'stt', 'parakeet-tdt-0.6b-v2')
         stt_process = subprocess.Popen(['python', 'app.py'], cwd=stt_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1)
@@ -161,10 +151,11 @@ def get_speculative():
     if audio: return jsonify({"success": True, "text": phrase, "audio": audio[0], "sample_rate": audio[1]})
     return jsonify({"success": False, "error": "Not cached"})
 
-@services_bp.route('/api/conversation/greeting', methods=['GET', 'POST'])
+# POST /api/conversation/greeting is served by chat.conversation_greeting (registered first)
+@services_bp.route('/api/conversation/greeting', methods=['GET'])
 def get_greeting():
     import random
-    speaker = (request.get_json() if request.method == 'POST' else request.args).get('speaker', 'default')
+    speaker = request.args.get('speaker', 'default')
     phrase = random.choice(CONVERSATION_GREETINGS)
     voice_id = shared.custom_voices.get(speaker.replace(" (Custom)", ""), {}).get("voice_clone_id")
     
@@ -1,7 +1,17 @@
 import os
 import json
 import re
+import atexit
+import shutil
+import threading
+from urllib.parse import quote, unquote
 from typing import Optional, Dict, Any, List
+from app import json_utils
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
 
 # Base paths - project root (parent of src/)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
@@ -12,7 +22,8 @@ VOICE_CLONES_DIR = os.path.join(RESOURCES_DIR, 'voice_clones')
 LOGO_DIR = os.path.join(RESOURCES_DIR, 'logo')
 os.makedirs(DATA_DIR, exist_ok=True)
 
-SESSIONS_FILE = os.path.join(DATA_DIR, 'sessions.json')
+SESSIONS_FILE = os.path.join(DATA_DIR, 'sessions.json')  # legacy single-file store, migrated on load
+SESSIONS_DIR = os.path.join(DATA_DIR, 'sessions')
 SETTINGS_FILE = os.path.join(DATA_DIR, 'settings.json')
 VOICE_CLONES_FILE = os.path.join(VOICE_CLONES_DIR, 'voice_clones.json')
 
@@ -43,6 +54,7 @@ _stt_provider_name = None
 
 # Provider system
 from app.providers import get_registry, BaseProvider, ProviderConfig
+from app.providers.base import http_session
 from app.providers.audio_registry import get_audio_registry, get_tts_provider, get_stt_provider
 
 DEFAULT_SETTINGS = {
@@ -140,37 +152,137 @@ def save_secrets(secrets):
     with open(SECRETS_FILE, 'w') as f:
         json.dump(secrets, f, indent=2)
 
+# Parsed settings.json, reused until the file's mtime changes
+_settings_cache = {"mtime": None, "data": None}
+
+def _copy_settings(settings):
+    """
+    Copy settings one level deep.
+    
+    Callers mutate the result at most per provider (masking API keys,
+    merging updates into a provider section), so copying the section dicts
+    is enough to keep the cached data intact, and much cheaper than deepcopy.
+    """
+    return {key: value.copy() if isinstance(value, dict) else value for key, value in settings.items()}
+
 def load_settings():
-    if os.path.exists(SETTINGS_FILE):
-        try:
-            with open(SETTINGS_FILE, 'r') as f:
-                settings = json.load(f)
-                # Migrate old settings format
-                settings = migrate_settings(settings)
-                # Ensure all provider configs exist
-                for key in ['cerebras', 'openrouter', 'lmstudio', 'llamacpp']:
-                    if key not in settings:
-                        settings[key] = DEFAULT_SETTINGS[key].copy()
-                return settings
-        except Exception as e:
-            print(f"Error loading settings: {e}, using defaults")
-    return DEFAULT_SETTINGS.copy()
+    try:
+        mtime = os.stat(SETTINGS_FILE).st_mtime_ns
+    except OSError:
+        return DEFAULT_SETTINGS.copy()
+    if _settings_cache["mtime"] == mtime:
+        return _copy_settings(_settings_cache["data"])
+    try:
+        with open(SETTINGS_FILE, 'r') as f:
+            settings = json.load(f)
+            # Migrate old settings format
+            settings = migrate_settings(settings)
+            # Ensure all provider configs exist
+            for key in ['cerebras', 'openrouter', 'lmstudio', 'llamacpp']:
+                if key not in settings:
+                    settings[key] = DEFAULT_SETTINGS[key].copy()
+    except Exception as e:
+        print(f"Error loading settings: {e}, using defaults")
+        return DEFAULT_SETTINGS.copy()
+    _settings_cache["mtime"] = mtime
+    _settings_cache["data"] = settings
+    return _copy_settings(settings)
 
 def save_settings(settings):
     with open(SETTINGS_FILE, 'w') as f:
         json.dump(settings, f, indent=2)
+    # Let the next load re-read the file so it is migrated and backfilled like a cold load
+    _settings_cache["mtime"] = None
+
+def _session_path(session_id, directory=None):
+    # Session ids come from clients; quote them so they can't escape the directory
+    return os.path.join(directory or SESSIONS_DIR, quote(session_id, safe='') + '.json')
+
+def _migrate_sessions_file():
+    """Split the legacy sessions.json into one file per session."""
+    sessions = json_utils.load_file(SESSIONS_FILE)
+    tmp_dir = SESSIONS_DIR + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for sid, session in sessions.items():
+        json_utils.dump_file(_session_path(sid, tmp_dir), session)
+    os.replace(tmp_dir, SESSIONS_DIR)
+    os.replace(SESSIONS_FILE, SESSIONS_FILE + '.bak')
+    return sessions
 
 def load_sessions():
+    if os.path.isdir(SESSIONS_DIR):
+        sessions = {}
+        with os.scandir(SESSIONS_DIR) as it:
+            for entry in it:
+                if not entry.name.endswith('.json'): continue
+                try: sessions[unquote(entry.name[:-5])] = json_utils.load_file(entry.path)
+                except: pass
+        return sessions
     if os.path.exists(SESSIONS_FILE):
         try:
-            with open(SESSIONS_FILE, 'r') as f:
-                return json.load(f)
-        except: pass
+            return _migrate_sessions_file()
+        except Exception as e:
+            print(f"Error migrating sessions: {e}")
     return {}
 
-def save_sessions(sessions):
-    with open(SESSIONS_FILE, 'w') as f:
-        json.dump(sessions, f, indent=2)
+def save_sessions(sessions, session_ids=None):
+    """
+    Write sessions to disk, one file per session.
+    
+    With ``session_ids`` only those sessions are written (or removed if they
+    are no longer in ``sessions``); otherwise the whole directory is synced.
+    """
+    os.makedirs(SESSIONS_DIR, exist_ok=True)
+    if session_ids is None:
+        session_ids = set(sessions)
+        with os.scandir(SESSIONS_DIR) as it:
+            session_ids.update(unquote(e.name[:-5]) for e in it if e.name.endswith('.json'))
+    for sid in session_ids:
+        path = _session_path(sid)
+        if sid in sessions:
+            json_utils.dump_file(path, sessions[sid])
+        else:
+            try: os.remove(path)
+            except FileNotFoundError: pass
+
+# Debounced writer for sessions_data: mutations call schedule_save_sessions(sid)
+# and only the sessions touched within the delay are rewritten, once each.
+SESSIONS_SAVE_DELAY = 0.5
+_sessions_save_timer = None
+_sessions_save_lock = threading.Lock()
+_dirty_sessions = set()
+
+def flush_sessions():
+    global _sessions_save_timer
+    with _sessions_save_lock:
+        if _sessions_save_timer is not None:
+            _sessions_save_timer.cancel()
+            _sessions_save_timer = None
+        dirty = set(_dirty_sessions)
+        _dirty_sessions.clear()
+    try:
+        save_sessions(sessions_data, dirty)
+    except Exception as e:
+        print(f"Error saving sessions: {e}")
+        with _sessions_save_lock:
+            _dirty_sessions.update(dirty)
+
+def schedule_save_sessions(session_id):
+    global _sessions_save_timer
+    with _sessions_save_lock:
+        _dirty_sessions.add(session_id)
+        if _sessions_save_timer is not None:
+            _sessions_save_timer.cancel()
+        _sessions_save_timer = threading.Timer(SESSIONS_SAVE_DELAY, flush_sessions)
+        _sessions_save_timer.daemon = True
+        _sessions_save_timer.start()
+
+def _flush_pending_sessions():
+    if _dirty_sessions:
+        flush_sessions()
+
+atexit.register(_flush_pending_sessions)
 
 def extract_thinking(content):
     """Extract thinking/analysis from content."""
@@ -444,10 +556,11 @@ def get_stt_provider(provider_name: Optional[str] = None) -> Optional[Any]:
         print(f"Error creating STT provider '{provider}': {e}")
         return None
 
+EMOJI_PATTERN = re.compile(u"[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF\u2702-\u27B0\u24C2-\U0001F251]+", flags=re.UNICODE)
+
 def remove_emojis(text):
-    if not text: return text
-    emoji_pattern = re.compile(u"[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF\u2702-\u27B0\u24C2-\U0001F251]+", flags=re.UNICODE)
-    return emoji_pattern.sub(r'', text)
+    if not text or text.isascii(): return text
+    return EMOJI_PATTERN.sub(r'', text)
 
 def format_size(bytes_size):
     for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
@@ -455,6 +568,35 @@ def format_size(bytes_size):
         bytes_size /= 1024.0
     return f"{bytes_size:.1f} PB"
 
+def kill_port(port, timeout=3):
+    """Terminate any process listening on ``port`` and wait for it to exit."""
+    if psutil is not None:
+        try:
+            procs = []
+            for conn in psutil.net_connections(kind='inet'):
+                if conn.pid and conn.laddr and conn.laddr.port == port and conn.status == psutil.CONN_LISTEN:
+                    try:
+                        proc = psutil.Process(conn.pid)
+                        proc.terminate()
+                        procs.append(proc)
+                    except psutil.Error: pass
+            _, alive = psutil.wait_procs(procs, timeout=timeout)
+            for proc in alive:
+                try: proc.kill()
+                except psutil.Error: pass
+            return
+        except psutil.AccessDenied:
+            pass  # net_connections needs elevated rights on some platforms
+    # Fallback without psutil (Windows only)
+    try:
+        import subprocess as sp
+        r = sp.run(['netstat', '-ano'], capture_output=True, text=True)
+        for line in r.stdout.splitlines():
+            parts = line.split()
+            if len(parts) >= 5 and 'LISTENING' in parts and parts[1].endswith(f':{port}'):
+                sp.run(['taskkill', '/F', '/PID', parts[-1]], capture_output=True)
+    except: pass
+
 # Startup Initializations
 def _init_custom_voices():
     if os.path.exists(VOICE_CLONES_FILE):
@@ -479,4 +621,5 @@ def _init_custom_voices():
     with open(VOICE_CLONES_FILE, 'w') as f:
         json.dump(custom_voices, f, indent=2)
 
-_init_custom_voices()
\ No newline at end of file
+_init_custom_voices()
+sessions_data.update(load_sessions())
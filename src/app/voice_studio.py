@@ -170,7 +170,9 @@ def create_voice_clone():
                     f.write(audio_bytes)
 
                 tts_provider = shared.get_tts_provider()
-                if tts_provider and hasattr(tts_provider, "voice_clone"):
+                if tts_provider and hasattr(tts_provider, "voice_clone_cached"):
+                    tts_provider.voice_clone_cached(voice_id_clean, audio_bytes, ref_text)
+                elif tts_provider and hasattr(tts_provider, "voice_clone"):
                     tts_provider.voice_clone(voice_id_clean, audio_bytes, ref_text)
 
         # Register in custom_voices
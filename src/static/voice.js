@@ -1716,6 +1716,52 @@ function stopRecording() {
 }
 
 // Transcribe audio
+// Transcribe via /api/stt/stream, calling onText with the text so far as each
+// segment arrives. Resolves to null when the server has no streaming endpoint,
+// so callers can fall back to /api/stt.
+async function transcribeStreaming(formData, onText) {
+    const response = await fetch('/api/stt/stream', { method: 'POST', body: formData });
+    if (!response.ok || !(response.headers.get('Content-Type') || '').startsWith('text/event-stream')) {
+        return null;
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let sseBuffer = '';
+    const texts = [];
+    
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        
+        sseBuffer += decoder.decode(value, { stream: true });
+        
+        let boundary;
+        while ((boundary = sseBuffer.indexOf('\n\n')) !== -1) {
+            const eventBlock = sseBuffer.substring(0, boundary);
+            sseBuffer = sseBuffer.substring(boundary + 2);
+            
+            for (const line of eventBlock.split('\n')) {
+                if (!line.startsWith('data: ')) continue;
+                const data = JSON.parse(line.slice(6));
+                
+                if (data.type === 'segment') {
+                    const text = (data.segment.text || '').trim();
+                    if (text) {
+                        texts.push(text);
+                        onText(texts.join(' '));
+                    }
+                } else if (data.type === 'done') {
+                    return { success: true, text: data.text };
+                } else if (data.type === 'error') {
+                    return { success: false, error: data.error };
+                }
+            }
+        }
+    }
+    return { success: texts.length > 0, text: texts.join(' ') };
+}
+
 async function transcribeAudio() {
     if (audioChunks.length === 0) return;
     
@@ -1726,8 +1772,12 @@ async function transcribeAudio() {
         const formData = new FormData();
         formData.append('audio', audioBlob, 'recording.webm');
         
-        const response = await fetch('/api/stt', { method: 'POST', body: formData });
-        const data = await response.json();
+        // Show segments in the input as they are decoded; fall back to the one-shot endpoint
+        let data = await transcribeStreaming(formData, text => { messageInput.value = text; });
+        if (!data) {
+            const response = await fetch('/api/stt', { method: 'POST', body: formData });
+            data = await response.json();
+        }
         
         if (data.success && data.text) {
             messageInput.value = data.text;
@@ -156,3 +156,34 @@ class TestGenerateAudioStreamVoiceClonesDir:
         with patch("app.providers.faster_qwen3_tts_provider.VOICE_CLONES_DIR", str(tmp_path)):
             with pytest.raises(Exception, match="No reference audio"):
                 list(provider.generate_audio_stream("Hello", speaker="", language="en"))
+
+
+# ---------------------------------------------------------------------------
+# Tests for get_speakers – directory-keyed cache
+# ---------------------------------------------------------------------------
+
+
+class TestGetSpeakersCache:
+    """Ensure cached speaker lists track changes to the voice_clones directory."""
+
+    def test_new_clone_file_is_listed(self, tmp_path):
+        """Adding a wav to the directory must show up on the next call."""
+        provider = _make_provider()
+
+        with patch("app.providers.faster_qwen3_tts_provider.VOICE_CLONES_DIR", str(tmp_path)):
+            assert [s["id"] for s in provider.get_speakers()] == ["default"]
+            (tmp_path / "alice.wav").write_bytes(b"RIFF")
+            assert [s["id"] for s in provider.get_speakers()] == ["default", "alice"]
+
+    def test_unchanged_directory_is_not_rescanned(self, tmp_path):
+        """Repeated calls must reuse the cached list without globbing again."""
+        provider = _make_provider()
+        (tmp_path / "alice.wav").write_bytes(b"RIFF")
+
+        with patch("app.providers.faster_qwen3_tts_provider.VOICE_CLONES_DIR", str(tmp_path)):
+            first = provider.get_speakers()
+            with patch.object(Path, "glob", side_effect=AssertionError("rescanned")):
+                second = provider.get_speakers()
+
+        assert first == second
+        assert first is not second
@@ -97,7 +97,7 @@ class TestCerebrasModelStatus:
         provider = CerebrasProvider(config)
         assert provider.requires_api_key() is True
     
-    @patch('app.providers.cerebras_provider.requests.request')
+    @patch('app.providers.cerebras_provider.http_session.request')
     def test_cerebras_test_connection_success(self, mock_request):
         """Test successful connection to Cerebras API."""
         # Mock successful response
@@ -123,7 +123,7 @@ class TestCerebrasModelStatus:
         assert headers['Authorization'] == 'Bearer valid-api-key'
         assert headers['Content-Type'] == 'application/json'
     
-    @patch('app.providers.cerebras_provider.requests.request')
+    @patch('app.providers.cerebras_provider.http_session.request')
     def test_cerebras_test_connection_authentication_error(self, mock_request):
         """Test connection failure due to authentication error."""
         # Mock 401 response
@@ -141,7 +141,7 @@ class TestCerebrasModelStatus:
         with pytest.raises(AuthenticationError, match="Authentication failed"):
             provider.test_connection()
     
-    @patch('app.providers.cerebras_provider.requests.request')
+    @patch('app.providers.cerebras_provider.http_session.request')
     def test_cerebras_test_connection_connection_error(self, mock_request):
         """Test connection failure due to network error."""
         # Mock connection error
@@ -156,7 +156,7 @@ class TestCerebrasModelStatus:
         with pytest.raises(ConnectionError, match="Failed to connect to Cerebras"):
             provider.test_connection()
     
-    @patch('app.providers.cerebras_provider.requests.request')
+    @patch('app.providers.cerebras_provider.http_session.request')
     def test_cerebras_get_models_success(self, mock_request):
         """Test successful retrieval of models from Cerebras."""
         # Mock successful response with models
@@ -203,7 +203,7 @@ class TestCerebrasModelStatus:
         assert call_args[0][0] == 'get'  # HTTP method
         assert call_args[0][1] == 'https://api.cerebras.ai/v1/models'  # URL
     
-    @patch('app.providers.cerebras_provider.requests.request')
+    @patch('app.providers.cerebras_provider.http_session.request')
     def test_cerebras_get_models_empty_response(self, mock_request):
         """Test handling of empty models response."""
         # Mock response with empty data
@@ -220,7 +220,7 @@ class TestCerebrasModelStatus:
         models = provider.get_models()
         assert models == []
     
-    @patch('app.providers.cerebras_provider.requests.request')
+    @patch('app.providers.cerebras_provider.http_session.request')
     def test_cerebras_get_models_invalid_json(self, mock_request):
         """Test handling of invalid JSON response."""
         # Mock response that raises JSON decode error
@@ -237,7 +237,7 @@ class TestCerebrasModelStatus:
         with pytest.raises(ConnectionError, match="Invalid JSON response"):
             provider.get_models()
     
-    @patch('app.providers.cerebras_provider.requests.request')
+    @patch('app.providers.cerebras_provider.http_session.request')
     def test_cerebras_get_models_authentication_error(self, mock_request):
         """Test handling of authentication error when fetching models."""
         # Mock 401 response
@@ -255,7 +255,7 @@ class TestCerebrasModelStatus:
         with pytest.raises(AuthenticationError, match="Authentication failed"):
             provider.get_models()
     
-    @patch('app.providers.cerebras_provider.requests.request')
+    @patch('app.providers.cerebras_provider.http_session.request')
     def test_cerebras_chat_completion_non_streaming(self, mock_request):
         """Test non-streaming chat completion."""
         # Mock successful response
@@ -291,15 +291,15 @@ class TestCerebrasModelStatus:
         assert response.finish_reason == 'stop'
         assert response.usage == {'total_tokens': 15}
     
-    @patch('app.providers.cerebras_provider.requests.request')
+    @patch('app.providers.cerebras_provider.http_session.request')
     def test_cerebras_chat_completion_streaming(self, mock_request):
         """Test streaming chat completion."""
         # Mock streaming response
         mock_response = Mock()
-        mock_response.iter_lines.return_value = [
-            b'data: {"choices":[{"delta":{"content":"Hello"}}]}',
-            b'data: {"choices":[{"delta":{"content":"!"}}]}',
-            b'data: [DONE]'
+        mock_response.iter_content.return_value = [
+            b'data: {"choices":[{"delta":{"content":"Hello"}}]}\n\n',
+            b'data: {"choices":[{"delta":{"content":"!"}}]}\n\n',
+            b'data: [DONE]\n\n'
         ]
         mock_request.return_value = mock_response
         
@@ -327,7 +327,7 @@ class TestCerebrasModelStatus:
         )
         provider = CerebrasProvider(config)
         
-        with patch('app.providers.cerebras_provider.requests.request') as mock_request:
+        with patch('app.providers.cerebras_provider.http_session.request') as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_request.return_value = mock_response
@@ -348,7 +348,7 @@ class TestCerebrasModelStatus:
         )
         provider = CerebrasProvider(config)
         
-        with patch('app.providers.cerebras_provider.requests.request') as mock_request:
+        with patch('app.providers.cerebras_provider.http_session.request') as mock_request:
             mock_request.side_effect = Exception("Connection failed")
             
             with pytest.raises(ConnectionError, match="Failed to connect to Cerebras"):
@@ -362,7 +362,7 @@ class TestCerebrasModelStatus:
         )
         provider = CerebrasProvider(config)
         
-        with patch('app.providers.cerebras_provider.requests.request') as mock_request:
+        with patch('app.providers.cerebras_provider.http_session.request') as mock_request:
             mock_request.side_effect = Exception("Timeout")
             
             with pytest.raises(ConnectionError, match="Connection to Cerebras timed out"):
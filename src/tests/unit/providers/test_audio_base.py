@@ -0,0 +1,127 @@
+"""Tests for shared audio provider base class behaviour."""
+
+import base64
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from app.providers.audio_base import BaseTTSProvider
+
+
+class FakeTTSProvider(BaseTTSProvider):
+    provider_name = "fake-tts"
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.clone_calls = []
+
+    def get_speakers(self):
+        return []
+
+    def generate_audio(self, text, speaker=None, language=None, **kwargs):
+        return {"success": True, "audio": ""}
+
+    def voice_clone(self, voice_id, audio_data, ref_text=None):
+        self.clone_calls.append(voice_id)
+        return {"success": voice_id != "bad", "voice_id": voice_id}
+
+
+class TestVoiceCloneCached:
+    """Test suite for BaseTTSProvider.voice_clone_cached."""
+
+    def test_identical_sample_is_cloned_once(self):
+        """Test repeating the same voice id and bytes reuses the first result."""
+        provider = FakeTTSProvider({})
+        first = provider.voice_clone_cached("alice", b"sample")
+        second = provider.voice_clone_cached("alice", b"sample")
+        assert first == second == {"success": True, "voice_id": "alice"}
+        assert provider.clone_calls == ["alice"]
+
+    def test_different_audio_or_voice_id_is_cloned(self):
+        """Test a new sample or a new voice id reaches the provider."""
+        provider = FakeTTSProvider({})
+        provider.voice_clone_cached("alice", b"sample")
+        provider.voice_clone_cached("alice", b"other")
+        provider.voice_clone_cached("bob", b"sample")
+        assert provider.clone_calls == ["alice", "alice", "bob"]
+
+    def test_failures_are_not_cached(self):
+        """Test a failed clone is retried on the next call."""
+        provider = FakeTTSProvider({})
+        provider.voice_clone_cached("bad", b"sample")
+        provider.voice_clone_cached("bad", b"sample")
+        assert provider.clone_calls == ["bad", "bad"]
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test the cache stays bounded and evicts the oldest entry first."""
+        provider = FakeTTSProvider({})
+        provider.VOICE_CLONE_CACHE_SIZE = 2
+        provider.voice_clone_cached("a", b"1")
+        provider.voice_clone_cached("b", b"1")
+        provider.voice_clone_cached("a", b"1")
+        provider.voice_clone_cached("c", b"1")
+        provider.voice_clone_cached("b", b"1")
+        assert provider.clone_calls == ["a", "b", "c", "b"]
+        assert len(provider._clone_cache) == 2
+
+
+class BytesTTSProvider(FakeTTSProvider):
+    provider_name = "bytes-tts"
+
+    def generate_audio(self, text, speaker=None, language=None, **kwargs):
+        if kwargs.get("return_bytes"):
+            return {"success": True, "audio_bytes": b"RIFF-raw"}
+        return {"success": True, "audio": base64.b64encode(b"RIFF-raw").decode()}
+
+
+class LegacyTTSProvider(FakeTTSProvider):
+    provider_name = "legacy-tts"
+
+    def generate_audio(self, text, speaker=None, language=None, **kwargs):
+        return {"success": True, "audio": base64.b64encode(b"RIFF-b64").decode()}
+
+
+class TestGenerateAudioStreamFallback:
+    """Test suite for the batch fallback in BaseTTSProvider.generate_audio_stream."""
+
+    def test_raw_bytes_are_passed_through(self):
+        """Test providers supporting return_bytes skip the base64 round trip."""
+        assert list(BytesTTSProvider({}).generate_audio_stream("hi")) == [b"RIFF-raw"]
+
+    def test_base64_results_are_decoded(self):
+        """Test providers that ignore return_bytes still stream decoded audio."""
+        assert list(LegacyTTSProvider({}).generate_audio_stream("hi")) == [b"RIFF-b64"]
+
+
+def _alive(pid):
+    """Return True if pid exists and is not a zombie."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="needs /proc to inspect processes")
+class TestStopProcessGroup:
+    """Test suite for BaseService.stop with services that spawn workers."""
+
+    def test_stop_terminates_workers_in_own_session(self):
+        """Test stopping a service started in its own session also stops its children."""
+        spawn = ("import subprocess, sys, time; "
+                 "w = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']); "
+                 "print(w.pid, flush=True); time.sleep(60)")
+        provider = FakeTTSProvider({})
+        provider.process = subprocess.Popen([sys.executable, "-c", spawn], stdout=subprocess.PIPE,
+                                            start_new_session=True)
+        worker = int(provider.process.stdout.readline())
+        provider.process.stdout.close()
+
+        assert provider.stop() is True
+        deadline = time.monotonic() + 5
+        while _alive(worker) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not _alive(worker)
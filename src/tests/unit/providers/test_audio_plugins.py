@@ -0,0 +1,283 @@
+"""Tests for audio plugin helpers."""
+
+import io
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+
+import pytest
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Request
+
+from app.providers.audio_plugins import FasterQwen3TTSTTS, MultipartBody, ParakeetSTT
+from app.providers.base import http_session
+
+
+def parse(body):
+    """Parse a MultipartBody the way a server would."""
+    payload = body.read()
+    assert len(payload) == len(body)
+    builder = EnvironBuilder(method='POST', input_stream=io.BytesIO(payload),
+                             content_type=body.content_type, content_length=len(payload))
+    return Request(builder.get_environ())
+
+
+class TestMultipartBody:
+    """Test suite for the streaming multipart request body."""
+
+    def test_round_trips_fields_and_file(self):
+        """Test form fields and the file part decode as sent."""
+        audio = b'RIFF' + bytes(range(256)) * 50
+        body = MultipartBody({'language': 'en'}, 'file', 'clip.wav', io.BytesIO(audio), len(audio), 'audio/wav')
+        request = parse(body)
+        assert request.form['language'] == 'en'
+        assert request.files['file'].filename == 'clip.wav'
+        assert request.files['file'].content_type == 'audio/wav'
+        assert request.files['file'].read() == audio
+
+    def test_small_reads_stream_every_part(self):
+        """Test reading in small blocks crosses part boundaries without losing bytes."""
+        audio = b'x' * 1000
+        body = MultipartBody({'language': 'en'}, 'file', 'a.wav', io.BytesIO(audio), len(audio))
+        blocks = []
+        while block := body.read(7):
+            assert len(block) <= 7
+            blocks.append(block)
+        payload = b''.join(blocks)
+        assert len(payload) == len(body)
+        assert payload.endswith(b'--\r\n')
+        assert audio in payload
+
+
+class HealthHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200 if self.path == '/health' else 404)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def address_string(self):
+        return 'test'
+
+    def log_message(self, *args):
+        pass
+
+
+class UnixHTTPServer(socketserver.UnixStreamServer):
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ('local', 0)
+
+
+@pytest.fixture
+def serve():
+    """Run HTTP servers on background threads and unmount any adapters the test adds."""
+    servers, mounts = [], set(http_session.adapters)
+
+    def start(server):
+        servers.append(server)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+    for prefix in set(http_session.adapters) - mounts:
+        http_session.adapters.pop(prefix).close()
+
+
+class TestParakeetScriptPath:
+    """Test suite for locating the Parakeet server script."""
+
+    def test_script_path_points_at_repo_root_server(self):
+        """Test start() looks for the server script where the repo keeps it."""
+        assert ParakeetSTT.SCRIPT_PATH.is_file()
+        assert ParakeetSTT.SCRIPT_PATH.parent.joinpath('src').is_dir()
+
+
+class TestParakeetUnixSocket:
+    """Test suite for routing Parakeet requests over a Unix domain socket."""
+
+    def test_requests_use_socket_when_configured(self, tmp_path, serve):
+        """Test requests reach a server listening only on the socket."""
+        sock = str(tmp_path / 'stt.sock')
+        serve(UnixHTTPServer(sock, HealthHandler))
+        provider = ParakeetSTT({'base_url': 'http://localhost:1', 'socket_path': sock})
+        assert provider.health_check()
+
+    def test_missing_socket_falls_back_to_tcp(self, tmp_path, serve):
+        """Test a configured but absent socket falls back to the TCP base URL."""
+        server = serve(HTTPServer(('127.0.0.1', 0), HealthHandler))
+        provider = ParakeetSTT({'base_url': f'http://127.0.0.1:{server.server_port}',
+                                'socket_path': str(tmp_path / 'missing.sock')})
+        assert provider.health_check()
+
+    def test_wait_ready_falls_back_to_tcp(self, tmp_path, serve):
+        """Test startup readiness is detected on TCP when the socket never appears."""
+        server = serve(HTTPServer(('127.0.0.1', 0), HealthHandler))
+        base_url = f'http://127.0.0.1:{server.server_port}'
+        sock = str(tmp_path / 'missing.sock')
+        provider = ParakeetSTT({'base_url': base_url, 'socket_path': sock})
+        assert provider._wait_ready(base_url, timeout=2, socket_path=sock)
+
+
+class TranscribeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        if 'text/event-stream' in self.headers.get('Accept', '') and self.server.sse:
+            body = b'data: {"text": "hello", "start": 0.0}\n\ndata: {"text": "world", "start": 0.5}\n\ndata: [DONE]\n\n'
+            content_type = 'text/event-stream'
+        else:
+            body = b'{"text": "hello world", "segments": [{"text": "hello"}, {"text": "world"}]}'
+            content_type = 'application/json'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestParakeetTranscribeSegments:
+    """Test suite for ParakeetSTT.transcribe_segments."""
+
+    def transcribe(self, serve, tmp_path, sse):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), TranscribeHandler)
+        server.sse = sse
+        serve(server)
+        audio = tmp_path / 'clip.wav'
+        audio.write_bytes(b'RIFF' + bytes(64))
+        provider = ParakeetSTT({'base_url': f'http://127.0.0.1:{server.server_port}'})
+        return list(provider.transcribe_segments(str(audio), language='en'))
+
+    def test_event_stream_yields_each_segment(self, serve, tmp_path):
+        """Test SSE responses are yielded event by event up to [DONE]."""
+        segments = self.transcribe(serve, tmp_path, sse=True)
+        assert segments == [{'text': 'hello', 'start': 0.0}, {'text': 'world', 'start': 0.5}]
+
+    def test_json_response_falls_back_to_segments(self, serve, tmp_path):
+        """Test servers without SSE support still yield their segments."""
+        segments = self.transcribe(serve, tmp_path, sse=False)
+        assert segments == [{'text': 'hello'}, {'text': 'world'}]
+
+
+class SizeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        size = len(self.rfile.read(int(self.headers['Content-Length'])))
+        body = b'{"text": "%d"}' % size
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestParakeetTranscribeRawBatch:
+    """Test suite for ParakeetSTT.transcribe_raw_batch."""
+
+    def test_results_keep_chunk_order(self, serve):
+        """Test concurrent requests return one result per chunk, in input order."""
+        server = serve(ThreadingHTTPServer(('127.0.0.1', 0), SizeHandler))
+        provider = ParakeetSTT({'base_url': f'http://127.0.0.1:{server.server_port}'})
+        samples = [10, 1, 50, 3, 7, 20]
+        results = provider.transcribe_raw_batch([bytes(4 * n) for n in samples])
+        assert all(r['success'] for r in results)
+        # Each upload is the WAV plus fixed multipart overhead, so sizes must rank like the inputs
+        sizes = [int(r['text']) for r in results]
+        assert sorted(range(6), key=sizes.__getitem__) == sorted(range(6), key=samples.__getitem__)
+
+
+class TestFasterQwen3GenerationArgs:
+    """Test suite for FasterQwen3TTSTTS sampler and language argument building."""
+
+    def test_config_defaults_with_call_overrides(self):
+        """Test config sets the defaults and only known call kwargs override them."""
+        provider = FasterQwen3TTSTTS({'temperature': 0.5, 'top_k': 10})
+        params = provider._generation_kwargs({'top_k': 20, 'ref_text': 'ignored', 'return_bytes': True})
+        assert params['temperature'] == 0.5
+        assert params['top_k'] == 20
+        assert params['max_new_tokens'] == 2048
+        assert 'ref_text' not in params and 'return_bytes' not in params
+
+    def test_streaming_forces_streaming_mode(self):
+        """Test streaming calls always disable non_streaming_mode."""
+        provider = FasterQwen3TTSTTS({})
+        assert provider._generation_kwargs({})['non_streaming_mode'] is True
+        assert provider._generation_kwargs({'non_streaming_mode': True}, streaming=True)['non_streaming_mode'] is False
+
+    def test_defaults_are_not_mutated(self):
+        """Test per-call overrides never leak into later calls."""
+        provider = FasterQwen3TTSTTS({})
+        provider._generation_kwargs({'temperature': 0.1})
+        assert provider._generation_kwargs({})['temperature'] == 0.9
+
+    def test_language_codes_map_to_names(self):
+        """Test known codes map to model names and unknown values pass through."""
+        provider = FasterQwen3TTSTTS({})
+        assert provider._map_language(None) == 'English'
+        assert provider._map_language('ZH') == 'Chinese'
+        assert provider._map_language('Italian') == 'Italian'
+
+
+class RawHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_OPTIONS(self):
+        self.server.probes += 1
+        self.send_response(200 if self.server.raw and self.path == '/transcribe_raw' else 404)
+        self.send_header('Allow', 'OPTIONS, POST')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.requests.append((self.path, self.headers['Content-Type'], body))
+        payload = b'{"text": "ok"}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestParakeetRawPost:
+    """Test suite for posting raw Float32 audio to servers that support it."""
+
+    def provider(self, serve, raw):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), RawHandler)
+        server.raw, server.requests, server.probes = raw, [], 0
+        serve(server)
+        return ParakeetSTT({'base_url': f'http://127.0.0.1:{server.server_port}'}), server
+
+    def test_raw_body_when_supported(self, serve):
+        """Test the samples are sent unframed with the rate in a header, probing only once."""
+        provider, server = self.provider(serve, raw=True)
+        audio = bytes(range(16)) * 4
+        assert provider.transcribe_raw(audio, sample_rate=8000, language='en')['text'] == 'ok'
+        provider.transcribe_raw(audio)
+        path, content_type, body = server.requests[0]
+        assert path == '/transcribe_raw?language=en'
+        assert content_type == 'application/octet-stream'
+        assert body == audio
+        assert server.probes == 1
+
+    def test_multipart_wav_when_unsupported(self, serve):
+        """Test servers without the raw endpoint still get a multipart WAV upload."""
+        provider, server = self.provider(serve, raw=False)
+        assert provider.transcribe_raw(bytes(64))['text'] == 'ok'
+        path, content_type, body = server.requests[0]
+        assert path == '/transcribe'
+        assert content_type.startswith('multipart/form-data')
+        assert b'RIFF' in body
@@ -59,7 +59,7 @@ class TestCerebrasModelStatusSimple:
         provider = CerebrasProvider(config)
         assert provider.requires_api_key() is True
     
-    @patch('app.providers.cerebras_provider.requests.request')
+    @patch('app.providers.cerebras_provider.http_session.request')
     def test_cerebras_get_models_success(self, mock_request):
         """Test successful retrieval of models from Cerebras."""
         # Mock successful response with models
@@ -106,7 +106,7 @@ class TestCerebrasModelStatusSimple:
         assert call_args[0][0] == 'get'  # HTTP method
         assert call_args[0][1] == 'https://api.cerebras.ai/v1/models'  # URL
     
-    @patch('app.providers.cerebras_provider.requests.request')
+    @patch('app.providers.cerebras_provider.http_session.request')
     def test_cerebras_get_models_empty_response(self, mock_request):
         """Test handling of empty models response."""
         # Mock response with empty data
@@ -123,7 +123,7 @@ class TestCerebrasModelStatusSimple:
         models = provider.get_models()
         assert models == []
     
-    @patch('app.providers.cerebras_provider.requests.request')
+    @patch('app.providers.cerebras_provider.http_session.request')
     def test_cerebras_chat_completion_non_streaming(self, mock_request):
         """Test non-streaming chat completion."""
         # Mock successful response
@@ -159,15 +159,15 @@ class TestCerebrasModelStatusSimple:
         assert response.finish_reason == 'stop'
         assert response.usage == {'total_tokens': 15}
     
-    @patch('app.providers.cerebras_provider.requests.request')
+    @patch('app.providers.cerebras_provider.http_session.request')
     def test_cerebras_chat_completion_streaming(self, mock_request):
         """Test streaming chat completion."""
         # Mock streaming response
         mock_response = Mock()
-        mock_response.iter_lines.return_value = [
-            b'data: {"choices":[{"delta":{"content":"Hello"}}]}',
-            b'data: {"choices":[{"delta":{"content":"!"}}]}',
-            b'data: [DONE]'
+        mock_response.iter_content.return_value = [
+            b'data: {"choices":[{"delta":{"content":"Hello"}}]}\n\n',
+            b'data: {"choices":[{"delta":{"content":"!"}}]}\n\n',
+            b'data: [DONE]\n\n'
         ]
         mock_request.return_value = mock_response
         
@@ -195,7 +195,7 @@ class TestCerebrasModelStatusSimple:
         )
         provider = CerebrasProvider(config)
         
-        with patch('app.providers.cerebras_provider.requests.request') as mock_request:
+        with patch('app.providers.cerebras_provider.http_session.request') as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_request.return_value = mock_response
@@ -271,4 +271,31 @@ class TestProviderConfig:
             api_key='longsecretkey123'
         )
         d = config.to_dict()
-        assert d['api_key'] == '***key123'
\ No newline at end of file
+        assert d['api_key'] == '***key123'
+
+class TestJSONSession:
+    """Test suite for the shared session's JSON body encoding."""
+    
+    def sent(self, **kwargs):
+        import requests
+        from app.providers.base import JSONSession
+        with patch.object(requests.Session, 'send') as send:
+            JSONSession().post('http://localhost/v1/chat/completions', **kwargs)
+        return send.call_args[0][0]
+    
+    def test_json_body_encoded_compactly(self):
+        """Test json= bodies are sent as compact UTF-8 with a JSON content type."""
+        request = self.sent(json={'messages': [ChatMessage(role='user', content='héllo').to_dict()]})
+        assert request.body == '{"messages":[{"role":"user","content":"héllo"}]}'.encode('utf-8')
+        assert request.headers['Content-Type'] == 'application/json'
+    
+    def test_explicit_content_type_kept(self):
+        """Test a caller-supplied Content-Type header is not overridden."""
+        request = self.sent(json={'a': 1}, headers={'content-type': 'application/vnd.api+json'})
+        assert request.headers['Content-Type'] == 'application/vnd.api+json'
+    
+    def test_unsupported_body_left_to_requests(self):
+        """Test bodies orjson rejects still go through the standard encoder."""
+        import json
+        request = self.sent(json={1: 'one'})
+        assert json.loads(request.body) == {'1': 'one'}
@@ -232,7 +232,7 @@ class TestBaseProviderHelperMethods:
 class TestLMStudioProviderFull:
     """Full test suite for LMStudioProvider."""
     
-    @patch('app.providers.lmstudio_provider.requests')
+    @patch('app.providers.lmstudio_provider.http_session')
     def test_chat_completion_success(self, mock_requests):
         """Test successful non-streaming chat completion."""
         # Create a proper mock response with the expected data structure
@@ -256,7 +256,7 @@ class TestLMStudioProviderFull:
         assert response.usage == {"prompt_tokens": 10, "completion_tokens": 20}
         mock_requests.request.assert_called_once()
     
-    @patch('app.providers.lmstudio_provider.requests')
+    @patch('app.providers.lmstudio_provider.http_session')
     def test_chat_completion_with_streaming(self, mock_requests):
         """Test streaming chat completion."""
         def mock_stream():
@@ -269,7 +269,7 @@ class TestLMStudioProviderFull:
                 yield line
         
         mock_response = Mock()
-        mock_response.iter_lines.return_value = mock_stream()
+        mock_response.iter_content.return_value = mock_stream()
         mock_requests.request.return_value = mock_response
         
         config = ProviderConfig(provider_type="lmstudio", base_url="http://localhost:1234", model="test-model")
@@ -282,7 +282,7 @@ class TestLMStudioProviderFull:
         assert len(chunks) >= 2
         assert any(c.content for c in chunks)
     
-    @patch('app.providers.lmstudio_provider.requests')
+    @patch('app.providers.lmstudio_provider.http_session')
     def test_chat_completion_connection_error(self, mock_requests):
         """Test chat completion with connection error."""
         mock_requests.request.side_effect = requests.exceptions.ConnectionError("Connection failed")
@@ -294,7 +294,7 @@ class TestLMStudioProviderFull:
         with pytest.raises(ConnectionError):
             provider.chat_completion(messages)
     
-    @patch('app.providers.lmstudio_provider.requests')
+    @patch('app.providers.lmstudio_provider.http_session')
     def test_chat_completion_http_error(self, mock_requests):
         """Test chat completion with HTTP error."""
         mock_response = Mock()
@@ -309,7 +309,7 @@ class TestLMStudioProviderFull:
         with pytest.raises(ConnectionError):
             provider.chat_completion(messages)
     
-    @patch('app.providers.lmstudio_provider.requests')
+    @patch('app.providers.lmstudio_provider.http_session')
     def test_chat_completion_empty_messages(self, mock_requests):
         """Test chat completion with empty messages."""
         config = ProviderConfig(provider_type="lmstudio")
@@ -318,7 +318,7 @@ class TestLMStudioProviderFull:
         with pytest.raises(ValueError):
             provider.chat_completion([])
     
-    @patch('app.providers.lmstudio_provider.requests')
+    @patch('app.providers.lmstudio_provider.http_session')
     def test_get_models_success(self, mock_requests):
         """Test successful get_models."""
         mock_response = Mock()
@@ -340,7 +340,7 @@ class TestLMStudioProviderFull:
         assert models[0].context_length == 4096
         assert models[1].id == "model-2"
     
-    @patch('app.providers.lmstudio_provider.requests')
+    @patch('app.providers.lmstudio_provider.http_session')
     def test_get_models_empty(self, mock_requests):
         """Test get_models with empty response."""
         mock_response = Mock()
@@ -352,7 +352,7 @@ class TestLMStudioProviderFull:
         models = provider.get_models()
         assert models == []
 
-    @patch('app.providers.lmstudio_provider.requests')
+    @patch('app.providers.lmstudio_provider.http_session')
     def test_get_models_connection_error(self, mock_requests):
         """Test get_models with connection error."""
         mock_requests.request.side_effect = ConnectionError("Connection failed")
@@ -363,7 +363,7 @@ class TestLMStudioProviderFull:
         with pytest.raises(ConnectionError):
             provider.get_models()
 
-    @patch('app.providers.lmstudio_provider.requests')
+    @patch('app.providers.lmstudio_provider.http_session')
     def test_test_connection_success(self, mock_requests):
         """Test successful test_connection."""
         mock_response = Mock()
@@ -376,7 +376,7 @@ class TestLMStudioProviderFull:
         result = provider.test_connection()
         assert result is True
 
-    @patch('app.providers.lmstudio_provider.requests')
+    @patch('app.providers.lmstudio_provider.http_session')
     def test_test_connection_failure(self, mock_requests):
         """Test failed test_connection."""
         mock_requests.request.side_effect = ConnectionError("Connection failed")
@@ -409,7 +409,7 @@ class TestLMStudioProviderFull:
 class TestOpenRouterProviderFull:
     """Full test suite for OpenRouterProvider."""
     
-    @patch('app.providers.openrouter_provider.requests')
+    @patch('app.providers.openrouter_provider.http_session')
     def test_chat_completion_success(self, mock_requests):
         """Test successful non-streaming chat completion."""
         mock_response = Mock()
@@ -431,7 +431,7 @@ class TestOpenRouterProviderFull:
         assert response.thinking == "Thinking..."
         assert response.model == "openai/gpt-4"
     
-    @patch('app.providers.openrouter_provider.requests')
+    @patch('app.providers.openrouter_provider.http_session')
     def test_chat_completion_with_thinking_budget(self, mock_requests):
         """Test chat completion with thinking budget."""
         mock_response = Mock()
@@ -456,7 +456,7 @@ class TestOpenRouterProviderFull:
         assert "extra_options" in call_kwargs['json']
         assert call_kwargs['json']["extra_options"]["max_tokens"] == 1000
     
-    @patch('app.providers.openrouter_provider.requests')
+    @patch('app.providers.openrouter_provider.http_session')
     def test_chat_completion_streaming(self, mock_requests):
         """Test streaming chat completion."""
         def mock_stream():
@@ -469,7 +469,7 @@ class TestOpenRouterProviderFull:
                 yield line
         
         mock_response = Mock()
-        mock_response.iter_lines.return_value = mock_stream()
+        mock_response.iter_content.return_value = mock_stream()
         mock_requests.post.return_value = mock_response
         
         config = ProviderConfig(provider_type="openrouter", api_key="test-key", model="openai/gpt-4")
@@ -481,7 +481,7 @@ class TestOpenRouterProviderFull:
         chunks = list(stream)
         assert len(chunks) >= 2
     
-    @patch('app.providers.openrouter_provider.requests')
+    @patch('app.providers.openrouter_provider.http_session')
     def test_get_models_success(self, mock_requests):
         """Test successful get_models."""
         mock_response = Mock()
@@ -510,7 +510,7 @@ class TestOpenRouterProviderFull:
         assert models[0].context_length == 8192
         assert models[0].metadata["owned_by"] == "openai"
     
-    @patch('app.providers.openrouter_provider.requests')
+    @patch('app.providers.openrouter_provider.http_session')
     def test_get_models_authentication_error(self, mock_requests):
         """Test get_models with authentication error."""
         mock_response = Mock()
@@ -524,7 +524,7 @@ class TestOpenRouterProviderFull:
         with pytest.raises(AuthenticationError):
             provider.get_models()
     
-    @patch('app.providers.openrouter_provider.requests')
+    @patch('app.providers.openrouter_provider.http_session')
     def test_test_connection_authentication_error_reraises(self, mock_requests):
         """Test test_connection re-raises auth errors."""
         mock_response = Mock()
@@ -566,7 +566,7 @@ class TestOpenRouterProviderFull:
 class TestCerebrasProviderFull:
     """Full test suite for CerebrasProvider."""
     
-    @patch('app.providers.cerebras_provider.requests')
+    @patch('app.providers.cerebras_provider.http_session')
     def test_chat_completion_success(self, mock_requests):
         """Test successful non-streaming chat completion."""
         mock_response = Mock()
@@ -587,7 +587,7 @@ class TestCerebrasProviderFull:
         assert response.content == "Hello from Cerebras!"
         assert response.model == "cerebras-llama-3.3"
     
-    @patch('app.providers.cerebras_provider.requests')
+    @patch('app.providers.cerebras_provider.http_session')
     def test_chat_completion_streaming(self, mock_requests):
         """Test streaming chat completion."""
         def mock_stream():
@@ -600,7 +600,7 @@ class TestCerebrasProviderFull:
                 yield line
         
         mock_response = Mock()
-        mock_response.iter_lines.return_value = mock_stream()
+        mock_response.iter_content.return_value = mock_stream()
         mock_requests.post.return_value = mock_response
         
         config = ProviderConfig(provider_type="cerebras", api_key="test-key", model="cerebras-llama-3.3")
@@ -612,7 +612,7 @@ class TestCerebrasProviderFull:
         chunks = list(stream)
         assert len(chunks) >= 2
     
-    @patch('app.providers.cerebras_provider.requests')
+    @patch('app.providers.cerebras_provider.http_session')
     def test_get_models_success(self, mock_requests):
         """Test successful get_models."""
         mock_response = Mock()
@@ -638,7 +638,7 @@ class TestCerebrasProviderFull:
         with pytest.raises(AuthenticationError):
             CerebrasProvider(config)
     
-    @patch('app.providers.cerebras_provider.requests')
+    @patch('app.providers.cerebras_provider.http_session')
     def test_test_connection_success(self, mock_requests):
         """Test successful test_connection."""
         mock_response = Mock()
@@ -692,7 +692,7 @@ class TestLlamaCppProviderFull:
         provider = LlamaCppProvider(config)
         assert provider.requires_api_key() is False
     
-    @patch('app.providers.llamacpp_provider.requests')
+    @patch('app.providers.llamacpp_provider.http_session')
     def test_chat_completion_model_not_found(self, mock_requests):
         """Test chat completion when model not found."""
         config = ProviderConfig(provider_type="llamacpp", model="nonexistent.gguf")
@@ -702,7 +702,7 @@ class TestLlamaCppProviderFull:
             provider.chat_completion([ChatMessage(role="user", content="Hi")])
     
     @patch('app.providers.llamacpp_provider.subprocess')
-    @patch('app.providers.llamacpp_provider.requests')
+    @patch('app.providers.llamacpp_provider.http_session')
     def test_chat_completion_server_start_fails(self, mock_requests, mock_subprocess):
         """Test chat completion when server fails to start."""
         config = ProviderConfig(provider_type="llamacpp", model="test.gguf")
@@ -717,7 +717,7 @@ class TestLlamaCppProviderFull:
                     with pytest.raises(ConnectionError, match="Failed to start llama.cpp server"):
                         provider.chat_completion([ChatMessage(role="user", content="Hi")])
     
-    @patch('app.providers.llamacpp_provider.requests')
+    @patch('app.providers.llamacpp_provider.http_session')
     def test_chat_completion_empty_messages(self, mock_requests):
         """Test chat completion with empty messages."""
         config = ProviderConfig(provider_type="llamacpp")
@@ -766,7 +766,7 @@ class TestLlamaCppProviderFull:
         assert models[0].metadata["size"] == 1024 * 1024 * 1024
         assert models[1].id == "model2.gguf"
     
-    @patch('app.providers.llamacpp_provider.requests')
+    @patch('app.providers.llamacpp_provider.http_session')
     def test_test_connection_server_not_running(self, mock_requests):
         """Test test_connection when server is not running."""
         mock_requests.get.side_effect = ConnectionError()
@@ -791,7 +791,7 @@ class TestLlamaCppProviderFull:
 class TestProviderErrorHandling:
     """Test error handling across all providers."""
     
-    @patch('app.providers.lmstudio_provider.requests')
+    @patch('app.providers.lmstudio_provider.http_session')
     def test_lmstudio_json_parse_error(self, mock_requests):
         """Test LM Studio handling of invalid JSON."""
         mock_response = Mock()
@@ -804,7 +804,7 @@ class TestProviderErrorHandling:
         with pytest.raises(ConnectionError, match="Invalid JSON"):
             provider.chat_completion([ChatMessage(role="user", content="Hi")])
     
-    @patch('app.providers.openrouter_provider.requests')
+    @patch('app.providers.openrouter_provider.http_session')
     def test_openrouter_rate_limit(self, mock_requests):
         """Test OpenRouter rate limit handling."""
         mock_response = Mock()
@@ -819,7 +819,7 @@ class TestProviderErrorHandling:
         with pytest.raises(RateLimitError):
             provider.chat_completion([ChatMessage(role="user", content="Hi")])
     
-    @patch('app.providers.cerebras_provider.requests')
+    @patch('app.providers.cerebras_provider.http_session')
     def test_cerebras_missing_choice(self, mock_requests):
         """Test Cerebras handling of missing choices."""
         mock_response = Mock()
@@ -836,7 +836,7 @@ class TestProviderErrorHandling:
 class TestStreamingEdgeCases:
     """Test streaming edge cases across providers."""
     
-    @patch('app.providers.lmstudio_provider.requests')
+    @patch('app.providers.lmstudio_provider.http_session')
     def test_streaming_malformed_lines(self, mock_requests):
         """Test streaming with malformed SSE lines."""
         def mock_stream():
@@ -850,7 +850,7 @@ class TestStreamingEdgeCases:
                 yield line
         
         mock_response = Mock()
-        mock_response.iter_lines.return_value = mock_stream()
+        mock_response.iter_content.return_value = mock_stream()
         mock_requests.post.return_value = mock_response
         
         config = ProviderConfig(provider_type="lmstudio", model="test-model")
@@ -863,7 +863,7 @@ class TestStreamingEdgeCases:
         chunks = list(stream)
         assert isinstance(chunks, list)
     
-    @patch('app.providers.openrouter_provider.requests')
+    @patch('app.providers.openrouter_provider.http_session')
     def test_streaming_empty_delta(self, mock_requests):
         """Test streaming with empty delta."""
         def mock_stream():
@@ -876,7 +876,7 @@ class TestStreamingEdgeCases:
                 yield line
         
         mock_response = Mock()
-        mock_response.iter_lines.return_value = mock_stream()
+        mock_response.iter_content.return_value = mock_stream()
         mock_requests.post.return_value = mock_response
         
         config = ProviderConfig(provider_type="openrouter", api_key="test", model="test")
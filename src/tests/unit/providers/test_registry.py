@@ -132,4 +132,92 @@ class TestListAvailableProviders:
         assert 'lmstudio' in names
         assert 'openrouter' in names
         assert 'cerebras' in names
-        assert 'llamacpp' in names
\ No newline at end of file
+        assert 'llamacpp' in names
+
+class TestAudioRegistryLazyLookup:
+    """Test suite for looking up audio providers without full discovery."""
+    
+    @pytest.fixture(autouse=True)
+    def scan_cache(self, tmp_path, monkeypatch):
+        """Keep the persisted scan cache out of the real home directory."""
+        from app.providers import audio_registry
+        path = str(tmp_path / 'audio_registry.json')
+        monkeypatch.setattr(audio_registry, 'AUDIO_REGISTRY_CACHE', path)
+        return path
+    
+    def test_scan_maps_names_to_modules(self):
+        """Test provider names are read from source, with later modules winning."""
+        from app.providers.audio_registry import AudioProviderRegistry
+        lazy_map = AudioProviderRegistry()._scan_provider_names()
+        assert lazy_map['STT']['parakeet'] == 'app.providers.audio_plugins'
+        assert lazy_map['TTS']['faster-qwen3-tts'] == 'app.providers.audio_plugins'
+    
+    def test_lookup_skips_discovery(self):
+        """Test a known name resolves to the same class discovery would pick."""
+        from app.providers.audio_registry import AudioProviderRegistry
+        registry = AudioProviderRegistry()
+        stt_class = registry.get_stt_provider_class('parakeet')
+        assert stt_class.__name__ == 'ParakeetSTT'
+        assert not registry._discovered
+        
+        discovered = AudioProviderRegistry()
+        discovered.discover_providers()
+        assert registry.get_tts_provider_class('faster-qwen3-tts') is discovered.get_tts_provider_class('faster-qwen3-tts')
+    
+    def test_unknown_name_falls_back_to_discovery(self):
+        """Test names missing from the scan still trigger full discovery."""
+        from app.providers.audio_registry import AudioProviderRegistry
+        registry = AudioProviderRegistry()
+        assert registry.get_tts_provider_class('missing') is None
+        assert registry._discovered
+    
+    def test_rediscovery_reuses_directory_listing(self, monkeypatch):
+        """Test discovery after clear() does not rescan an unchanged providers directory."""
+        from app.providers import audio_registry
+        registry = audio_registry.AudioProviderRegistry()
+        registry.discover_providers()
+        scans = []
+        real_scandir = audio_registry.os.scandir
+        monkeypatch.setattr(audio_registry.os, 'scandir', lambda path: scans.append(path) or real_scandir(path))
+        registry.clear()
+        registry.discover_providers()
+        assert scans == []
+        assert registry.get_stt_provider_class('parakeet') is not None
+    
+    def test_scan_is_persisted_across_instances(self, scan_cache, monkeypatch):
+        """Test a fresh registry reads the saved map instead of parsing provider sources."""
+        import os
+        from app.providers import audio_registry
+        lazy_map = audio_registry.AudioProviderRegistry()._scan_provider_names()
+        assert os.path.exists(scan_cache)
+        monkeypatch.setattr(audio_registry.ast, 'parse', lambda *a, **k: pytest.fail('sources were parsed'))
+        assert audio_registry.AudioProviderRegistry()._scan_provider_names() == lazy_map
+    
+    def test_warm_up_discovers_providers(self):
+        """Test warm_up runs discovery so later lookups skip it."""
+        from app.providers.audio_registry import AudioProviderRegistry
+        registry = AudioProviderRegistry()
+        registry.warm_up()
+        assert registry._discovered
+        assert registry.get_stt_provider_class('parakeet') is not None
+    
+    def test_provider_list_cached_until_registration(self):
+        """Test the metadata list is reused and rebuilt after (un)registering a provider."""
+        from app.providers.audio_base import BaseSTTProvider
+        from app.providers.audio_registry import AudioProviderRegistry
+        
+        class ExtraSTT(BaseSTTProvider):
+            provider_name = "extra-stt"
+            
+            def transcribe(self, audio_file_path, language=None, **kwargs):
+                return {}
+        
+        registry = AudioProviderRegistry()
+        first = registry.list_stt_providers()
+        assert registry._list_cache["STT"] is not None
+        assert registry.list_stt_providers() == first
+        
+        registry.register_stt_provider(ExtraSTT)
+        assert 'extra-stt' in [p['name'] for p in registry.list_stt_providers()]
+        registry.unregister_stt_provider('extra-stt')
+        assert registry.list_stt_providers() == first
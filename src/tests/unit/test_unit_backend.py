@@ -206,6 +206,19 @@ class TestSettings:
         assert 'provider' in config
         assert config['provider'] in ['lmstudio', 'openrouter', 'cerebras']
 
+    def test_load_after_save_is_migrated(self, tmp_path, monkeypatch):
+        """Test that a load right after a save matches a cold load."""
+        import app.shared as shared
+
+        monkeypatch.setattr(shared, 'SETTINGS_FILE', str(tmp_path / 'settings.json'))
+        shared.save_settings({'provider': 'lmstudio', 'base_url': 'http://localhost:4321'})
+        settings = shared.load_settings()
+        assert settings['lmstudio']['base_url'] == 'http://localhost:4321'
+        assert 'cerebras' in settings and 'base_url' not in settings
+
+        settings['lmstudio']['base_url'] = 'changed'
+        assert shared.load_settings()['lmstudio']['base_url'] == 'http://localhost:4321'
+
 
 class TestSessionManagement:
     """Test session management functions."""
@@ -220,39 +233,55 @@ class TestSessionManagement:
         assert isinstance(sessions, dict)
 
 
-class TestHTMLEscape:
-    """Test HTML escaping for security."""
-    
-    def test_escape_html_basic(self):
-        """Test basic HTML escaping."""
-        from app import parse_dialogue  # This uses escapeHtml internally
-        
-        # Test that HTML in text is handled safely
-        text = "<script>alert('xss')</script>"
-        segments = parse_dialogue(text)
-        # Should not throw an error
-        assert isinstance(segments, list)
+class TestMessageHistoryCache:
+    """Test the per-session ChatMessage history cache."""
 
+    def test_concurrent_calls_do_not_duplicate_turns(self, monkeypatch):
+        """Test that parallel requests for one session see each turn once."""
+        from concurrent.futures import ThreadPoolExecutor
+        import app.shared as shared
+        from app.chat import get_message_history, forget_message_history
 
-class TestWAVGeneration:
-    """Test WAV file generation utilities."""
-    
-    def test_wav_header_creation(self):
-        """Test that WAV headers are created correctly."""
-        import struct
-        
-        # Test creating a basic WAV header
-        sample_rate = 24000
-        num_channels = 1
-        bits_per_sample = 16
-        
-        byte_rate = sample_rate * num_channels * bits_per_sample // 8
-        block_align = num_channels * bits_per_sample // 8
-        
-        # Verify calculations
-        assert byte_rate == 48000  # 24000 * 1 * 2
-        assert block_align == 2  # 1 * 2
+        messages = [{'role': 'user' if i % 2 == 0 else 'assistant', 'content': str(i)} for i in range(200)]
+        monkeypatch.setitem(shared.sessions_data, 'cache-test', {'messages': messages})
+        try:
+            with ThreadPoolExecutor(max_workers=16) as pool:
+                results = list(pool.map(lambda _: get_message_history('cache-test', 'sys'), range(32)))
+            for history in results:
+                assert [m.content for m in history] == ['sys'] + [str(i) for i in range(200)]
+        finally:
+            forget_message_history('cache-test')
+
+    def test_returned_history_is_a_copy(self, monkeypatch):
+        """Test that appending to the result does not leak into the cache."""
+        import app.shared as shared
+        from app.chat import get_message_history, forget_message_history, prepared_history
+
+        monkeypatch.setitem(shared.sessions_data, 'cache-test', {'messages': [{'role': 'user', 'content': 'hi'}]})
+        get_message_history('cache-test', 'sys').append('extra')
+        assert len(get_message_history('cache-test', 'sys')) == 2
+
+        forget_message_history('cache-test')
+        assert 'cache-test' not in prepared_history
+
+
+class TestContentBatcher:
+    """Test SSE content batching for streamed chat."""
+
+    def test_small_tokens_are_coalesced(self):
+        """Test that tokens are held until min_chars are pending."""
+        from app.chat import ContentBatcher
+
+        batcher = ContentBatcher(min_chars=8, max_delay=60)
+        assert batcher.add('Hel') is None
+        assert batcher.add('lo') is None
+        frame = batcher.add(' world')
+        assert b'"Hello world"' in frame
+        assert batcher.flush() is None
 
+    def test_stale_batch_flushes_on_next_token(self):
+        """Test that a batch older than max_delay goes out with the next token."""
+        from app.chat import ContentBatcher
 
-if __name__ == '__main__':
-    pytest.main([__file__, '-v'])
\ No newline at end of file
+        batcher = ContentBatcher(min_chars=1000, max_delay=0)
+        assert b'"Hi"' in batcher.add('Hi')